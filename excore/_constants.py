@@ -13,7 +13,9 @@ __author__ = "Asthestarsfalll"
 __version__ = "0.1.1beta"
 
 _workspace_config_file = "./.excore.toml"
-_registry_cache_file = "registry_cache.pkl"
+_registry_cache_file = "registry_cache.bin"
+_signature_index_file = "signature_index.json"
+_registry_state_file = "registry_state.json"
 _json_schema_file = "excore_schema.json"
 _class_mapping_file = "class_mapping.json"
 
@@ -26,6 +28,7 @@ class _WorkspaceConfig:
     cache_base_dir: str = field(default=osp.expanduser("~/.cache/excore/"))
     cache_dir: str = field(default="")
     registry_cache_file: str = field(default="")
+    signature_index_file: str = field(default="")
     json_schema_file: str = field(default="")
     class_mapping_file: str = field(default="")
     registries: list[str] = field(default_factory=list)
@@ -36,6 +39,7 @@ class _WorkspaceConfig:
     excore_validate: bool = field(default=True)
     excore_manual_set: bool = field(default=True)
     excore_log_build_message: bool = field(default=False)
+    excore_config_cache: bool = field(default=True)
 
     @property
     def base_name(self):
@@ -46,17 +50,23 @@ class _WorkspaceConfig:
             self.base_dir = os.getcwd()
             self.cache_dir = self._get_cache_dir()
             self.registry_cache_file = osp.join(self.cache_dir, _registry_cache_file)
+            self.signature_index_file = osp.join(self.cache_dir, _signature_index_file)
             self.json_schema_file = osp.join(self.cache_dir, _json_schema_file)
             self.class_mapping_file = osp.join(self.cache_dir, _class_mapping_file)
             logger.warning("Please use `excore init` in your command line first")
         else:
             self.update(toml.load(_workspace_config_file))
+            # workspaces initialized by older versions do not record it.
+            if not self.signature_index_file:
+                self.signature_index_file = osp.join(self.cache_dir, _signature_index_file)
         if os.environ.get("EXCORE_VALIDATE", "1") == "0":
             self.excore_validate = False
         if os.environ.get("EXCORE_LOG_BUILD_MESSAGE", "0") == "1":
             self.excore_log_build_message = True
         if os.environ.get("EXCORE_MANUAL_SET", "1") == "0":
             self.excore_manual_set = False
+        if os.environ.get("EXCORE_CONFIG_CACHE", "1") == "0":
+            self.excore_config_cache = False
 
     def _get_cache_dir(self) -> str:
         base_name = osp.basename(osp.normpath(os.getcwd()))
@@ -26,6 +26,10 @@ class HTTPDownloadError(BaseException):
     pass
 
 
+class ChecksumError(HTTPDownloadError):
+    r"""The downloaded file does not match the expected checksum."""
+
+
 class CoreConfigSupportError(BaseException):
     pass
 
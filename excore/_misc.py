@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import functools
+import threading
 from collections.abc import Sequence
 from typing import Any, Callable
 
@@ -16,10 +17,17 @@ class CacheOut:
     If the cached value is not equal to the instance itself, it sets the cached
     value and returns it. Otherwise, it simply returns the cached value.
 
+    It is thread-safe, concurrent calls on the same instance wait for a single call of
+    the method instead of calling it again. Locks are kept in `_locks` by instance id
+    only for the duration of a call, so that instances stay picklable.
+
     Methods:
         __call__: Decorates a method to cache its output.
     """
 
+    _guard = threading.Lock()
+    _locks: dict[int, threading.RLock] = {}
+
     def __call__(self, func: Callable[..., Any]):
         """
         Decorates a method to cache its output.
@@ -30,15 +38,26 @@ class CacheOut:
         Returns:
             Callable[..., Any]: The decorated method.
         """
+        guard, locks = CacheOut._guard, CacheOut._locks
 
         @functools.wraps(func)
         def _cache(self) -> Any:
-            if not hasattr(self, "cached_elem"):
-                cached_elem = func(self)
-                if cached_elem != self:
-                    self.cached_elem = cached_elem
-                return cached_elem
-            return self.cached_elem
+            if hasattr(self, "cached_elem"):
+                return self.cached_elem
+            with guard:
+                lock = locks.setdefault(id(self), threading.RLock())
+            try:
+                with lock:
+                    if hasattr(self, "cached_elem"):
+                        return self.cached_elem
+                    cached_elem = func(self)
+                    if cached_elem != self:
+                        self.cached_elem = cached_elem
+                    return cached_elem
+            finally:
+                with guard:
+                    if locks.get(id(self)) is lock:
+                        locks.pop(id(self))
 
         return _cache
 
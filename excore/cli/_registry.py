@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import ast
+import hashlib
 import importlib
+import json
 import os
 import os.path as osp
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
 import astor  # type: ignore
@@ -12,10 +16,12 @@ import typer
 from typer import Argument as CArg
 from typing_extensions import Annotated
 
-from .._constants import _workspace_config_file, workspace
+from .._constants import _registry_state_file, _workspace_config_file, workspace
 from .._misc import _create_table
+from ..engine._registry_cache import RegistryCacheError, _registry_class_path
+from ..engine._signature import build_signature_entries, dump_signature_index
 from ..engine.logging import logger
-from ..engine.registry import Registry
+from ..engine.registry import Registry, _registry_class
 from ._app import app
 
 
@@ -182,10 +188,51 @@ def _get_default_module_name(base: str, target: str) -> str:
     return ".".join([base, *modules[::-1]])
 
 
-def _auto_register(target: str, module_name: str) -> None:
+_STATE_VERSION = 1
+
+
+def _discover(target: str, module_name: str) -> list[tuple[str, str]]:
+    """
+    Returns `(file, import_name)` of python files to be registered under `target`.
+    """
     if osp.isfile(target) and target.endswith(".py") and not target.endswith("__init__.py"):
         file_name = osp.split(target)[-1]
-        import_name = module_name + "." + file_name[:-3]
+        return [(osp.abspath(target), module_name + "." + file_name[:-3])]
+    if osp.isdir(target):
+        files = []
+        for file_name in os.listdir(target):
+            full_path = osp.join(target, file_name)
+            if osp.isdir(full_path):
+                files.extend(_discover(full_path, module_name + "." + file_name))
+            else:
+                files.extend(_discover(full_path, module_name))
+        return files
+    logger.ex(f"Invalid target `{target}`.")
+    return []
+
+
+def _hash_inits(target: str) -> dict[str, str]:
+    if osp.isfile(target):
+        return {}
+    inits = {}
+    for root, _, files in os.walk(target):
+        if "__init__.py" in files:
+            path = osp.abspath(osp.join(root, "__init__.py"))
+            inits[path] = _file_hash(path)
+    return inits
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _import_file(import_name: str) -> list[list[Any]] | None:
+    """
+    Import a file and returns `[registry name, name, target, extra_info]` of entries
+    it registered, or `None` if it failed.
+    """
+    with Registry._registry_pool.record() as recorded:
         try:
             importlib.import_module(import_name)
         except Exception:
@@ -193,34 +240,296 @@ def _auto_register(target: str, module_name: str) -> None:
 
             logger.critical("Fail to register file {}", import_name)
             Console().print_exception()
-        logger.success("Register file {}", import_name)
-    elif osp.isdir(target):
-        for file_name in os.listdir(target):
-            full_path = osp.join(target, file_name)
-            if osp.isdir(full_path):
-                _auto_register(full_path, module_name + "." + file_name)
-            else:
-                _auto_register(full_path, module_name)
+            return None
+    logger.success("Register file {}", import_name)
+    entries = []
+    for reg_name, name in recorded:
+        reg = Registry._registry_pool[reg_name]
+        if name in reg:
+            entries.append([reg_name, name, reg[name], reg.extra_info.get(name)])
+    return entries
+
+
+def _owner(target: str, modules: dict[str, str]) -> str | None:
+    parts = target.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        file = modules.get(".".join(parts[:i]))
+        if file is not None:
+            return file
+    return None
+
+
+def _register_files(
+    files: list[tuple[str, str]], modules: dict[str, str] | None = None
+) -> tuple[dict[str, dict[str, Any]], dict[str, float]]:
+    """
+    Import files and returns their records for the registry state and their import time.
+    An entry is attributed to the file which defines its target according to `modules`,
+    or else the file whose import registered it. Files failed to import are not recorded.
+    """
+    modules = modules or {import_name: file for file, import_name in files}
+    records: dict[str, dict[str, Any]] = {}
+    timings: dict[str, float] = {}
+    for file, import_name in files:
+        start = time.perf_counter()
+        entries = _import_file(import_name)
+        timings[file] = time.perf_counter() - start
+        if entries is None:
+            continue
+        records.setdefault(file, dict(entries=[]))
+        records[file].update(sha256=_file_hash(file), module=import_name)
+        for entry in entries:
+            owner = _owner(entry[2], modules) or file
+            records.setdefault(owner, dict(entries=[]))["entries"].append(entry)
+    return {k: v for k, v in records.items() if "sha256" in v}, timings
+
+
+def _register_worker(
+    files: list[tuple[str, str]], modules: dict[str, str]
+) -> tuple[dict[str, dict[str, Any]], dict[str, float], dict[str, Any], dict[str, Any]]:
+    records, timings = _register_files(files, modules)
+    fields = {
+        name: (_registry_class_path(reg), getattr(reg, "extra_field", None))
+        for name, reg in Registry._registry_pool.items()
+    }
+    signatures = build_signature_entries(
+        (e[1], e[2]) for record in records.values() for e in record["entries"]
+    )
+    return records, timings, fields, signatures
+
+
+def _split_subtrees(files: list[tuple[str, str]], jobs: int) -> list[list[tuple[str, str]]]:
+    """
+    Group files by their directories, and distribute groups to at most `jobs` buckets
+    with balanced number of files.
+    """
+    groups: dict[str, list[tuple[str, str]]] = {}
+    for item in files:
+        groups.setdefault(osp.dirname(item[0]), []).append(item)
+    buckets: list[list[tuple[str, str]]] = [[] for _ in range(min(jobs, len(groups)))]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(buckets, key=len).extend(group)
+    return buckets
+
+
+def _merge_records(
+    files: list[tuple[str, str]],
+    records: dict[str, dict[str, Any]],
+    fields: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
+    """
+    Merge entries collected by workers into the registry pool in the order of `files`.
+    Registries are created with the classes reported by workers, `fields` maps their
+    names to `(module:qualname of the class, extra_field)`. A file conflicting with
+    entries merged before is dropped like failing to import with
+    `register_module(force=False)`.
+    """
+    for reg_name, (cls_path, extra_field) in fields.items():
+        reg_cls = _registry_class(cls_path)
+        reg = reg_cls(reg_name, extra_field=extra_field)
+        if type(reg) is not reg_cls:
+            raise RuntimeError(
+                f"Registry `{reg_name}` is `{type(reg).__qualname__}` in the main process, "
+                f"but `{reg_cls.__qualname__}` in workers."
+            )
+    merged = {}
+    for file, import_name in files:
+        if file not in records:
+            continue
+        entries = records[file]["entries"]
+        conflicts = []
+        for reg_name, name, target, _ in entries:
+            reg = Registry._registry_pool.get(reg_name)
+            if reg is not None and reg.get(name, target) != target:
+                conflicts.append((reg_name, name))
+        if conflicts:
+            logger.critical("Fail to register file {}", import_name)
+            for reg_name, name in conflicts:
+                logger.critical(f"The name {name} exists in `{reg_name}`.")
+            continue
+        for reg_name, name, target, info in entries:
+            reg = Registry._registry_pool[reg_name]
+            reg[name] = target
+            if info is not None:
+                reg.extra_info[name] = info
+        merged[file] = records[file]
+    return merged
+
+
+def _register_files_parallel(
+    files: list[tuple[str, str]], modules: dict[str, str], jobs: int
+) -> tuple[dict[str, dict[str, Any]], dict[str, float], dict[str, Any]]:
+    """
+    Import disjoint subtrees of files in `jobs` worker processes and merge their
+    entries into the registry pool. Signatures are inspected by workers as well.
+    """
+    records: dict[str, dict[str, Any]] = {}
+    timings: dict[str, float] = {}
+    fields: dict[str, Any] = {}
+    signatures: dict[str, Any] = {}
+    buckets = _split_subtrees(files, jobs)
+    logger.info(f"Register {len(files)} files with {len(buckets)} processes.")
+    with ProcessPoolExecutor(max(len(buckets), 1)) as executor:
+        futures = [executor.submit(_register_worker, bucket, modules) for bucket in buckets]
+        for future in futures:
+            worker_records, worker_timings, worker_fields, worker_signatures = future.result()
+            records.update(worker_records)
+            timings.update(worker_timings)
+            fields.update(worker_fields)
+            signatures.update(worker_signatures)
+    return _merge_records(files, records, fields), timings, signatures
+
+
+def _register(
+    files: list[tuple[str, str]], modules: dict[str, str], jobs: int
+) -> tuple[dict[str, dict[str, Any]], dict[str, Any] | None]:
+    """
+    Register files serially or in parallel, log their import time and returns records
+    of files with signature index entries if workers have built them.
+    """
+    signatures = None
+    if jobs > 1 and files:
+        records, timings, signatures = _register_files_parallel(files, modules, jobs)
     else:
-        logger.ex(f"Invalid target `{target}`.")
+        records, timings = _register_files(files, modules)
+    rows = sorted(timings.items(), key=lambda x: x[1], reverse=True)
+    table = _create_table(
+        ["FILE", "IMPORT TIME(s)"], [(osp.relpath(f), f"{t:.3f}") for f, t in rows]
+    )
+    logger.info("Import time of files:\n{}", table)
+    return records, signatures
+
+
+def _state_file() -> str:
+    return osp.join(workspace.cache_dir, _registry_state_file)
+
+
+def _load_state() -> dict[str, Any] | None:
+    if not osp.exists(_state_file()):
+        return None
+    with open(_state_file(), encoding="UTF-8") as f:
+        state = json.load(f)
+    return state if state.get("version") == _STATE_VERSION else None
+
+
+def _dump_state(state: dict[str, Any]) -> None:
+    state["version"] = _STATE_VERSION
+    tmp_path = _state_file() + ".tmp"
+    with open(tmp_path, "w", encoding="UTF-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, _state_file())
+
+
+def _is_under(file: str, target: str) -> bool:
+    return file == target or file.startswith(osp.join(target, ""))
+
+
+def _incremental_register(target: str, files: list[tuple[str, str]], jobs: int) -> bool:
+    """
+    Re-import changed or new files only and patch the registry cache and the signature
+    index. Returns False if a full registration is required.
+    """
+    state = _load_state()
+    if state is None or not osp.exists(workspace.registry_cache_file):
+        logger.info("No registry state found, register all files.")
+        return False
+    inits = _hash_inits(target)
+    if any(state["inits"].get(path) != sha for path, sha in inits.items()):
+        logger.info("`__init__.py` has been modified, register all files.")
+        return False
+    try:
+        registries = Registry.read_cache()
+    except RegistryCacheError as e:
+        logger.info(f"{e} Register all files.")
+        return False
+
+    records: dict[str, dict[str, Any]] = state["files"]
+    changed = [
+        (file, import_name)
+        for file, import_name in files
+        if file not in records or records[file]["sha256"] != _file_hash(file)
+    ]
+    paths = {file for file, _ in files}
+    deleted = [file for file in records if _is_under(file, target) and file not in paths]
+    if not changed and not deleted:
+        logger.success("Registry cache is up to date.")
+        return True
+
+    for file in [*(f for f, _ in changed), *deleted]:
+        for reg_name, name, *_ in records.pop(file, {}).get("entries", []):
+            if reg_name in registries:
+                registries[reg_name].pop(name, None)
+                registries[reg_name].extra_info.pop(name, None)
+        logger.ex(f"Drop entries of {file}.")
+    kept = {tuple(e[:3]) for record in records.values() for e in record["entries"]}
+
+    modules = {import_name: file for file, import_name in files}
+    records_changed, signatures = _register(changed, modules, jobs)
+    for file, record in records_changed.items():
+        entries = [e for e in record["entries"] if tuple(e[:3]) not in kept]
+        conflicts = [
+            e for e in entries if e[0] in registries and registries[e[0]].get(e[1], e[2]) != e[2]
+        ]
+        if conflicts:
+            logger.critical("Fail to register file {}", record["module"])
+            for reg_name, name, *_ in conflicts:
+                logger.critical(f"The name {name} exists in `{reg_name}`.")
+            continue
+        for reg_name, name, target_path, info in entries:
+            if reg_name not in registries:
+                registries[reg_name] = Registry._registry_pool[reg_name]
+                continue
+            registries[reg_name][name] = target_path
+            if info is not None:
+                registries[reg_name].extra_info[name] = info
+        records[file] = dict(record, entries=entries)
+
+    Registry.dump(registries=registries)
+    dump_signature_index(True, signatures)
+    _dump_state(state)
+    logger.success(f"Update {len(changed)} changed and {len(deleted)} deleted files.")
+    return True
 
 
 @app.command()
 def auto_register(
     target: Annotated[str, CArg(help="What to be registered")] = "",
+    incremental: Annotated[
+        bool,
+        typer.Option(
+            "--incremental",
+            "-i",
+            help="Only re-import files modified since the last registration",
+        ),
+    ] = False,
+    jobs: Annotated[
+        int, typer.Option("--jobs", "-j", help="Number of processes to import files")
+    ] = 1,
 ) -> None:
     """
     Automatically import all modules in `src_dir` by default or `target`
-        and register all modules, then dump to files.
+        and register all modules, then dump them and their signatures to files.
     """
     if not osp.exists(_workspace_config_file):
         logger.critical("Please run `excore init` in your command line first!")
         sys.exit(0)
     update = target == ""
-    target = target or osp.abspath(workspace.src_dir)
+    target = osp.abspath(target or workspace.src_dir)
     module_name = _get_default_module_name(workspace.src_dir.split(os.sep)[-1], target)
-    _auto_register(target, module_name)
+    files = _discover(target, module_name)
+    if incremental and _incremental_register(target, files, jobs):
+        return
+    records, signatures = _register(files, {m: f for f, m in files}, jobs)
     Registry.dump(update)
+    dump_signature_index(update, signatures)
+
+    state = _load_state() if update else None
+    if state is None:
+        state = dict(inits={}, files={})
+    state["files"] = {k: v for k, v in state["files"].items() if not _is_under(k, target)}
+    state["files"].update(records)
+    state["inits"].update(_hash_inits(target))
+    _dump_state(state)
 
 
 @app.command()
@@ -1,6 +1,7 @@
 from .action import DictAction
-from .config import build_all, load, load_config
+from .config import abuild_all, build_all, load, load_config, load_plan
 from .models import (
+    BuildContext,
     ClassNode,
     ConfigArgumentHook,
     ConfigNode,
@@ -14,12 +15,17 @@ from .models import (
     silent,
 )
 from .parse import ConfigDict, set_primary_fields
+from .profiler import BuildProfiler
 
 __all__ = [
+    "abuild_all",
     "build_all",
+    "BuildContext",
+    "BuildProfiler",
     "DictAction",
     "load",
     "load_config",
+    "load_plan",
     "silent",
     "set_primary_fields",
     "ConfigArgumentHook",
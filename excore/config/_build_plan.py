@@ -0,0 +1,505 @@
+"""
+Build plans of parsed configs.
+
+A `BuildPlan` is a flat list of steps compiled from a parsed config in the order they
+are built by `LazyConfig.build_all`. Each step constructs one node with its resolved
+target, and its arguments refer to the results of previous steps::
+
+    call     instantiate `target(**params)`, shared by all references of a `ReusedNode`
+    class    returns the target itself, see `ClassNode`
+    hook     a copied `ConfigArgumentHook` whose `node` calls back into the plan
+    opaque   call a node of unknown type as is
+
+Steps only reachable from a `ConfigArgumentHook` are lazy, they are executed when the
+hook calls its node. A plan can be saved and loaded, so that a config is parsed once,
+e.g. by rank 0 of distributed training, and other processes build from the plan directly.
+
+Steps form a DAG by their references, `_ConcurrentExecutor` builds independent steps
+on a thread pool as soon as the steps they depend on are built, and `_AsyncExecutor`
+builds them as tasks of an asyncio event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import copy
+import functools
+import inspect
+import os
+import pickle
+import threading
+import time
+from inspect import ismodule
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from .._constants import workspace
+from .._exceptions import CoreConfigSupportError, ModuleBuildError
+from ..engine.logging import logger, trace
+from .models import (
+    ClassNode,
+    ConfigArgumentHook,
+    ConfigHookNode,
+    InterNode,
+    LazyTarget,
+    ModuleNode,
+    ModuleWrapper,
+    ReusedNode,
+    VariableReference,
+    _copy_containers,
+)
+from .parse import ConfigDict
+from .profiler import current_profiler
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = ["BuildPlan"]
+
+_PLAN_VERSION = 1
+_CALL_NODES = (ModuleNode, InterNode, ReusedNode, ConfigHookNode)
+_CLASS_NODES = (ClassNode, VariableReference)
+
+
+class _Ref(NamedTuple):
+    index: int
+
+
+class _Wrap(NamedTuple):
+    is_dict: bool
+    items: list[tuple[str, Any]]
+
+
+class _Step(NamedTuple):
+    kind: str
+    target: Any
+    params: dict[str, Any]
+    reused: bool
+    lazy: bool
+
+
+def _plain(obj: Any) -> Any:
+    """Converts `ConfigDict`, which cannot be pickled, to dict and keeps nodes as is."""
+    if type(obj) is dict or isinstance(obj, ConfigDict):
+        return {k: _plain(v) for k, v in obj.items()}
+    if type(obj) is list:
+        return [_plain(v) for v in obj]
+    return obj
+
+
+def _refs(enc: Any) -> list[int]:
+    if isinstance(enc, _Ref):
+        return [enc.index]
+    if isinstance(enc, _Wrap):
+        return [i for _, v in enc.items for i in _refs(v)]
+    return []
+
+
+def _zip_strict(keys: Any, values: Any) -> Any:
+    """`zip(keys, values, strict=True)` which is only available since python 3.10."""
+    keys, values = tuple(keys), tuple(values)
+    if len(keys) != len(values):
+        raise ValueError(f"Got {len(values)} values for {len(keys)} keys.")
+    return zip(keys, values)  # noqa: B905
+
+
+def _target_of(node: ModuleNode) -> Any:
+    if ismodule(node.target):
+        return LazyTarget(node.target.__name__)
+    return node.target
+
+
+def _build_error(target: Any, params: dict[str, Any]) -> ModuleBuildError:
+    return ModuleBuildError(
+        f"Instantiate Error with module {target} and arguments {params.items()}"
+    )
+
+
+def _log_built(target: Any, params: dict[str, Any]) -> None:
+    if workspace.excore_log_build_message:
+        logger.success(
+            f"Successfully instantiated: {target.__name__} with arguments {params.items()}"
+        )
+
+
+async def _to_thread(func: Callable, **kwargs: Any) -> Any:
+    """`asyncio.to_thread` which is missing before python 3.9."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(ctx.run, func, **kwargs))
+
+
+class _PlanNode:
+    """The `node` of hooks in a plan, calls the compiled node through `executor`."""
+
+    def __init__(self, enc: Any, name: str, executor: _Executor | None = None) -> None:
+        self.enc = enc
+        self.name = name
+        self.executor = executor
+
+    def __call__(self, **params: Any) -> Any:
+        assert self.executor is not None
+        return self.executor.value(self.enc, params)
+
+    def __reduce__(self) -> tuple:
+        return _PlanNode, (self.enc, self.name)
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.steps: list[_Step] = []
+        self.reused: dict[int, int] = {}
+        self.validated: set[int] = set()
+
+    def add(self, step: _Step) -> _Ref:
+        self.steps.append(step)
+        return _Ref(len(self.steps) - 1)
+
+    def param(self, value: Any, lazy: bool) -> Any:
+        # Same as `ModuleNode._update_params`, only nodes and wrappers are called.
+        if isinstance(value, (ModuleWrapper, ModuleNode)):
+            return self.callable(value, lazy)
+        return _plain(value)
+
+    def callable(self, obj: Any, lazy: bool) -> Any:
+        if isinstance(obj, ModuleWrapper):
+            items = [(k, self.callable(v, lazy)) for k, v in obj.items()]
+            return _Wrap(getattr(obj, "is_dict", False), items)
+        if isinstance(obj, ConfigArgumentHook):
+            hook = copy.copy(obj)
+            hook.node = _PlanNode(self.callable(obj.node, True), obj.name)
+            return self.add(_Step("hook", hook, {}, False, lazy))
+        if not isinstance(obj, ModuleNode) or type(obj) not in (*_CALL_NODES, *_CLASS_NODES):
+            return self.add(_Step("opaque", obj, {}, False, lazy))
+        if type(obj) is VariableReference:
+            return _plain(obj.target)
+        if type(obj) is ClassNode:
+            return self.add(_Step("class", _target_of(obj), {}, False, lazy))
+        if obj._no_call:
+            return obj
+        if id(obj) in self.reused:
+            return _Ref(self.reused[id(obj)])
+        if id(obj) not in self.validated:
+            obj.validate()
+            self.validated.add(id(obj))
+        params = {k: self.param(v, lazy) for k, v in obj.items()}
+        reused = type(obj) is ReusedNode
+        ref = self.add(_Step("call", _target_of(obj), params, reused, lazy))
+        if reused:
+            self.reused[id(obj)] = ref.index
+        return ref
+
+
+class _Executor:
+    """Executes steps of a plan, results of reused and non-lazy steps are kept in `values`."""
+
+    def __init__(self, plan: BuildPlan) -> None:
+        self.plan = plan
+        self.values: dict[int, Any] = {}
+        self.next_step = 0
+        # Lazy reused steps may be reached by hooks in different threads.
+        self.reused_lock = threading.RLock()
+
+    def __call__(self, name: str) -> Any:
+        """Build the field `name`."""
+        end, enc = self.plan.fields[name]
+        steps = self.plan.steps
+        for index in range(self.next_step, end):
+            if not steps[index].lazy and index not in self.values:
+                self.values[index] = self._run(steps[index], {})
+        self.next_step = max(self.next_step, end)
+        return self.value(enc)
+
+    def value(self, enc: Any, params: dict[str, Any] | None = None) -> Any:
+        if isinstance(enc, _Ref):
+            if enc.index in self.values:
+                return self.values[enc.index]
+            step = self.plan.steps[enc.index]
+            if not step.reused:
+                out = self._run(step, params or {})
+                if not step.lazy:
+                    self.values[enc.index] = out
+                return out
+            with self.reused_lock:
+                if enc.index not in self.values:
+                    self.values[enc.index] = self._run(step, params or {})
+                return self.values[enc.index]
+        if isinstance(enc, _Wrap):
+            if enc.is_dict:
+                return {k: self.value(v) for k, v in enc.items}
+            res = [self.value(v) for _, v in enc.items]
+            return res[0] if len(res) == 1 else res
+        return _copy_containers(enc)
+
+    def _run(self, step: _Step, params: dict[str, Any]) -> Any:
+        target = step.target
+        if step.kind == "hook":
+            hook = copy.copy(target)
+            hook.node = _PlanNode(target.node.enc, target.node.name, self)
+            return hook(**params)
+        if step.kind == "opaque":
+            return target(**params)
+        if isinstance(target, LazyTarget):
+            target = target.resolve()
+        if step.kind == "class" or ismodule(target):
+            return target
+        if (profiler := current_profiler()) is not None:
+            with profiler.span(target.__name__, "BuildPlan"):
+                return self._call(target, step, params)
+        return self._call(target, step, params)
+
+    def _call(self, target: Callable, step: _Step, params: dict[str, Any]) -> Any:
+        # Parameters of the node take precedence, see `ModuleNode._update_params`.
+        params = {**params, **{k: self.value(v) for k, v in step.params.items()}}
+        try:
+            module = target(**params)
+        except Exception as exc:
+            raise _build_error(target, params) from exc
+        _log_built(target, params)
+        return module
+
+
+class _ConcurrentExecutor(_Executor):
+    """
+    Builds non-lazy steps on `pool` in dependency order. Fields are still returned in
+    the order they are requested, each once all steps before its end are built.
+    """
+
+    def __init__(self, plan: BuildPlan, pool: Executor) -> None:
+        super().__init__(plan)
+        self.pool = pool
+        self.cond = threading.Condition()
+        self.error: BaseException | None = None
+        self.started = False
+        steps = plan.steps
+        self.waiting: dict[int, int] = {}
+        self.dependents: dict[int, list[int]] = {}
+        for index, step in enumerate(steps):
+            if not step.lazy:
+                deps = self._deps(index, set())
+                self.waiting[index] = len(deps)
+                for dep in deps:
+                    self.dependents.setdefault(dep, []).append(index)
+        self.finished = [step.lazy for step in steps]
+
+    def _deps(self, index: int, visited: set[int]) -> set[int]:
+        """Non-lazy steps used by `index`, including those used through lazy steps."""
+        step = self.plan.steps[index]
+        refs = [i for v in step.params.values() for i in _refs(v)]
+        if step.kind == "hook":
+            refs += _refs(step.target.node.enc)
+        deps = set()
+        for ref in refs:
+            if not self.plan.steps[ref].lazy:
+                deps.add(ref)
+            elif ref not in visited:
+                visited.add(ref)
+                deps |= self._deps(ref, visited)
+        return deps
+
+    def _submit(self, index: int) -> None:
+        # Workers do not inherit context variables, e.g. `BuildContext`.
+        self.pool.submit(contextvars.copy_context().run, self._work, index)
+
+    def _work(self, index: int) -> None:
+        if self.error is not None:
+            return
+        try:
+            out = self._run(self.plan.steps[index], {})
+        except BaseException as exc:
+            with self.cond:
+                self.error = self.error or exc
+                self.cond.notify_all()
+            return
+        ready = []
+        with self.cond:
+            self.values[index] = out
+            self.finished[index] = True
+            for dep in self.dependents.get(index, ()):
+                self.waiting[dep] -= 1
+                if self.waiting[dep] == 0:
+                    ready.append(dep)
+            self.cond.notify_all()
+        for dep in ready:
+            self._submit(dep)
+
+    def __call__(self, name: str) -> Any:
+        if not self.started:
+            self.started = True
+            for index in [i for i, n in self.waiting.items() if n == 0]:
+                self._submit(index)
+        end, enc = self.plan.fields[name]
+        with self.cond:
+            while self.error is None:
+                while self.next_step < end and self.finished[self.next_step]:
+                    self.next_step += 1
+                if self.next_step >= end:
+                    break
+                self.cond.wait()
+            if self.error is not None:
+                raise self.error
+        return self.value(enc)
+
+
+class _AsyncExecutor(_Executor):
+    """
+    Builds each non-lazy and reused step once as an asyncio task, which waits for the
+    steps it refers to. Async targets are awaited on the loop, others are called in
+    threads and awaited if they return awaitables. Hooks are called in threads too and
+    their nodes are built on the loop.
+    """
+
+    def __init__(self, plan: BuildPlan) -> None:
+        super().__init__(plan)
+        self.tasks: dict[int, asyncio.Task] = {}
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    async def __call__(self, name: str) -> Any:  # type: ignore
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+            for index, step in enumerate(self.plan.steps):
+                if not step.lazy:
+                    self._task(index)
+        return await self.avalue(self.plan.fields[name][1])
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+
+    def _task(self, index: int) -> asyncio.Task:
+        if index not in self.tasks:
+            assert self.loop is not None
+            self.tasks[index] = self.loop.create_task(self._arun(self.plan.steps[index], {}))
+        return self.tasks[index]
+
+    async def avalue(self, enc: Any, params: dict[str, Any] | None = None) -> Any:
+        if isinstance(enc, _Ref):
+            step = self.plan.steps[enc.index]
+            if step.lazy and not step.reused:
+                return await self._arun(step, params or {})
+            return await self._task(enc.index)
+        if isinstance(enc, _Wrap):
+            values = await asyncio.gather(*(self.avalue(v) for _, v in enc.items))
+            if enc.is_dict:
+                return {k: v for (k, _), v in _zip_strict(enc.items, values)}
+            return values[0] if len(values) == 1 else list(values)
+        return _copy_containers(enc)
+
+    def value(self, enc: Any, params: dict[str, Any] | None = None) -> Any:
+        # Called by nodes of hooks, which run in threads.
+        assert self.loop is not None
+        return asyncio.run_coroutine_threadsafe(self.avalue(enc, params), self.loop).result()
+
+    async def _arun(self, step: _Step, params: dict[str, Any]) -> Any:
+        target = step.target
+        if step.kind == "hook":
+            hook = copy.copy(target)
+            hook.node = _PlanNode(target.node.enc, target.node.name, self)
+            return await _to_thread(hook, **params)
+        if step.kind == "opaque":
+            return await _to_thread(target, **params)
+        if isinstance(target, LazyTarget):
+            target = target.resolve()
+        if step.kind == "class" or ismodule(target):
+            return target
+        values = await asyncio.gather(*(self.avalue(v) for v in step.params.values()))
+        params = {**params, **dict(_zip_strict(step.params, values))}
+        # Steps overlap on the loop, so only the construction is recorded.
+        start = time.perf_counter_ns()
+        try:
+            if inspect.iscoroutinefunction(target):
+                module = await target(**params)
+            else:
+                module = await _to_thread(target, **params)
+                if inspect.isawaitable(module):
+                    module = await module
+        except Exception as exc:
+            raise _build_error(target, params) from exc
+        if (profiler := current_profiler()) is not None:
+            profiler.record(target.__name__, "BuildPlan", start, time.perf_counter_ns() - start)
+        _log_built(target, params)
+        return module
+
+
+class BuildPlan:
+    """
+    A flat build plan of a parsed config, see the module docstring.
+
+    Attributes:
+        steps (list): Steps in build order.
+        fields (dict): The end of steps of each field and the reference of its result.
+        target_modules (list[str]): Fields in build order.
+        isolated (dict): Values of non-primary fields.
+        hook_config (dict): The raw `ExcoreHook` config, hooks are rebuilt from it.
+    """
+
+    def __init__(
+        self,
+        steps: list[_Step],
+        fields: dict[str, tuple[int, Any]],
+        target_modules: list[str],
+        isolated: dict[str, Any],
+        hook_config: dict[str, Any],
+    ) -> None:
+        self.steps = steps
+        self.fields = fields
+        self.target_modules = target_modules
+        self.isolated = isolated
+        self.hook_config = hook_config
+
+    @classmethod
+    def compile(
+        cls, config: ConfigDict, target_modules: list[str], hook_config: dict[str, Any]
+    ) -> BuildPlan:
+        """
+        Compile a parsed config. Nodes are validated here, so that building a plan
+        does not need the signature index.
+        """
+        compiler = _Compiler()
+        fields = {}
+        for name in target_modules:
+            if name not in config:
+                continue
+            enc = compiler.callable(config[name], False)
+            fields[name] = (len(compiler.steps), enc)
+        isolated = {name: _plain(config[name]) for name in config.non_primary_keys()}
+        trace("build_plan.compiled", steps=len(compiler.steps), fields=len(fields))
+        return cls(compiler.steps, fields, list(fields), isolated, _plain(hook_config))
+
+    def executor(self, pool: Executor | None = None) -> _Executor:
+        """
+        Returns a callable which builds a field by its name, once per field. Steps are
+        built on `pool` concurrently if it is given.
+        """
+        return _ConcurrentExecutor(self, pool) if pool else _Executor(self)
+
+    def async_executor(self) -> _AsyncExecutor:
+        """Returns a coroutine function which builds a field by its name, once per field."""
+        return _AsyncExecutor(self)
+
+    def save(self, file_path: str) -> None:
+        """Save the plan to `file_path`, all targets and arguments must be picklable."""
+        data = pickle.dumps(
+            dict(version=_PLAN_VERSION, **self.__dict__), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str) -> BuildPlan:
+        """
+        Load a plan saved by `save`.
+
+        Raises:
+            CoreConfigSupportError: If the plan is saved by another version.
+        """
+        with open(file_path, "rb") as f:
+            data = pickle.load(f)
+        version = data.pop("version", None)
+        if version != _PLAN_VERSION:
+            raise CoreConfigSupportError(
+                f"Build plan version mismatch, expected {_PLAN_VERSION} but got {version}."
+            )
+        return cls(**data)
@@ -0,0 +1,185 @@
+"""
+On-disk cache of loaded configs.
+
+A cached config is stored in `workspace.cache_dir/config_cache` as two files:
+
+    <key>.json      manifest of the entry file and all transitive base files, where
+                    `key` is the hash of the entry path, `base_key` and `update_dict`
+    <digest>.pkl    the merged config as plain containers, where `digest` is the hash
+                    of all file contents
+
+A lookup first compares `mtime` and size of every file in the manifest, and only
+hashes files whose stat differs, so a hit costs a few `os.stat` calls.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import os.path as osp
+import pickle
+import time
+from contextlib import suppress
+from typing import Any
+
+from .._constants import workspace
+from ..engine.logging import logger, trace
+from .parse import ConfigDict
+
+__all__ = ["load_cached_config", "dump_cached_config", "read_config_file"]
+
+_CACHE_VERSION = 1
+# stat of files modified within this period before recorded is not trusted.
+_RACY_NS = 2_000_000_000
+
+
+def _cache_dir() -> str:
+    return osp.join(workspace.cache_dir, "config_cache")
+
+
+def _enabled() -> bool:
+    return workspace.excore_config_cache and osp.isdir(workspace.cache_dir)
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def read_config_file(path: str) -> tuple[str, list[Any]]:
+    """
+    Read a config file, returns its text and `[path, mtime_ns, size, sha256, read_ns]` of
+    the exact bytes read, which are recorded by `dump_cached_config`.
+    """
+    read_ns = time.time_ns()
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        data = f.read()
+    entry = [path, st.st_mtime_ns, st.st_size, hashlib.sha256(data).hexdigest(), read_ns]
+    return data.decode("UTF-8"), entry
+
+
+def _manifest_path(filename: str, base_key: str, update_dict: dict | None) -> str | None:
+    try:
+        raw = json.dumps(
+            [_CACHE_VERSION, osp.abspath(filename), base_key, update_dict], sort_keys=True
+        )
+    except (TypeError, ValueError):
+        return None
+    return osp.join(_cache_dir(), hashlib.sha256(raw.encode()).hexdigest() + ".json")
+
+
+def _to_plain(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k: _to_plain(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_to_plain(v) for v in obj]
+    return obj
+
+
+def _to_config_dict(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        cfg = ConfigDict()
+        for k, v in obj.items():
+            cfg[k] = _to_config_dict(v)
+        return cfg
+    if isinstance(obj, list):
+        return [_to_config_dict(v) for v in obj]
+    return obj
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _is_fresh(manifest: dict[str, Any]) -> tuple[bool, bool]:
+    """
+    Returns whether all files are unmodified, and whether stats in `manifest` have been
+    refreshed for files which are touched but have the same content.
+    """
+    recorded_ns = manifest["recorded_ns"]
+    refreshed = False
+    for entry in manifest["files"]:
+        path, mtime_ns, size, sha = entry
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False, False
+        trusted = st.st_mtime_ns == mtime_ns and st.st_size == size
+        if trusted and mtime_ns < recorded_ns - _RACY_NS:
+            continue
+        if _file_hash(path) != sha:
+            return False, False
+        entry[1:3] = st.st_mtime_ns, st.st_size
+        refreshed = True
+    if refreshed:
+        manifest["recorded_ns"] = time.time_ns()
+    return True, refreshed
+
+
+def load_cached_config(
+    filename: str, base_key: str, update_dict: dict | None = None
+) -> ConfigDict | None:
+    """
+    Returns the cached config loaded from `filename` and updated by `update_dict`, or
+    `None` if it is not cached or any of its files has been modified.
+    """
+    if not _enabled() or (manifest_path := _manifest_path(filename, base_key, update_dict)) is None:
+        return None
+    try:
+        with open(manifest_path, encoding="UTF-8") as f:
+            manifest = json.load(f)
+        fresh, refreshed = _is_fresh(manifest)
+        if not fresh:
+            trace("config_cache.stale", filename=filename)
+            return None
+        with open(osp.join(_cache_dir(), manifest["digest"] + ".pkl"), "rb") as f:
+            data = pickle.load(f)
+        if refreshed:
+            _atomic_write(manifest_path, json.dumps(manifest).encode("UTF-8"))
+    except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+        return None
+    logger.info(f"load_config {filename} from cache")
+    return _to_config_dict(data)
+
+
+def dump_cached_config(
+    filename: str,
+    base_key: str,
+    update_dict: dict | None,
+    files: list[str],
+    config: ConfigDict,
+) -> None:
+    """
+    Cache a config loaded from `filename` and updated by `update_dict`, `files` are
+    entries of the entry file and all of its transitive base files returned by
+    `read_config_file`. Files are recorded as they were parsed, so that modifications
+    made after parsing invalidate the cache.
+    """
+    if not _enabled() or (manifest_path := _manifest_path(filename, base_key, update_dict)) is None:
+        return
+    recorded_ns = min(entry[4] for entry in files)
+    entries = list({entry[0]: entry[:4] for entry in files}.values())
+    key = [osp.basename(manifest_path), [[path, sha] for path, _, _, sha in entries]]
+    digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+    try:
+        data = pickle.dumps(_to_plain(config), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        trace("config_cache.unpicklable", filename=filename)
+        return
+    os.makedirs(_cache_dir(), exist_ok=True)
+    try:
+        with open(manifest_path, encoding="UTF-8") as f:
+            superseded = json.load(f)["digest"]
+    except (OSError, ValueError, KeyError):
+        superseded = None
+    _atomic_write(osp.join(_cache_dir(), digest + ".pkl"), data)
+    manifest = dict(files=entries, digest=digest, recorded_ns=recorded_ns)
+    _atomic_write(manifest_path, json.dumps(manifest).encode("UTF-8"))
+    if superseded is not None and superseded != digest:
+        with suppress(OSError):
+            os.remove(osp.join(_cache_dir(), superseded + ".pkl"))
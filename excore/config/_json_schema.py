@@ -13,6 +13,7 @@ import toml
 from excore import workspace
 
 from .._exceptions import AnnotationsFutureError
+from ..engine._signature import _inspect_signature, lookup
 from ..engine.logging import logger
 from ..engine.registry import Registry, load_registries
 from .models import ConfigArgumentHook, _str_to_target
@@ -140,6 +141,61 @@ def _check(bases) -> bool:
     return False
 
 
+def _parse_target(name: str, func: Any, silent: bool = False) -> tuple[Property, list[str | int]]:
+    """
+    Parse a registered class or function to its JSON schema property and source location.
+
+    Args:
+        name (str): The registered name of the target.
+        func (Any): The class or function to be parsed.
+        silent (bool): Whether to suppress error messages of skipped parameters.
+            Defaults to False.
+
+    Returns:
+        tuple[Property, list[str | int]]: A tuple containing the JSON schema property
+            of the parameters and the source file and line of the target.
+    """
+    location: list[str | int] = [inspect.getfile(func), inspect.getsourcelines(func)[1]]
+    doc_string = func.__doc__
+    is_hook = isclass(func) and issubclass(func, ConfigArgumentHook)
+    if isclass(func) and _check(func.__bases__):
+        func = func.__init__
+    params = _inspect_signature(func).parameters  # type: ignore
+    param_props: Property = {"type": "object", "properties": {}}
+    if doc_string:
+        # TODO: parse doc string to each parameters
+        param_props["description"] = doc_string
+    items = {}
+    required = []
+    for param_name, param_obj in params.items():
+        if param_name == "self" or (is_hook and param_name == "node"):
+            continue
+        try:
+            is_required, item = parse_single_param(param_obj)
+        except Exception as e:
+            if not silent:
+                from rich.console import Console
+
+                Console().print_exception()
+            if isinstance(e, AnnotationsFutureError):
+                if not silent:
+                    logger.error(
+                        f"Skip {name} due to mismatch of python version and annotations future."
+                    )
+                break
+            if not silent:
+                logger.error(f"Skip parameter {param_obj.name} of {name}")
+            continue
+        items[param_name] = item
+        if is_required:
+            required.append(param_name)
+    if items:
+        param_props["properties"] = items
+    if required:
+        param_props["required"] = required
+    return param_props, location
+
+
 def parse_registry(reg: Registry) -> tuple[Property, dict[str, list[str | int]]]:
     """
     Parse registry items to generate JSON schema properties and class mapping.
@@ -147,7 +203,8 @@ def parse_registry(reg: Registry) -> tuple[Property, dict[str, list[str | int]]]
     This function iterates through the registry items, extracts relevant information
     such as function signatures, docstrings, and source file locations, and constructs
     a JSON schema property dictionary and a class mapping dictionary. It handles
-    exceptions and logs errors appropriately.
+    exceptions and logs errors appropriately. Items which are recorded in the signature
+    index and whose source files are unchanged will not be imported again.
 
     Args:
         reg (Registry): The registry containing items to be parsed.
@@ -162,44 +219,17 @@ def parse_registry(reg: Registry) -> tuple[Property, dict[str, list[str | int]]]
     }
     class_mapping: dict[str, list[str | int]] = {}
     for name, item_dir in reg.items():
+        entry = lookup(item_dir)
+        if entry is not None and entry["is_module"]:
+            continue
+        if entry is not None and entry["schema"] is not None:
+            class_mapping[name] = entry["location"]
+            props["properties"][name] = entry["schema"]  # type: ignore
+            continue
         func = _str_to_target(item_dir)  # type: ignore
         if isinstance(func, ModuleType):
             continue
-        class_mapping[name] = [inspect.getfile(func), inspect.getsourcelines(func)[1]]
-        doc_string = func.__doc__
-        is_hook = isclass(func) and issubclass(func, ConfigArgumentHook)
-        if isclass(func) and _check(func.__bases__):
-            func = func.__init__
-        params = inspect.signature(func).parameters  # type: ignore
-        param_props = {"type": "object", "properties": {}}
-        if doc_string:
-            # TODO: parse doc string to each parameters
-            param_props["description"] = doc_string
-        items = {}
-        required = []
-        for param_name, param_obj in params.items():
-            if param_name == "self" or (is_hook and param_name == "node"):
-                continue
-            try:
-                is_required, item = parse_single_param(param_obj)
-            except Exception as e:
-                from rich.console import Console
-
-                Console().print_exception()
-                if isinstance(e, AnnotationsFutureError):
-                    logger.error(
-                        f"Skip {name} due to mismatch of python version and annotations future."
-                    )
-                    break
-                logger.error(f"Skip parameter {param_obj.name} of {name}")
-                continue
-            items[param_name] = item
-            if is_required:
-                required.append(param_name)
-        if items:
-            param_props["properties"] = items
-        if required:
-            param_props["required"] = required
+        param_props, class_mapping[name] = _parse_target(name, func)
         props["properties"][name] = param_props  # type: ignore
     return props, class_mapping
 
@@ -6,14 +6,18 @@ from typing import Any
 
 import toml
 
-from .._exceptions import CoreConfigSupportError
-from ..engine.logging import logger
+from .._exceptions import CoreConfigParseError, CoreConfigSupportError
+from ..engine._signature import forget_mtimes
+from ..engine.logging import logger, trace
 from ..engine.registry import load_registries
+from ._build_plan import BuildPlan
+from ._config_cache import dump_cached_config, load_cached_config, read_config_file
 from .lazy_config import LazyConfig
 from .models import ModuleWrapper
 from .parse import ConfigDict
+from .profiler import profile
 
-__all__ = ["load", "build_all", "load_config"]
+__all__ = ["load", "load_plan", "build_all", "abuild_all", "load_config"]
 
 
 BASE_CONFIG_KEY = "__base__"
@@ -33,30 +37,77 @@ def load_config(filename: str, base_key: str = "__base__") -> ConfigDict:
 
     Raises:
         CoreConfigSupportError: If the file extension is not ".toml".
+        CoreConfigParseError: If base configurations are circular.
     """
+    return _load_config(filename, base_key, [])
+
+
+def _load_config(
+    filename: str,
+    base_key: str,
+    files: list[list[Any]],
+    memo: dict[str, ConfigDict] | None = None,
+    stack: tuple[str, ...] = (),
+) -> ConfigDict:
+    """
+    Load a configuration file recursively. Each file is parsed once per load and memoized
+    in `memo`, which is safe since `_merge_config` never mutates merged configs. `stack`
+    holds files being loaded to detect circular bases. Entries of parsed files returned
+    by `read_config_file` are appended to `files`.
+    """
+    key = os.path.abspath(filename)
+    if key in stack:
+        chain = " -> ".join([*stack[stack.index(key) :], key])
+        raise CoreConfigParseError(f"Circular `{base_key}` detected: {chain}")
+    memo = {} if memo is None else memo
+    if key in memo:
+        trace("config.reuse_loaded", filename=filename)
+        return memo[key]
+
     logger.info(f"load_config {filename}")
     ext = os.path.splitext(filename)[-1]
     path = os.path.dirname(filename)
 
     if ext != ".toml":
         raise CoreConfigSupportError(f"Only support `toml` files for now, but got {filename}")
-    config = toml.load(filename, ConfigDict)
-
-    base_cfgs = [load_config(os.path.join(path, i), base_key) for i in config.pop(base_key, [])]
+    text, entry = read_config_file(key)
+    config = toml.loads(text, ConfigDict)
+    files.append(entry)
+
+    base_cfgs = [
+        _load_config(os.path.join(path, i), base_key, files, memo, (*stack, key))
+        for i in config.pop(base_key, [])
+    ]
     base_cfg = ConfigDict()
     for c in base_cfgs:
         _merge_config(base_cfg, c)
     _merge_config(base_cfg, config)
 
+    memo[key] = base_cfg
     return base_cfg
 
 
+def _copy_containers(value: Any) -> Any:
+    if isinstance(value, dict):
+        new = ConfigDict() if isinstance(value, ConfigDict) else {}
+        for k, v in value.items():
+            new[k] = _copy_containers(v)
+        return new
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    return value
+
+
 def _merge_config(base_cfg: ConfigDict, new_cfg: dict) -> None:
+    """
+    Merge `new_cfg` into `base_cfg` in place. Dicts and lists taken from `new_cfg` are
+    copied, so `new_cfg` is never mutated by following merges.
+    """
     for k, v in new_cfg.items():
         if k in base_cfg and isinstance(v, dict):
             _merge_config(base_cfg[k], v)
         else:
-            base_cfg[k] = v
+            base_cfg[k] = _copy_containers(v)
 
 
 def load(
@@ -69,7 +120,8 @@ def load(
 ) -> LazyConfig:
     """
     Load a configuration file and optionally updates it with a dictionary,
-    dumps it to a specified path.
+    dumps it to a specified path. The loaded configuration is cached in
+    `workspace.cache_dir` unless `EXCORE_CONFIG_CACHE=0`, see `_config_cache`.
 
     Args:
         filename (str): The path to the configuration file to load.
@@ -87,9 +139,16 @@ def load(
     """
     st = time.time()
     load_registries()
-    config = load_config(filename, base_key)
-    if update_dict:
-        _merge_config(config, update_dict)
+    # Source files may be modified and reloaded in long-lived processes.
+    forget_mtimes()
+    with profile("load", "load"):
+        config = load_cached_config(filename, base_key, update_dict)
+        if config is None:
+            files: list[list[Any]] = []
+            config = _load_config(filename, base_key, files)
+            if update_dict:
+                _merge_config(config, update_dict)
+            dump_cached_config(filename, base_key, update_dict, files, config)
     logger.success("Config loading cost {:.4f}s!", time.time() - st)
     if dump_path:
         config.dump(dump_path)
@@ -101,10 +160,47 @@ def load(
     return lazy_config
 
 
-def build_all(cfg: LazyConfig) -> tuple[ModuleWrapper, dict[str, Any]]:
+def load_plan(filename: str) -> LazyConfig:
+    """
+    Load a build plan saved by `LazyConfig.save_plan`, so that the config needs not to be
+    loaded and parsed again, e.g. in all ranks but rank 0 of distributed training.
+
+    Args:
+        filename (str): The path to the build plan.
+
+    Returns:
+        LazyConfig: A LazyConfig object which builds modules from the plan.
+    """
+    st = time.time()
+    load_registries()
+    lazy_config = LazyConfig.from_plan(BuildPlan.load(filename))
+    logger.success("Build plan loading cost {:.4f}s!", time.time() - st)
+    return lazy_config
+
+
+def build_all(cfg: LazyConfig, max_workers: int = 0) -> tuple[ModuleWrapper, dict[str, Any]]:
     """
     Build all modules from the given LazyConfig object.
 
+    Args:
+        cfg (LazyConfig): The LazyConfig object containing the configuration.
+        max_workers (int, optional): Build independent modules on a thread pool
+            if positive, see `LazyConfig.build_all`. Defaults to 0.
+
+    Returns:
+        tuple: A tuple containing a ModuleWrapper and a dictionary of additional data.
+    """
+    st = time.time()
+    modules = cfg.build_all(max_workers)
+    logger.success("Modules building costs {:.4f}s!", time.time() - st)
+    return modules
+
+
+async def abuild_all(cfg: LazyConfig) -> tuple[ModuleWrapper, dict[str, Any]]:
+    """
+    Build all modules from the given LazyConfig object on the running event loop,
+    see `LazyConfig.abuild_all`.
+
     Args:
         cfg (LazyConfig): The LazyConfig object containing the configuration.
 
@@ -112,6 +208,6 @@ def build_all(cfg: LazyConfig) -> tuple[ModuleWrapper, dict[str, Any]]:
         tuple: A tuple containing a ModuleWrapper and a dictionary of additional data.
     """
     st = time.time()
-    modules = cfg.build_all()
+    modules = await cfg.abuild_all()
     logger.success("Modules building costs {:.4f}s!", time.time() - st)
     return modules
@@ -1,38 +1,63 @@
 from __future__ import annotations
 
 import time
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from typing import Any
 
 from ..engine.hook import ConfigHookManager, Hook
-from ..engine.logging import logger
+from ..engine.logging import logger, trace
 from ..engine.registry import Registry
-from . import models
-from .models import ConfigHookNode, InterNode, ModuleWrapper
+from ._build_plan import BuildPlan
+from .models import BuildContext, ConfigHookNode, InterNode, ModuleWrapper
 from .parse import ConfigDict
 
 
+def _copy_dicts(value: Any) -> Any:
+    """
+    Copy dicts recursively and share everything else, e.g. lists and scalars.
+    Parsing only mutates dicts in place, lists are always replaced.
+    """
+    if not isinstance(value, dict):
+        return value
+    new = ConfigDict() if isinstance(value, ConfigDict) else {}
+    for k, v in value.items():
+        new[k] = _copy_dicts(v)
+    return new
+
+
 class LazyConfig:
     hook_key: str = "ExcoreHook"
     modules_dict: dict[str, ModuleWrapper]
     isolated_dict: dict[str, Any]
+    plan: BuildPlan | None = None
 
     def __init__(self, config: ConfigDict) -> None:
         self.modules_dict, self.isolated_dict = {}, {}
         self.target_modules = config.primary_fields
         config.registered_fields = list(Registry._registry_pool.keys())
         config.all_fields = set([*config.registered_fields, *config.primary_fields])
-        self._config = deepcopy(config)
-        self._original_config = deepcopy(config)
+        # `_original_config` is kept as a snapshot of the caller's config, both copies
+        # share its lists and scalars, since parsing only mutates dicts and targets are
+        # passed copies of lists, see `_copy_containers`.
+        self._original_config = self._copy_config(config)
+        self._config = self._copy_config(config)
         self.__is_parsed__ = False
 
+    @staticmethod
+    def _copy_config(config: ConfigDict) -> ConfigDict:
+        new = _copy_dicts(config)
+        new.registered_fields = list(config.registered_fields)
+        new.all_fields = set(config.all_fields)
+        return new
+
     def parse(self) -> None:
         st = time.time()
         self.build_config_hooks()
         self._config.parse()
         logger.success("Config parsing cost {:.4f}s!", time.time() - st)
         self.__is_parsed__ = True
-        logger.ex(str(self._config))
+        trace("config.parsed", config=self._config)
 
     @property
     def config(self) -> ConfigDict:
@@ -41,8 +66,10 @@ class LazyConfig:
     def update(self, cfg: LazyConfig) -> None:
         self._config.update(cfg._config)
 
-    def build_config_hooks(self) -> None:
-        hook_cfgs = self._config.pop(LazyConfig.hook_key, [])
+    def build_config_hooks(self, hook_cfgs: dict[str, Any] | None = None) -> None:
+        if hook_cfgs is None:
+            hook_cfgs = self._config.pop(LazyConfig.hook_key, {})
+        self._hook_cfgs = hook_cfgs
         hooks = []
         if hook_cfgs:
             _, base = Registry.find(list(hook_cfgs.keys())[0])
@@ -63,25 +90,105 @@ class LazyConfig:
             return self._config[__name]
         raise AttributeError(__name)
 
-    def build_all(self) -> tuple[ModuleWrapper, dict[str, Any]]:
+    def compile(self) -> BuildPlan:
+        """
+        Compile the parsed config into a `BuildPlan`. Modifications of the config made
+        after compiling, e.g. by `every_build` hooks, do not take effect in the plan, while
+        those made by `pre_build` hooks do, since `build_all` compiles after calling them.
+        """
+        if not self.__is_parsed__:
+            self.parse()
+        return BuildPlan.compile(self._config, self.target_modules, self._hook_cfgs)
+
+    def save_plan(self, file_path: str) -> None:
+        self.compile().save(file_path)
+
+    @classmethod
+    def from_plan(cls, plan: BuildPlan) -> LazyConfig:
+        """Create a `LazyConfig` which is built from `plan` instead of parsing a config."""
+        lazy_config = cls(ConfigDict())
+        lazy_config.plan = plan
+        lazy_config.target_modules = plan.target_modules
+        lazy_config.build_config_hooks(plan.hook_config)
+        lazy_config.__is_parsed__ = True
+        return lazy_config
+
+    def build_all(self, max_workers: int = 0) -> tuple[ModuleWrapper, dict[str, Any]]:
+        """
+        Build all primary fields.
+
+        Args:
+            max_workers (int, optional): If positive, the config is compiled into a
+                `BuildPlan` and independent nodes are built on a thread pool of
+                `max_workers` threads. Hooks are still called in the order of fields,
+                but nodes of a field may be built before its `every_build` hooks.
+                Defaults to 0, build nodes one by one.
+
+        Returns:
+            tuple: A ModuleWrapper of built fields and a dictionary of non-primary fields.
+        """
         if not self.__is_parsed__:
             self.parse()
         module_dict = ModuleWrapper()
         isolated_dict: dict[str, Any] = {}
+        self.hooks.call_hooks("pre_build", self, module_dict, isolated_dict)
+        # Compiled after `pre_build` hooks, which may modify the config.
+        plan = self.plan or (self.compile() if max_workers > 0 else None)
+        with ExitStack() as stack:
+            stack.enter_context(BuildContext())
+            pool = None
+            if max_workers > 0:
+                pool = stack.enter_context(ThreadPoolExecutor(max_workers, "excore_build"))
+            build_field = plan.executor(pool) if plan else None
+            for name in self.target_modules:
+                if name not in (plan.fields if plan else self._config):
+                    continue
+                self.hooks.call_hooks("every_build", self, module_dict, isolated_dict)
+                out = build_field(name) if build_field else self._config[name]()
+                if isinstance(out, list):
+                    out = ModuleWrapper(out)
+                module_dict[name] = out
+        if self.plan:
+            isolated_dict.update(self.plan.isolated)
+        for name in self._config.non_primary_keys():
+            isolated_dict[name] = self._config[name]
+        self.hooks.call_hooks("after_build", self, module_dict, isolated_dict)
+
+        return module_dict, isolated_dict
 
+    async def abuild_all(self) -> tuple[ModuleWrapper, dict[str, Any]]:
+        """
+        Build all primary fields on the running event loop. The config is compiled into
+        a `BuildPlan` and independent nodes are built concurrently: async targets are
+        awaited and others are called in threads. Hooks are called as `build_all`.
+
+        Returns:
+            tuple: A ModuleWrapper of built fields and a dictionary of non-primary fields.
+        """
+        if not self.__is_parsed__:
+            self.parse()
+        module_dict = ModuleWrapper()
+        isolated_dict: dict[str, Any] = {}
         self.hooks.call_hooks("pre_build", self, module_dict, isolated_dict)
-        for name in self.target_modules:
-            if name not in self._config:
-                continue
-            self.hooks.call_hooks("every_build", self, module_dict, isolated_dict)
-            out = self._config[name]()
-            if isinstance(out, list):
-                out = ModuleWrapper(out)
-            module_dict[name] = out
+        plan = self.plan or self.compile()
+        with BuildContext():
+            build_field = plan.async_executor()
+            try:
+                for name in self.target_modules:
+                    if name not in plan.fields:
+                        continue
+                    self.hooks.call_hooks("every_build", self, module_dict, isolated_dict)
+                    out = await build_field(name)
+                    if isinstance(out, list):
+                        out = ModuleWrapper(out)
+                    module_dict[name] = out
+            finally:
+                build_field.cancel()
+        if self.plan:
+            isolated_dict.update(self.plan.isolated)
         for name in self._config.non_primary_keys():
             isolated_dict[name] = self._config[name]
         self.hooks.call_hooks("after_build", self, module_dict, isolated_dict)
-        models.IS_PARSING = False
 
         return module_dict, isolated_dict
 
@@ -4,8 +4,9 @@ import importlib
 import inspect
 import re
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from inspect import Parameter, isclass, ismodule
+from inspect import ismodule
 from typing import TYPE_CHECKING, Type, Union, final, overload
 
 from .._constants import workspace
@@ -17,9 +18,11 @@ from .._exceptions import (
     StrToClassError,
 )
 from .._misc import CacheOut
-from ..engine.logging import logger
+from ..engine._signature import _inspect_params, get_indexed_signature, get_signature
+from ..engine.logging import logger, trace
 from ..engine.registry import Registry
 from .action import DictAction
+from .profiler import current_profiler
 
 if TYPE_CHECKING:
     from types import FunctionType, ModuleType
@@ -39,7 +42,7 @@ if TYPE_CHECKING:
     SpecialFlag = Literal["@", "!", "$", "&", ""]
 
 
-__all__ = ["silent"]
+__all__ = ["silent", "BuildContext"]
 
 REUSE_FLAG: Literal["@"] = "@"  # flag for shared module, which will be built once and cached out.
 INTER_FLAG: Literal["!"] = (
@@ -51,7 +54,6 @@ OTHER_FLAG: Literal[""] = ""  # default flag.
 
 FLAG_PATTERN = re.compile(r"^([@!$&])(.*)$")
 DO_NOT_CALL_KEY = "__no_call__"  # flag for no call, which will be skipped.
-IS_PARSING = True  # flag for parsing
 SPECIAL_FLAGS = [OTHER_FLAG, INTER_FLAG, REUSE_FLAG, CLASS_FLAG, REFER_FLAG]
 HOOK_FLAGS = ["@", "."]  # hook flags.
 
@@ -63,6 +65,49 @@ def silent() -> None:
     workspace.excore_log_build_message = False
 
 
+class BuildContext:
+    """State of parsing or building a config, which is visible to all nodes called within
+        `with BuildContext():`. It is stored in a `ContextVar` instead of a global flag,
+        so builds in different threads or tasks do not interfere with each other.
+
+    Attributes:
+        skip_no_call (bool): Whether nodes with `DO_NOT_CALL_KEY` return themselves
+            instead of being called. Defaults to True.
+    """
+
+    __slots__ = ("skip_no_call", "_token")
+
+    def __init__(self, skip_no_call: bool = True) -> None:
+        self.skip_no_call = skip_no_call
+
+    def __enter__(self) -> BuildContext:
+        self._token = _build_context.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _build_context.reset(self._token)
+
+    @staticmethod
+    def current() -> BuildContext | None:
+        """Returns the innermost active context, or None outside of parsing and building."""
+        return _build_context.get()
+
+
+_build_context: ContextVar[BuildContext | None] = ContextVar("build_context", default=None)
+
+
+def _copy_containers(value: Any) -> Any:
+    """
+    Copy plain lists and dicts recursively before passing them to targets, so that
+    targets mutating their arguments never change the config.
+    """
+    if type(value) is list:
+        return [_copy_containers(v) for v in value]
+    if type(value) is dict:
+        return {k: _copy_containers(v) for k, v in value.items()}
+    return value
+
+
 def _is_special(k: str) -> tuple[str, SpecialFlag]:
     """Determine if the given string begin with target special flag.
         `@` denotes reused module, which will only be built once and cached out.
@@ -80,9 +125,9 @@ def _is_special(k: str) -> tuple[str, SpecialFlag]:
     """
     match = FLAG_PATTERN.match(k)
     if match:
-        logger.ex(f"Find match `{match}`.")
+        trace("parse.special_flag", key=k, flag=match.group(1))
         return match.group(2), match.group(1)  # type: ignore
-    logger.ex("No Match.")
+    trace("parse.special_flag", key=k, flag="")
     return k, ""
 
 
@@ -116,6 +161,39 @@ def _str_to_target(module_name: str) -> ModuleType | NodeClassType | FunctionTyp
     return module
 
 
+class LazyTarget:
+    """A placeholder of a registered target which is only imported when it is actually used,
+        e.g. when the node is validated or instantiated.
+
+    Attributes:
+        path (str): The dotted path of the target, e.g. `package.module.ClassName`.
+        __name__ (str): The name of the target, the same as the imported one.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__name__ = path.rsplit(".", 1)[-1]
+
+    @property
+    def is_module(self) -> bool:
+        """Whether the target is a python module, see `_str_to_target`."""
+        return "." not in self.path
+
+    def resolve(self) -> ModuleType | NodeClassType | FunctionType:
+        """Imports and returns the target."""
+        trace("lazy_target.import", path=self.path)
+        return _str_to_target(self.path)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LazyTarget) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def __repr__(self) -> str:
+        return f"LazyTarget({self.path})"
+
+
 @dataclass
 class ModuleNode(dict):
     """A base class representing `LazyConfig` which is similar to `detectron2.config.lazy.LazyCall`.
@@ -123,7 +201,8 @@ class ModuleNode(dict):
         you want to call it.
 
     Attributes:
-        target (Any): The class or module associated with the node.
+        target (Any): The class or module associated with the node. Nodes created from
+            registered names hold a `LazyTarget` until they are validated or instantiated.
         _no_call (bool): Flag to indicate if the node should not be called
             when you actually call it. Usually used with function
             so in the config parsing phase the `target` will not be called.
@@ -186,6 +265,16 @@ class ModuleNode(dict):
         """
         return self.target.__name__
 
+    def _resolve_target(self) -> Any:
+        """Imports the target if it is still a `LazyTarget`.
+
+        Returns:
+            Any: The class, function or module associated with the node.
+        """
+        if isinstance(self.target, LazyTarget):
+            self.target = self.target.resolve()
+        return self.target
+
     def add(self, **params: NodeParams) -> Self:
         """Adds parameters to the node.
 
@@ -207,10 +296,11 @@ class ModuleNode(dict):
         Raises:
             ModuleBuildError: If instantiation fails.
         """
+        target = self._resolve_target()
         try:
-            if ismodule(self.target):
-                return self.target
-            module = self.target(**self)
+            if ismodule(target):
+                return target
+            module = target(**{k: _copy_containers(v) for k, v in self.items()})
         except Exception as exc:
             raise ModuleBuildError(
                 f"Instantiate Error with module {self.target} and arguments {self.items()}"
@@ -231,13 +321,18 @@ class ModuleNode(dict):
             NoCallSkipFlag | NodeInstance: The instantiated module or the node itself
                 if _no_call is True.
         """
-        print(IS_PARSING)
-        if IS_PARSING and self._no_call:
+        if self._no_call and (ctx := _build_context.get()) is not None and ctx.skip_no_call:
             return self
+        if (profiler := current_profiler()) is not None:
+            with profiler.span(self.name, type(self).__name__):
+                return self._build(**params)
+        return self._build(**params)
+
+    def _build(self, **params: NodeParams) -> NodeInstance:
+        """Updates parameters, validates and instantiates the node."""
         self._update_params(**params)
         self.validate()
-        module = self._instantiate()
-        return module
+        return self._instantiate()
 
     def __lshift__(self, params: NodeParams) -> Self:
         """Updates the node with new parameters.
@@ -321,8 +416,9 @@ class ModuleNode(dict):
 
         Note:
             The `str_target` must be registered in the registry. More details see `Registry`.
+            The target will not be imported until the node is validated or instantiated.
         """
-        node = cls(_str_to_target(str_target))
+        node = cls(LazyTarget(str_target))
         if params:
             node.update(params)
         if node.pop(DO_NOT_CALL_KEY, False):
@@ -384,11 +480,7 @@ class ModuleNode(dict):
         Returns:
             list[inspect.Parameter]: A list of inspect.Parameter objects.
         """
-        signature = inspect.signature(cls.__init__ if isclass(cls) else cls)
-        params = list(signature.parameters.values())
-        if isclass(cls):  # skip self
-            params = params[1:]
-        return params
+        return _inspect_params(cls)
 
     def validate(self) -> None:
         """Validate the parameters of the ModuleNode instance.
@@ -397,6 +489,9 @@ class ModuleNode(dict):
         If validation is globally disabled or the associated class is a module,
             the method returns immediately.
 
+        The required parameters are read from the signature index generated by
+            `excore auto-register`, see `excore.engine._signature`.
+
         If any required parameters are missing and manual setting is not allowed,
             a ModuleValidateError is raised.
 
@@ -406,26 +501,17 @@ class ModuleNode(dict):
         """
         if not workspace.excore_validate:
             return
-        if ismodule(self.target):
-            return
-
-        missing = []
-        defaults = []
-        params = ModuleNode._inspect_params(self.target)
-
-        for param in params:
-            if (
-                param.default == param.empty
-                and param.kind
-                not in [
-                    Parameter.VAR_POSITIONAL,
-                    Parameter.VAR_KEYWORD,
-                ]
-                and param.name not in self
-            ):
-                missing.append(param.name)
-            else:
-                defaults.append(param.name)
+        signature = None
+        if isinstance(self.target, LazyTarget):
+            if self.target.is_module:
+                return
+            signature = get_indexed_signature(self.target.path)
+        if signature is None:
+            if ismodule(self._resolve_target()):
+                return
+            signature = get_signature(self.target)
+
+        missing = [name for name in signature.required if name not in self]
 
         message = (
             f"Validating `{self.target.__name__}` , "
@@ -528,7 +614,6 @@ class ReusedNode(InterNode):
 
     priority: int = 3
 
-    @CacheOut()
     def __call__(self, **params: NodeParams) -> NodeInstance | NoCallSkipFlag:  # type: ignore
         """Calls the node to instantiate the module, with caching, see `CacheOut`.
 
@@ -539,6 +624,12 @@ class ReusedNode(InterNode):
             NodeInstance | NoCallSkipFlag: The instantiated module or the node itself
                 if _no_call is True.
         """
+        if hasattr(self, "cached_elem") and (profiler := current_profiler()) is not None:
+            profiler.hit(self.name, type(self).__name__)
+        return self._cached_call(**params)
+
+    @CacheOut()
+    def _cached_call(self, **params: NodeParams) -> NodeInstance | NoCallSkipFlag:
         return super().__call__(**params)
 
     @classmethod
@@ -575,7 +666,7 @@ class ClassNode(ModuleNode):
         Returns:
             NodeClassType | FunctionType | ModuleType: The class or function.
         """
-        return self.target
+        return self._resolve_target()
 
 
 class ConfigArgumentHook(ABC):
@@ -650,6 +741,9 @@ class ConfigArgumentHook(ABC):
             raise CoreConfigSupportError(
                 f"Call super().__init__(node) in class `{self.__class__.__name__}`"
             )
+        if (profiler := current_profiler()) is not None:
+            with profiler.span(self.name, type(self).__name__):
+                return self.hook(**kwargs) if self.enabled else self.node(**kwargs)
         if self.enabled:
             return self.hook(**kwargs)
         return self.node(**kwargs)
@@ -774,7 +868,7 @@ class VariableReference(ClassNode):
             CoreConfigParseError: If the reference cannot be found.
         """
         name = locals["name"]
-        logger.ex(f"Got `name` {name}.")
+        trace("parse.variable_reference", name=name)
         parsed_value = config._parse_env_var(name)
         if parsed_value != name:
             node = cls(parsed_value)
@@ -840,6 +934,9 @@ class ModuleWrapper(dict):
     def __getattr__(self, __name: str) -> Any:
         if __name in self.keys():
             return self[__name]
+        if __name.startswith("__"):
+            # Looked up by `pickle` and `copy`.
+            raise AttributeError(__name)
         raise KeyError(f"Invalid key `{__name}`, must be one of `{list(self.keys())}`")
 
     def __call__(self):
@@ -7,11 +7,12 @@ from typing import TYPE_CHECKING
 from .._exceptions import CoreConfigParseError, EnvVarParseError
 from .._misc import _create_table
 from ..engine import Registry, logger
-from . import models
+from ..engine.logging import trace
 from .models import (
     HOOK_FLAGS,
     OTHER_FLAG,
     REFER_FLAG,
+    BuildContext,
     ConfigHookNode,
     ModuleNode,
     ModuleWrapper,
@@ -20,9 +21,11 @@ from .models import (
     _dispatch_module_node,
     _is_special,
 )
+from .profiler import profile
 
 if TYPE_CHECKING:
     from collections.abc import Generator, Sequence
+    from typing import Any
 
     from typing_extensions import Self
 
@@ -66,6 +69,8 @@ class ConfigDict(dict):
         scratchpads_fields: A set containing scratchpad field names.
         current_field: The current field being processed (can be None).
         reused_caches: A dictionary for caching reused nodes.
+        module_index: A dictionary mapping module names to `(field, key)` of nodes
+            in `all_fields`, see `_contain_module`.
     """
 
     primary_fields: list
@@ -75,6 +80,7 @@ class ConfigDict(dict):
     scratchpads_fields: set[str] = set()
     current_field: str | None = None
     reused_caches: dict[str, ReusedNode]
+    module_index: dict[str, dict[tuple[str, str], None]] | None = None
 
     def __new__(cls) -> Self:
         if not hasattr(cls, "primary_fields"):
@@ -158,12 +164,17 @@ class ConfigDict(dict):
         NOTE: use `export EXCORE_DEBUG=1` to enable excore debug to
             get more information when parsing.
         """
-        models.IS_PARSING = True
-        self._parse_primary_modules()
-        self._parse_isolated_obj()
-        self._parse_inter_modules()
-        self._wrap()
-        self._clean()
+        with BuildContext():
+            for phase in (
+                self._parse_primary_modules,
+                self._parse_isolated_obj,
+                self._build_module_index,
+                self._parse_inter_modules,
+                self._wrap,
+                self._clean,
+            ):
+                with profile(f"ConfigDict.{phase.__name__}", "parse"):
+                    phase()
 
     def _wrap(self) -> None:
         for name in self.primary_keys():
@@ -186,12 +197,12 @@ class ConfigDict(dict):
                 yield k
 
     def _parse_primary_modules(self) -> None:
-        logger.ex("Parse primary modules.")
+        trace("parse.primary_modules")
         for name in self.primary_keys():
-            logger.ex(f"\tParse primary field {name}.")
+            trace("parse.primary_field", field=name)
             if name in self.registered_fields:
                 base = name
-                logger.ex(f"\t\tFind field registered. Base field is `{base}`.")
+                trace("parse.primary_field.registered", base=base)
             else:
                 reg = Registry.get_registry(self.primary_to_registry.get(name, ""))
                 if reg is None:
@@ -200,10 +211,10 @@ class ConfigDict(dict):
                     if n not in reg:
                         raise CoreConfigParseError(f"Unregistered module `{n}`.")
                 base = reg.name
-                logger.ex(f"\t\tSearch from Registry. Base field is {base}.")
+                trace("parse.primary_field.registry", base=base)
 
             self[name] = _dict2node(OTHER_FLAG, base, self.pop(name))
-            logger.ex(f"\tSet ModuleNode to self[{name}].")
+            trace("parse.primary_field.set", field=name)
 
     def _parse_isolated_registered_module(self, name: str) -> None:
         v = _dict2node(OTHER_FLAG, name, self.pop(name))
@@ -214,30 +225,30 @@ class ConfigDict(dict):
         self[name] = v
 
     def _parse_implicit_module(self, name: str, module_type: NodeType) -> ModuleNode:
-        logger.ex("\t\t\tImplicit module.")
+        trace("parse.implicit_module", name=name)
         _, base = Registry.find(name)
         if not base:
             raise CoreConfigParseError(f"Unregistered module `{name}`")
-        logger.ex(f"\t\t\tFind base `{base}` with implicit module `{name}`.")
+        trace("parse.implicit_module.found", name=name, base=base)
         node = module_type.from_base_name(base, name)
         if module_type is not ConfigHookNode:
             node.validate()
         if issubclass(module_type, ReusedNode):
-            logger.ex("\t\t\tTarget type is `ReusedNode` or subclass of it, set node to top level.")
+            trace("parse.implicit_module.set_back", name=name)
             self[name] = node
         return node
 
     def _parse_isolated_module(self, name: str) -> bool:
-        logger.ex(f"\t\tNot a registered field. Parse as isolated module `{name}`.")
+        trace("parse.isolated_module", name=name)
         _, base = Registry.find(name)
         if base:
-            logger.ex("\t\tFind registered. Convert to `ModuleNode`.")
+            trace("parse.isolated_module.registered", name=name, base=base)
             self[name] = ModuleNode.from_base_name(base, name) << self[name]
             return True
         return False
 
     def _parse_scratchpads(self, name: str) -> None:
-        logger.ex(f"\t\tNot a registered node. Regrad as scratchpads `{name}`.")
+        trace("parse.scratchpads", name=name)
         has_module = False
         modules = self[name]
         for k, v in list(modules.items()):
@@ -246,44 +257,55 @@ class ConfigDict(dict):
             _, base = Registry.find(k)
             if base:
                 has_module = True
-                logger.ex("\t\t\tFind item registered. Convert to `ModuleNode`.")
+                trace("parse.scratchpads.item", name=k, base=base)
                 modules[k] = ModuleNode.from_base_name(base, k) << v
         if has_module:
-            logger.ex(f"\t\tAdd `{name}` to scratchpads_fields.")
+            trace("parse.scratchpads.add", name=name)
             self.scratchpads_fields.add(name)
             self.all_fields.add(name)
 
     def _parse_isolated_obj(self) -> None:
-        logger.ex("Parse isolated objects.")
+        trace("parse.isolated_objects")
         for name in self.non_primary_keys():
-            logger.ex(f"\tParse module {name}.")
+            trace("parse.isolated_object", name=name)
             modules = self[name]
             if isinstance(modules, dict):
                 if name in self.registered_fields:
-                    logger.ex("\t\tFind module registered.")
+                    trace("parse.isolated_object.registered", name=name)
                     self._parse_isolated_registered_module(name)
                 elif not self._parse_isolated_module(name):
                     self._parse_scratchpads(name)
 
+    def _build_module_index(self) -> None:
+        self.module_index = {}
+        for field in self.all_fields:
+            if field in self and isinstance(self[field], dict):
+                for key, node in self[field].items():
+                    self._index_module(field, key, node)
+
+    def _index_module(self, field: str, key: str, node: Any) -> None:
+        if self.module_index is not None and hasattr(node, "name"):
+            self.module_index.setdefault(node.name, {})[field, key] = None
+
     def _contain_module(self, name: str) -> bool:
-        is_contain = False
-        for k in self.all_fields:
-            if k not in self:
+        if self.module_index is None:
+            self._build_module_index()
+        found = None
+        for field, key in self.module_index.get(name, ()):  # type: ignore
+            # Fields may be popped after indexing, e.g. by `FinegrainedConfig`.
+            if field not in self or getattr(self[field].get(key), "name", None) != name:
                 continue
-            for node in self[k].values():
-                if not hasattr(node, "name"):
-                    continue
-                if node.name == name:
-                    if not is_contain:
-                        is_contain = True
-                    else:
-                        raise CoreConfigParseError(
-                            f"Parameter `{name}` conflicts with "
-                            f"field `{self.current_field}` and `{k}`, "
-                            f"considering using format `$field::module_name` to get module."
-                        )
-                    self.current_field = k
-        return is_contain
+            if found is not None:
+                raise CoreConfigParseError(
+                    f"Parameter `{name}` conflicts with "
+                    f"field `{found}` and `{field}`, "
+                    f"considering using format `$field::module_name` to get module."
+                )
+            found = field
+        if found is None:
+            return False
+        self.current_field = found
+        return True
 
     def _parse_env_var(self, value: str) -> str:
         env_names = re.findall(r"\$\{([^}]+)\}", value)
@@ -340,7 +362,7 @@ class ConfigDict(dict):
         node_params: NodeParams | None = None,
     ) -> tuple[ModuleNode, NodeType]:
         ori_type: NodeType = source[name].__class__
-        logger.ex(f"\t\t\tOriginal_type is `{ori_type}`, target_type is `{target_type}`.")
+        trace("parse.convert_node", name=name, ori_type=ori_type, target_type=target_type)
         node: ModuleNode = source[name]
         if node_params:
             node.add(**node_params)
@@ -348,8 +370,10 @@ class ConfigDict(dict):
             node = target_type.from_node(source[name])
             self._parse_module(node)
             if target_type.priority > ori_type.priority:
-                logger.ex("\t\t\tSet Back.")
+                trace("parse.convert_node.set_back", name=name)
                 source[name] = node
+                if source is not self:
+                    self._index_module(self.current_field, name, node)  # type: ignore
         return node, ori_type
 
     def _get_node_from_name_and_field(
@@ -362,16 +386,14 @@ class ConfigDict(dict):
         ori_type = None
         cache_field = self.current_field
         if (node := target_type.__excore_parse__(self, **locals())) is not None:
-            logger.ex(f"\t\t\t `__excore_parse__` from `{target_type}`, got node {node}.")
+            trace("parse.excore_parse", target_type=target_type, node=node)
             return node, None
         if not field and name in self:
-            logger.ex("\t\t\tFind module in top level.")
+            trace("parse.find_module.top_level", name=name)
             node, ori_type = self._convert_node(name, self, target_type, node_params)
         elif field or self._contain_module(name):
             self.current_field = field or self.current_field
-            logger.ex(
-                f"\t\t\tFind module in second level, current_field is `{self.current_field}`."
-            )
+            trace("parse.find_module.field", name=name, field=self.current_field)
             node, ori_type = self._convert_node(
                 name, self[self.current_field], target_type, node_params
             )
@@ -407,22 +429,22 @@ class ConfigDict(dict):
     def _parse_params(
         self, ori_name: str, module_type: SpecialFlag
     ) -> ConfigNode | list[ConfigNode]:
-        logger.ex(f"\t\tParse with `{ori_name}` and `{module_type}`.")
+        trace("parse.params", name=ori_name, module_type=module_type)
         target_type = _dispatch_module_node[module_type]
         name, hooks = _parse_param_name(ori_name)
         names, field = self._get_name_and_field(name, ori_name)
-        logger.ex(f"\t\tGet name:{names}, field:{field}, hooks:{hooks}.")
+        trace("parse.params.resolved", names=names, field=field, hooks=hooks)
         if isinstance(names, list):
-            logger.ex(f"\t\tDetect output type list {ori_name}.")
+            trace("parse.params.list", name=ori_name)
             return [self._parse_single_param(n, ori_name, field, target_type, hooks) for n in names]
         return self._parse_single_param(names, ori_name, field, target_type, hooks)
 
     def _parse_module(self, node: ModuleNode) -> None:
-        logger.ex(f"\t\tParse ModuleNode `{node}`.")
+        trace("parse.module", node=node)
         for param_name in list(node.keys()):
             true_name, module_type = _is_special(param_name)
             if not module_type:
-                logger.ex(f"\t\tSkip parameter `{param_name}`.")
+                trace("parse.module.skip", param=param_name)
                 continue
             value = node.pop(param_name)
             if (
@@ -433,14 +455,14 @@ class ConfigDict(dict):
                 raise CoreConfigParseError(f"Cannot find `{value[1:]}` with `&`.")
             is_dict = False
             if isinstance(value, list):
-                logger.ex(f"\t\t{param_name}: List parameter {value}.")
+                trace("parse.module.param", param=param_name, kind="list", value=value)
                 value = [self._parse_params(v, module_type) for v in value]
                 value = _flatten_list(value)
             elif isinstance(value, str):
-                logger.ex(f"\t\t{param_name}: Single parameter {value}.")
+                trace("parse.module.param", param=param_name, kind="single", value=value)
                 value = self._parse_params(value, module_type)
             elif isinstance(value, dict):
-                logger.ex(f"\t\t{param_name}: Dict parameter {value}.")
+                trace("parse.module.param", param=param_name, kind="dict", value=value)
                 value = {k: self._parse_params(v, module_type) for k, v in value.items()}
                 is_dict = True
             else:
@@ -448,16 +470,16 @@ class ConfigDict(dict):
             node[true_name] = ModuleWrapper(value, is_dict)
 
     def _parse_inter_modules(self) -> None:
-        logger.ex("Parse inter modules.")
+        trace("parse.inter_modules")
         for name in list(self.keys()):
-            logger.ex(f"\tParse inter module `{name}`")
+            trace("parse.inter_module", name=name)
             module = self[name]
             if (
                 name in self.primary_fields
                 or name in self.scratchpads_fields
                 and isinstance(module, ModuleNode)
             ):
-                logger.ex(f"\tParse Dict {name}")
+                trace("parse.inter_module.field", name=name)
                 for m in module.values():
                     self._parse_module(m)
             elif isinstance(module, ModuleNode):
@@ -490,6 +512,6 @@ def set_primary_fields(cfg) -> None:
     primary_fields = cfg.primary_fields
     primary_to_registry = cfg.primary_to_registry
     if hasattr(ConfigDict, "primary_fields"):
-        logger.ex("`primary_fields` will be reset to {}", primary_fields)
+        trace("parse.primary_fields.reset", fields=primary_fields)
     if primary_fields:
         ConfigDict.set_primary_fields(primary_fields, primary_to_registry)
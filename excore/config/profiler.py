@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from .._misc import _create_table
+
+if TYPE_CHECKING:
+    from typing import Any, ContextManager, Iterator
+
+__all__ = ["BuildProfiler", "current_profiler", "profile"]
+
+
+class _Frame:
+    __slots__ = ("children", "mem_start", "peak")
+
+    def __init__(self, mem_start: int) -> None:
+        self.children = 0
+        self.mem_start = mem_start
+        self.peak = mem_start
+
+
+class BuildProfiler:
+    """An opt-in profiler of config parsing and building. Within `with BuildProfiler():`,
+        it records every call of `ModuleNode`, `InterNode`, `ReusedNode` and
+        `ConfigArgumentHook`, steps of `BuildPlan` and phases of `ConfigDict.parse`,
+        including those in threads started by `build_all(max_workers=N)`.
+
+    For each call, `wall` is the time of the whole call including building its parameters,
+        `self` excludes the time of nested profiled calls in the same thread and `peak` is
+        the peak of memory traced by `tracemalloc` above the start of the call. The peak is
+        only accurate for python 3.9+, which supports `tracemalloc.reset_peak`.
+
+    Args:
+        trace_memory (bool, optional): Whether to trace memory with `tracemalloc`, which
+            slows down the build a lot. Defaults to True.
+
+    Examples:
+        with BuildProfiler() as profiler:
+            cfg = config.load("config.toml")
+            modules, info = config.build_all(cfg)
+        print(profiler.table())
+        profiler.export_chrome_trace("build_trace.json")
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        # name, category, start, wall, self time in ns, peak in bytes, thread id
+        self.events: list[tuple[str, str, int, int, int, int, int]] = []
+        # name, category, time in ns, thread id
+        self.hits: list[tuple[str, str, int, int]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._stop_tracemalloc = False
+
+    def __enter__(self) -> BuildProfiler:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._stop_tracemalloc = True
+        self._token = _profiler.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _profiler.reset(self._token)
+        if self._stop_tracemalloc:
+            tracemalloc.stop()
+            self._stop_tracemalloc = False
+
+    def _stack(self) -> list[_Frame]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _memory(self) -> tuple[int, int]:
+        if self.trace_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()
+        return 0, 0
+
+    @contextmanager
+    def span(self, name: str, category: str) -> Iterator[None]:
+        """Profile the code within the context as a call of `name`."""
+        stack = self._stack()
+        current, peak = self._memory()
+        if stack:
+            stack[-1].peak = max(stack[-1].peak, peak)
+        if hasattr(tracemalloc, "reset_peak") and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        frame = _Frame(current)
+        stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - start
+            stack.pop()
+            frame.peak = max(frame.peak, self._memory()[1])
+            if stack:
+                stack[-1].children += wall
+                stack[-1].peak = max(stack[-1].peak, frame.peak)
+            self.record(
+                name, category, start, wall, wall - frame.children, frame.peak - frame.mem_start
+            )
+
+    def record(
+        self,
+        name: str,
+        category: str,
+        start: int,
+        wall: int,
+        self_time: int | None = None,
+        peak: int = 0,
+    ) -> None:
+        """Record a call measured by `time.perf_counter_ns`, e.g. a step of async builds."""
+        self_time = wall if self_time is None else self_time
+        event = (name, category, start, wall, self_time, peak, threading.get_ident())
+        with self._lock:
+            self.events.append(event)
+
+    def hit(self, name: str, category: str) -> None:
+        """Record a cache hit of a reused node."""
+        with self._lock:
+            self.hits.append((name, category, time.perf_counter_ns(), threading.get_ident()))
+
+    def summary(self) -> list[tuple[str, str, int, float, float, float, int]]:
+        """
+        Returns `(category, name, calls, wall(ms), self(ms), peak(MiB), cache hits)` of each
+        profiled name, sorted by self time in descending order.
+        """
+        stats: dict[tuple[str, str], list] = defaultdict(lambda: [0, 0, 0, 0, 0])
+        for name, category, _, wall, self_time, peak, _ in self.events:
+            stat = stats[category, name]
+            stat[0] += 1
+            stat[1] += wall
+            stat[2] += self_time
+            stat[3] = max(stat[3], peak)
+        for name, category, _, _ in self.hits:
+            stats[category, name][4] += 1
+        rows = [
+            (category, name, calls, wall / 1e6, self_time / 1e6, peak / 2**20, hits)
+            for (category, name), (calls, wall, self_time, peak, hits) in stats.items()
+        ]
+        return sorted(rows, key=lambda row: row[4], reverse=True)
+
+    def table(self, limit: int | None = None) -> str:
+        """Format `summary` as a table, only the first `limit` rows are kept if given."""
+        rows = [
+            (category, name, calls, f"{wall:.3f}", f"{self_time:.3f}", f"{peak:.3f}", hits)
+            for category, name, calls, wall, self_time, peak, hits in self.summary()[:limit]
+        ]
+        return _create_table(
+            ["category", "name", "calls", "wall(ms)", "self(ms)", "peak(MiB)", "cache hits"],
+            rows,
+        )
+
+    def export_chrome_trace(self, file_path: str) -> None:
+        """
+        Export calls as complete events and cache hits as instant events in the Chrome
+        trace format, which can be opened by `chrome://tracing` or Perfetto.
+        """
+        pid = os.getpid()
+        events: list[dict[str, Any]] = []
+        for name, category, start, wall, self_time, peak, tid in self.events:
+            events.append(
+                dict(
+                    name=name,
+                    cat=category,
+                    ph="X",
+                    ts=(start - self._origin) / 1e3,
+                    dur=wall / 1e3,
+                    pid=pid,
+                    tid=tid,
+                    args=dict(self_ms=self_time / 1e6, peak_bytes=peak),
+                )
+            )
+        for name, category, ts, tid in self.hits:
+            events.append(
+                dict(
+                    name=f"{name} (cache hit)",
+                    cat=category,
+                    ph="i",
+                    s="t",
+                    ts=(ts - self._origin) / 1e3,
+                    pid=pid,
+                    tid=tid,
+                )
+            )
+        with open(file_path, "w", encoding="UTF-8") as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit="ms"), f)
+
+    def __str__(self) -> str:
+        return self.table()
+
+
+_profiler: ContextVar[BuildProfiler | None] = ContextVar("build_profiler", default=None)
+
+
+def current_profiler() -> BuildProfiler | None:
+    """Returns the active `BuildProfiler`, or None if profiling is disabled."""
+    return _profiler.get()
+
+
+def profile(name: str, category: str) -> ContextManager[None]:
+    """Profile the code within the context if a `BuildProfiler` is active."""
+    profiler = _profiler.get()
+    return nullcontext() if profiler is None else profiler.span(name, category)
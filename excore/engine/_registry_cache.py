@@ -0,0 +1,269 @@
+"""
+On-disk format of the registry cache.
+
+The cache is a single little-endian binary file which can be memory-mapped and read
+without deserializing all registries at once::
+
+    header           magic, version, total size, sha256 of the body, section offsets
+    directory        per registry: name, registry class, extra_field, entry table offset
+    entry tables     per registry: (name, target, extra_info) string ids of each entry
+    name table       (name, registry index) pairs sorted by name, for lookups by name
+    string table     string offsets followed by a utf-8 blob
+
+All strings are stored once in the string table and referred by their ids, `extra_field`
+and `extra_info` are stored as JSON strings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from .registry import Registry
+
+__all__ = ["RegistryCacheReader", "RegistryCacheError", "dump_registry_cache"]
+
+MAGIC = b"EXRC"
+VERSION = 1
+NONE_ID = 0xFFFFFFFF
+
+# magic, version, reserved, total size, digest, n_registries, n_strings, n_names,
+# directory offset, name table offset, string table offset
+_HEADER = struct.Struct("<4sHHQ32sIIIIII")
+_DIRECTORY_ITEM = struct.Struct("<IIIII")  # name, class, extra_field, entries offset, n_entries
+_ENTRY = struct.Struct("<III")  # name, target, extra_info
+_NAME_ITEM = struct.Struct("<II")  # name, registry index
+_U32 = struct.Struct("<I")
+
+_DEFAULT_REGISTRY_CLASS = "excore.engine.registry:Registry"
+
+
+class RegistryCacheError(Exception):
+    """The registry cache file is missing, broken or written by another version."""
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def add(self, s: str | None) -> int:
+        if s is None:
+            return NONE_ID
+        if s not in self.ids:
+            self.ids[s] = len(self.strings)
+            self.strings.append(s)
+        return self.ids[s]
+
+    def pack(self) -> bytes:
+        blobs = [s.encode("UTF-8") for s in self.strings]
+        offsets = [0]
+        for b in blobs:
+            offsets.append(offsets[-1] + len(b))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(blobs)
+
+
+def _registry_class_path(reg: Registry) -> str | None:
+    path = f"{reg.__class__.__module__}:{reg.__class__.__qualname__}"
+    return None if path == _DEFAULT_REGISTRY_CLASS else path
+
+
+def dump_registry_cache(file_path: str, registries: dict[str, Registry]) -> None:
+    """
+    Write registries to `file_path` in the registry cache format. The file is written to
+    a temporary file first and then atomically renamed, so readers never see a partial file.
+    """
+    table = _StringTable()
+    directory = []
+    entries = []
+    names = []
+    for reg_idx, (reg_name, reg) in enumerate(registries.items()):
+        extra_field = getattr(reg, "extra_field", None)
+        directory.append(
+            [
+                table.add(reg_name),
+                table.add(_registry_class_path(reg)),
+                table.add(None if extra_field is None else json.dumps(list(extra_field))),
+                len(entries),
+                len(reg),
+            ]
+        )
+        for name, target in reg.items():
+            info = reg.extra_info.get(name)
+            try:
+                info = None if info is None else json.dumps(info)
+            except TypeError as e:
+                raise TypeError(f"Extra info of `{reg_name}.{name}` is not serializable.") from e
+            entries.append((table.add(name), table.add(target), table.add(info)))
+            names.append((name, reg_idx))
+
+    names.sort()
+    directory_offset = _HEADER.size
+    entries_offset = directory_offset + _DIRECTORY_ITEM.size * len(directory)
+    name_table_offset = entries_offset + _ENTRY.size * len(entries)
+    string_table_offset = name_table_offset + _NAME_ITEM.size * len(names)
+    body = b"".join(
+        [
+            b"".join(
+                _DIRECTORY_ITEM.pack(n, c, e, entries_offset + _ENTRY.size * off, cnt)
+                for n, c, e, off, cnt in directory
+            ),
+            b"".join(_ENTRY.pack(*e) for e in entries),
+            b"".join(_NAME_ITEM.pack(table.ids[n], idx) for n, idx in names),
+            table.pack(),
+        ]
+    )
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        _HEADER.size + len(body),
+        hashlib.sha256(body).digest(),
+        len(directory),
+        len(table.strings),
+        len(names),
+        directory_offset,
+        name_table_offset,
+        string_table_offset,
+    )
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, file_path)
+
+
+class RegistryCacheReader:
+    """
+    Memory-mapped reader of the registry cache. Opening a cache only reads its header and
+    directory; entries of a registry are decoded when `read_registry` is called.
+
+    Args:
+        file_path (str): Path of the registry cache file.
+        verify (bool): Whether to check the body against the digest in the header, which
+            reads the whole file. Defaults to False.
+
+    Raises:
+        RegistryCacheError: If the file is not a registry cache of the current version,
+            or its body does not match the digest in the header when `verify` is True.
+    """
+
+    def __init__(self, file_path: str, verify: bool = False) -> None:
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            try:
+                self._buf: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                self._buf = f.read()
+        if len(self._buf) < _HEADER.size:
+            raise RegistryCacheError(f"`{file_path}` is not a registry cache.")
+        (
+            magic,
+            version,
+            _,
+            total_size,
+            self.digest,
+            self.n_registries,
+            self._n_strings,
+            self._n_names,
+            self._directory_offset,
+            self._name_table_offset,
+            self._string_table_offset,
+        ) = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise RegistryCacheError(f"`{file_path}` is not a registry cache.")
+        if version != VERSION:
+            raise RegistryCacheError(
+                f"Registry cache version mismatch, expected {VERSION} but got {version}."
+            )
+        if total_size != len(self._buf):
+            raise RegistryCacheError(f"Registry cache `{file_path}` is truncated.")
+        if verify:
+            with memoryview(self._buf) as view, view[_HEADER.size :] as body:
+                if hashlib.sha256(body).digest() != self.digest:
+                    raise RegistryCacheError(f"Registry cache `{file_path}` is corrupted.")
+        self._blob_offset = self._string_table_offset + _U32.size * (self._n_strings + 1)
+        self._strings: dict[int, str] = {}
+        self.registry_names = [
+            self._string(self._directory_item(i)[0]) for i in range(self.n_registries)
+        ]
+
+    def _string(self, sid: int) -> Any:
+        if sid == NONE_ID:
+            return None
+        if sid not in self._strings:
+            start, end = struct.unpack_from("<II", self._buf, self._string_table_offset + 4 * sid)
+            raw = self._buf[self._blob_offset + start : self._blob_offset + end]
+            self._strings[sid] = bytes(raw).decode("UTF-8")
+        return self._strings[sid]
+
+    def _directory_item(self, idx: int) -> tuple[int, int, int, int, int]:
+        return _DIRECTORY_ITEM.unpack_from(
+            self._buf, self._directory_offset + _DIRECTORY_ITEM.size * idx
+        )
+
+    def read_registry(
+        self, idx: int
+    ) -> tuple[str, str | None, list[str] | None, list[tuple[str, str, Any]]]:
+        """
+        Decode the registry at `idx`.
+
+        Returns:
+            tuple: The name, the `module:qualname` of its class (`None` for `Registry`),
+                the `extra_field` and a list of `(name, target, extra_info)` of the registry.
+        """
+        name_sid, cls_sid, field_sid, offset, n_entries = self._directory_item(idx)
+        extra_field = self._string(field_sid)
+        entries = []
+        for i in range(n_entries):
+            n, t, info = _ENTRY.unpack_from(self._buf, offset + _ENTRY.size * i)
+            info = self._string(info)
+            entries.append(
+                (self._string(n), self._string(t), None if info is None else json.loads(info))
+            )
+        return (
+            self._string(name_sid),
+            self._string(cls_sid),
+            None if extra_field is None else json.loads(extra_field),
+            entries,
+        )
+
+    def _name_item(self, pos: int) -> tuple[str, int]:
+        sid, reg_idx = _NAME_ITEM.unpack_from(
+            self._buf, self._name_table_offset + _NAME_ITEM.size * pos
+        )
+        return self._string(sid), reg_idx
+
+    def names(self) -> Iterator[str]:
+        """
+        Iterate over all registered names in sorted order, a name appears once for each
+        registry which contains it.
+        """
+        for pos in range(self._n_names):
+            yield self._name_item(pos)[0]
+
+    def find(self, name: str) -> list[int]:
+        """
+        Returns the indices of registries which contain `name`, by binary searching the
+        sorted name table.
+        """
+        lo, hi = 0, self._n_names
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name_item(mid)[0] < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        indices = []
+        while lo < self._n_names:
+            item_name, reg_idx = self._name_item(lo)
+            if item_name != name:
+                break
+            indices.append(reg_idx)
+            lo += 1
+        return indices
@@ -0,0 +1,329 @@
+"""
+Precomputed signature index of registered targets.
+
+`excore auto-register` inspects every registered class and function once and dumps
+their parameters into `workspace.signature_index_file`. Config parsing reads the index
+instead of importing and inspecting targets again, and only falls back to live
+inspection when one of the source files of a target has been modified since.
+
+Signatures of live targets are memoized weakly by the targets, so that validating nodes
+built many times does not inspect their targets again. The memo is invalidated when a
+target is registered again, see `forget_signature`.
+"""
+
+from __future__ import annotations
+
+import inspect
+import json
+import os
+import os.path as osp
+import weakref
+from contextlib import suppress
+from inspect import Parameter, isclass, ismodule
+from typing import Any, Callable, Iterable, NamedTuple
+
+from filelock import FileLock
+
+from .._constants import workspace
+from .._exceptions import StrToClassError
+from .logging import logger
+
+__all__ = [
+    "ParamInfo",
+    "SignatureInfo",
+    "get_signature",
+    "forget_signature",
+    "get_indexed_signature",
+    "lookup",
+    "build_signature_entries",
+    "dump_signature_index",
+]
+
+_INDEX_VERSION = 1
+_VAR_KINDS = (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)
+_JSON_SCALARS = (bool, int, float, str, type(None))
+
+_index: dict[str, dict[str, Any]] | None = None
+_file_mtimes: dict[str, int | None] = {}
+# Keyed weakly by callables and targets respectively, entries go along with them.
+_signatures: weakref.WeakKeyDictionary[Any, inspect.Signature] = weakref.WeakKeyDictionary()
+_infos: weakref.WeakKeyDictionary[Any, SignatureInfo] = weakref.WeakKeyDictionary()
+
+
+class ParamInfo(NamedTuple):
+    """
+    Parameter information of a registered target.
+
+    Attributes:
+        name (str): The name of the parameter.
+        kind (int): The value of `inspect.Parameter.kind`.
+        has_default (bool): Whether the parameter has a default value.
+        default (Any): The default value, only kept when it is a JSON scalar.
+    """
+
+    name: str
+    kind: int
+    has_default: bool
+    default: Any = None
+
+
+class SignatureInfo(NamedTuple):
+    """
+    Signature information of a registered target, `self` of classes is excluded.
+
+    Attributes:
+        params (tuple[ParamInfo, ...]): All parameters in definition order.
+        required (tuple[str, ...]): Names of parameters which have no default value
+            and are neither `*args` nor `**kwargs`.
+    """
+
+    params: tuple[ParamInfo, ...]
+    required: tuple[str, ...]
+
+    @property
+    def names(self) -> list[str]:
+        return [p.name for p in self.params]
+
+
+def _target_path(target: Any) -> str | None:
+    if ismodule(target):
+        return target.__name__
+    module = getattr(target, "__module__", None)
+    qualname = getattr(target, "__qualname__", None)
+    if module is None or qualname is None:
+        return None
+    return f"{module}.{qualname}"
+
+
+def _memoize(memo: weakref.WeakKeyDictionary, key: Any, compute: Callable[[Any], Any]) -> Any:
+    try:
+        return memo[key]
+    except KeyError:
+        pass
+    except TypeError:  # Neither hashable nor weakly referable, e.g. some builtins.
+        return compute(key)
+    value = memo[key] = compute(key)
+    return value
+
+
+def _inspect_signature(func: Callable[..., Any]) -> inspect.Signature:
+    """`inspect.signature` memoized weakly by `func`."""
+    return _memoize(_signatures, func, inspect.signature)
+
+
+def _inspect_params(target: Any) -> list[Parameter]:
+    signature = _inspect_signature(target.__init__ if isclass(target) else target)
+    params = list(signature.parameters.values())
+    if isclass(target):  # skip self
+        params = params[1:]
+    return params
+
+
+def _to_signature_info(params: list[Parameter]) -> SignatureInfo:
+    infos = []
+    required = []
+    for p in params:
+        has_default = p.default is not p.empty
+        default = p.default if has_default and isinstance(p.default, _JSON_SCALARS) else None
+        infos.append(ParamInfo(p.name, int(p.kind), has_default, default))
+        if not has_default and p.kind not in _VAR_KINDS:
+            required.append(p.name)
+    return SignatureInfo(tuple(infos), tuple(required))
+
+
+def _source_files(target: Any) -> list[str]:
+    candidates = [target]
+    if isclass(target):
+        candidates.append(target.__init__)
+    files = []
+    for c in candidates:
+        try:
+            file = inspect.getfile(c)
+        except TypeError:
+            continue
+        if osp.isfile(file) and file not in files:
+            files.append(file)
+    return files
+
+
+def _get_mtime(file: str) -> int | None:
+    if file not in _file_mtimes:
+        try:
+            _file_mtimes[file] = os.stat(file).st_mtime_ns
+        except OSError:
+            _file_mtimes[file] = None
+    return _file_mtimes[file]
+
+
+def _load_index() -> dict[str, dict[str, Any]]:
+    global _index
+    if _index is not None:
+        return _index
+    _index = {}
+    file_path = workspace.signature_index_file
+    if not file_path or not osp.exists(file_path):
+        return _index
+    try:
+        with open(file_path, encoding="UTF-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        logger.warning(f"Fail to read signature index {file_path}, ignore it.")
+        return _index
+    if data.get("version") != _INDEX_VERSION:
+        logger.ex("Signature index is outdated, ignore it.")
+        return _index
+    _index = data["targets"]
+    return _index
+
+
+def lookup(target_path: str) -> dict[str, Any] | None:
+    """
+    Returns the index entry of the given dotted target path, or `None` if the target
+    is not indexed or any of its source files has been modified since indexed.
+    """
+    entry = _load_index().get(target_path)
+    if entry is None:
+        return None
+    for file, mtime in entry["files"]:
+        if _get_mtime(file) != mtime:
+            logger.ex(f"Signature index of `{target_path}` is stale.")
+            return None
+    return entry
+
+
+def _from_entry(entry: dict[str, Any]) -> SignatureInfo | None:
+    if entry.get("params") is None:
+        return None
+    params = tuple(ParamInfo(*p) for p in entry["params"])
+    return SignatureInfo(params, tuple(entry["required"]))
+
+
+def get_indexed_signature(target_path: str) -> SignatureInfo | None:
+    """
+    Returns the signature information of the given dotted target path from the signature
+    index without importing it, or `None` if it is unavailable or stale.
+    """
+    entry = lookup(target_path)
+    if entry is None:
+        return None
+    return _from_entry(entry)
+
+
+def get_signature(target: Any) -> SignatureInfo:
+    """
+    Returns the signature information of a class or function. Read from the signature
+    index if possible, otherwise inspect the target. The result is memoized.
+    """
+    return _memoize(_infos, target, _get_signature)
+
+
+def _get_signature(target: Any) -> SignatureInfo:
+    target_path = _target_path(target)
+    if target_path is not None and (info := get_indexed_signature(target_path)) is not None:
+        return info
+    return _to_signature_info(_inspect_params(target))
+
+
+def forget_mtimes() -> None:
+    """
+    Drop the memoized mtimes of source files, so that files modified since are checked
+    against the signature index again. Called by `config.load` and `forget_signature`.
+    """
+    _file_mtimes.clear()
+
+
+def forget_signature(target: Any = None) -> None:
+    """
+    Drop the memoized signatures of `target`, or of all targets if it is not given.
+    Called by `Registry` when a target is registered again.
+    """
+    forget_mtimes()
+    if target is None:
+        _signatures.clear()
+        _infos.clear()
+        return
+    keys = [target, target.__init__] if isclass(target) else [target]
+    for memo in (_signatures, _infos):
+        for key in keys:
+            with suppress(TypeError):
+                memo.pop(key, None)
+
+
+def _build_entry(name: str, target: Any) -> dict[str, Any]:
+    from ..config._json_schema import _parse_target  # pylint: disable=import-outside-toplevel
+
+    if ismodule(target):
+        return dict(files=[], is_module=True)
+    entry: dict[str, Any] = dict(
+        files=[[f, os.stat(f).st_mtime_ns] for f in _source_files(target)],
+        is_module=False,
+        params=None,
+        required=None,
+        schema=None,
+        location=None,
+    )
+    try:
+        info = _to_signature_info(_inspect_params(target))
+        entry["params"] = [list(p) for p in info.params]
+        entry["required"] = list(info.required)
+    except (TypeError, ValueError):
+        logger.ex(f"Cannot inspect signature of `{name}`.")
+    try:
+        entry["schema"], entry["location"] = _parse_target(name, target, silent=True)
+    except Exception:
+        logger.ex(f"Cannot generate json schema of `{name}`.")
+    return entry
+
+
+def build_signature_entries(targets: Iterable[tuple[str, str]]) -> dict[str, dict[str, Any]]:
+    """
+    Import and inspect targets given by `(name, dotted target path)`, returns index
+    entries keyed by target paths. Targets failed to import are skipped.
+    """
+    from ..config.models import _str_to_target  # pylint: disable=import-outside-toplevel
+
+    entries: dict[str, dict[str, Any]] = {}
+    for name, target_path in targets:
+        try:
+            target = _str_to_target(target_path)
+        except (ImportError, StrToClassError):
+            logger.ex(f"Cannot import `{target_path}`, skip it.")
+            continue
+        entries[target_path] = _build_entry(name, target)
+    return entries
+
+
+def dump_signature_index(
+    update: bool = False, entries: dict[str, dict[str, Any]] | None = None
+) -> None:
+    """
+    Dump signatures of registered targets to `workspace.signature_index_file`. Only work
+    after targets have been registered, e.g. in `excore auto-register`.
+
+    Args:
+        update (bool): Whether to merge into the existing index. Defaults to False.
+        entries (dict[str, dict[str, Any]] | None): Entries built by
+            `build_signature_entries`, inspect all targets in the registry pool
+            if not given. Defaults to None.
+    """
+    from .registry import Registry  # pylint: disable=import-outside-toplevel
+
+    global _index
+    file_path = workspace.signature_index_file
+    if entries is None:
+        entries = build_signature_entries(
+            item for reg in Registry._registry_pool.values() for item in reg.items()
+        )
+    targets: dict[str, dict[str, Any]] = {}
+    if update:
+        targets.update(_load_index())
+    targets.update(entries)
+
+    with FileLock(file_path + ".lock", timeout=5):
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "w", encoding="UTF-8") as f:
+            json.dump(dict(version=_INDEX_VERSION, targets=targets), f)
+        os.replace(tmp_path, file_path)
+    _index = targets
+    forget_mtimes()
+    logger.success(f"Dump signature index to {file_path}!")
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import time
+from collections import defaultdict, deque
 from collections.abc import Sequence
-from typing import Any, Callable, Protocol
+from typing import Any, Callable, NamedTuple, Protocol
 
 from excore._exceptions import HookBuildError, HookManagerBuildError
+from excore._misc import _create_table
 
-__all__ = ["HookManager", "ConfigHookManager", "Hook"]
+from .logging import logger
+
+__all__ = ["HookManager", "ConfigHookManager", "Hook", "HookStats"]
 
 
 class Hook(Protocol):
@@ -33,6 +37,123 @@ class Hook(Protocol):
     __call__: Callable
 
 
+class HookStats(NamedTuple):
+    """
+    Statistics of a hook profiled by `HookManager`, times are in milliseconds and
+    percentiles are computed from the latest `window` calls.
+
+    Attributes:
+        stage (str): The stage of the hook.
+        name (str): The name of the hook.
+        calls (int): The number of calls.
+        total (float): The cumulative time.
+        mean (float): The mean time.
+        p50 (float): The median time.
+        p95 (float): The 95th percentile of time.
+        p99 (float): The 99th percentile of time.
+        max (float): The maximum time.
+        exceptions (int): The number of calls which raised exceptions.
+        slow (int): The number of calls which exceeded the budget.
+    """
+
+    stage: str
+    name: str
+    calls: int
+    total: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    exceptions: int
+    slow: int
+
+
+class _HookRecord:
+    __slots__ = (
+        "hook",
+        "stage",
+        "name",
+        "calls",
+        "total",
+        "max",
+        "exceptions",
+        "slow",
+        "latencies",
+    )
+
+    def __init__(self, stage: str, hook: Hook, window: int) -> None:
+        # Keep the hook alive, since records are keyed by its id.
+        self.hook = hook
+        self.stage = stage
+        self.name = getattr(hook, "__name__", type(hook).__name__)
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.exceptions = 0
+        self.slow = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def to_stats(self) -> HookStats:
+        latencies = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1e3
+
+        return HookStats(
+            self.stage,
+            self.name,
+            self.calls,
+            self.total * 1e3,
+            self.total * 1e3 / max(self.calls, 1),
+            percentile(0.5),
+            percentile(0.95),
+            percentile(0.99),
+            self.max * 1e3,
+            self.exceptions,
+            self.slow,
+        )
+
+
+class _Schedule:
+    """
+    The dispatch table of hooks of a stage. Hooks are bucketed by `__CallInter__` along
+    with their indices, and `due` maps the number of the next call to intervals due at
+    it, so a call only touches hooks which are due.
+    """
+
+    __slots__ = ("hooks", "size", "buckets", "due")
+
+    def __init__(self, hooks: list[Hook], calls: int) -> None:
+        self.hooks = hooks
+        self.size = len(hooks)
+        self.buckets: dict[int, list[tuple[int, Hook]]] = {}
+        for idx, hook in enumerate(hooks):
+            self.buckets.setdefault(hook.__CallInter__, []).append((idx, hook))
+        self.due: dict[int, list[int]] = {}
+        for inter in self.buckets:
+            # The next call which is a multiple of `inter`.
+            self.due.setdefault(-(-calls // inter) * inter, []).append(inter)
+
+    def pop_due(self, calls: int) -> list[tuple[int, Hook]]:
+        """Returns hooks due at `calls` in order, and schedules their next calls."""
+        intervals = self.due.pop(calls, None)
+        if intervals is None:
+            return []
+        if len(intervals) == 1:
+            inter = intervals[0]
+            if (next_intervals := self.due.get(calls + inter)) is None:
+                self.due[calls + inter] = intervals
+            else:
+                next_intervals.append(inter)
+            return self.buckets[inter]
+        for inter in intervals:
+            self.due.setdefault(calls + inter, []).append(inter)
+        return sorted(item for inter in intervals for item in self.buckets[inter])
+
+
 class MetaHookManager(type):
     stages: tuple[str, ...] = ()
     """
@@ -94,6 +215,12 @@ class HookManager(metaclass=MetaHookManager):
         calls (defaultdict[int]): A dictionary tracking the number of times each event stage
             has been called.
 
+    Calls of hooks can be profiled by `enable_profiling`, see `stats`.
+
+    Hooks of each stage are dispatched by a precomputed schedule, which is rebuilt when
+        hooks are added to or removed from `hooks`. Call `reschedule` after modifying
+        `__CallInter__` of registered hooks.
+
     Methods:
         check_life_span(hook: Hook) -> bool: Checks whether a given `Hook` object has exceeded
             its maximum lifespan.
@@ -131,9 +258,99 @@ class HookManager(metaclass=MetaHookManager):
                 )
         self.hooks = defaultdict(list)
         self.calls: dict[str, int] = defaultdict(int)
+        self._schedules: dict[str, _Schedule] = {}
+        self._records: dict[tuple[str, int], _HookRecord] | None = None
+        self._budget: float | None = None
+        self._window = 0
         for h in hooks:
             self.hooks[h.__HookType__].append(h)
 
+    def enable_profiling(self, budget: float | None = None, window: int = 10000) -> None:
+        """
+        Record the time and exceptions of every call of hooks, see `stats`. Profiling is
+            disabled by default and costs nothing but a check per call of hooks.
+
+        Args:
+            budget (float, optional): The time budget of a call in seconds, a warning is
+                logged the first time a hook exceeds it. Defaults to None, no budget.
+            window (int, optional): The number of latest calls of each hook kept to compute
+                percentiles. Defaults to 10000.
+        """
+        if self._records is None or window != self._window:
+            self._records = {}
+        self._budget = budget
+        self._window = window
+
+    def disable_profiling(self) -> None:
+        """Stop profiling and drop the recorded statistics."""
+        self._records = None
+
+    def stats(self) -> list[HookStats]:
+        """
+        Returns statistics of profiled hooks, sorted by the cumulative time in descending
+            order. It is empty if profiling is disabled.
+        """
+        records = self._records.values() if self._records is not None else ()
+        return sorted((r.to_stats() for r in records), key=lambda s: s.total, reverse=True)
+
+    def stats_table(self) -> str:
+        """Format `stats` as a table."""
+        times = ["total", "mean", "p50", "p95", "p99", "max"]
+        rows = [
+            (
+                s.stage,
+                s.name,
+                s.calls,
+                *(f"{getattr(s, t):.3f}" for t in times),
+                s.exceptions,
+                s.slow,
+            )
+            for s in self.stats()
+        ]
+        return _create_table(
+            ["stage", "hook", "calls", *(f"{t}(ms)" for t in times), "exceptions", "slow"], rows
+        )
+
+    def _profile_call(self, stage: str, hook: Hook, inps: tuple[Any, ...]) -> Any:
+        assert self._records is not None
+        record = self._records.get((stage, id(hook)))
+        if record is None:
+            record = self._records[stage, id(hook)] = _HookRecord(stage, hook, self._window)
+        start = time.perf_counter()
+        try:
+            return hook(*inps)
+        except BaseException:
+            record.exceptions += 1
+            raise
+        finally:
+            cost = time.perf_counter() - start
+            record.calls += 1
+            record.total += cost
+            record.max = max(record.max, cost)
+            record.latencies.append(cost)
+            if self._budget is not None and cost > self._budget:
+                record.slow += 1
+                if record.slow == 1:
+                    logger.warning(
+                        "Hook `{}` of stage `{}` costs {:.3f}ms, exceeding the budget {:.3f}ms.",
+                        record.name,
+                        stage,
+                        cost * 1e3,
+                        self._budget * 1e3,
+                    )
+
+    def reschedule(self, stage: str | None = None) -> None:
+        """
+        Rebuild the schedule of `stage`, or of all stages if it is not given.
+
+        Args:
+            stage (str, optional): The name of the event stage. Defaults to None.
+        """
+        if stage is None:
+            self._schedules.clear()
+        else:
+            self._schedules.pop(stage, None)
+
     @staticmethod
     def check_life_span(hook: Hook) -> bool:
         """
@@ -177,16 +394,25 @@ class HookManager(metaclass=MetaHookManager):
             stage (str): The name of the event stage to trigger.
             *inps: Input arguments to pass to the hook functions.
         """
-        dead_hook_idx: list[int] = []
         calls = self.calls[stage]
-        for idx, hook in enumerate(self.hooks[stage]):
-            if calls % hook.__CallInter__ == 0:
-                res = hook(*inps)
+        hooks = self.hooks[stage]
+        schedule = self._schedules.get(stage)
+        if schedule is None or schedule.hooks is not hooks or schedule.size != len(hooks):
+            schedule = self._schedules[stage] = _Schedule(hooks, calls)
+        dead_hooks: list[int] = []
+        try:
+            profiling = self._records is not None
+            for idx, hook in schedule.pop_due(calls):
+                res = self._profile_call(stage, hook, inps) if profiling else hook(*inps)
                 if res and self.check_life_span(hook):
-                    dead_hook_idx.append(idx - len(dead_hook_idx))
-        for idx in dead_hook_idx:
-            self.hooks[stage].pop(idx)
-        self.calls[stage] = calls + 1
+                    dead_hooks.append(idx)
+        finally:
+            self.calls[stage] = calls + 1
+            if dead_hooks:
+                # Compact once, `hooks` is kept since it is shared with `self.hooks`.
+                dead = set(dead_hooks)
+                hooks[:] = [h for idx, h in enumerate(hooks) if idx not in dead]
+                del self._schedules[stage]
 
     def call_hooks(self, stage, *inps) -> None:
         """
@@ -21,9 +21,18 @@ if TYPE_CHECKING:
             pass
 
 
-__all__ = ["logger", "add_logger", "remove_logger", "debug_only", "log_to_file_only"]
+__all__ = [
+    "logger",
+    "add_logger",
+    "remove_logger",
+    "debug_only",
+    "log_to_file_only",
+    "trace",
+    "enable_trace",
+]
 
 LOGGERS: dict[str, int] = {}
+TRACE_ENABLED = False  # whether `trace` emits events, see `enable_trace`.
 
 FORMAT = (
     "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
@@ -98,10 +107,32 @@ def _excore_debug(__message: str, *args: Any, **kwargs: Any) -> None:
     logger._log("EXCORE", False, logger._options, __message, args, kwargs)
 
 
+def trace(__event: str, **fields: Any) -> None:
+    """
+    Emit a structured debug event at level `EXCORE`, e.g. `trace("parse.module", node=node)`.
+    It returns before formatting anything unless tracing is enabled, so pass objects as
+    `fields` instead of formatting them in advance. `fields` are bound to `record["extra"]`.
+    """
+    if not TRACE_ENABLED:
+        return
+    message = " ".join([__event, *(f"{k}={v}" for k, v in fields.items())])
+    logger.opt(depth=1).bind(event=__event, **fields).log("EXCORE", message)
+
+
+def enable_trace(enabled: bool = True) -> None:
+    """
+    Enable or disable `trace`, which is enabled by `export EXCORE_DEBUG=1`.
+    Note that a handler of level `EXCORE` is also needed to see the events.
+    """
+    global TRACE_ENABLED
+    TRACE_ENABLED = enabled
+
+
 def _enable_excore_debug() -> None:
     if os.getenv("EXCORE_DEBUG"):
         logger.remove()
         logger.add(sys.stdout, format=FORMAT, level="EXCORE")
+        enable_trace()
         logger.ex("Enabled excore debug")
 
 
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import fnmatch
 import functools
+import importlib
 import inspect
 import os
 import re
 import sys
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from types import FunctionType, ModuleType
 from typing import Any, Callable, Literal, Type, overload
 
@@ -14,7 +16,9 @@ from filelock import FileLock
 
 from .._constants import _workspace_config_file, workspace
 from .._misc import _create_table
-from .logging import logger
+from ._registry_cache import RegistryCacheError, RegistryCacheReader, dump_registry_cache
+from ._signature import forget_signature
+from .logging import logger, trace
 
 _name_re = re.compile(r"^[A-Za-z0-9_]+$")
 _private_flag: str = "__"
@@ -55,13 +59,169 @@ def _get_module_name(m: ModuleType | _ClassType | FunctionType) -> str:
     return getattr(m, "__qualname__", m.__name__)
 
 
+class _Pending:
+    __slots__ = ("index",)
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+
+def _registry_class(cls_path: str | None) -> type[Registry]:
+    """Import the registry class from its `module:qualname`, `None` for `Registry`."""
+    if cls_path is None:
+        return Registry
+    module, qualname = cls_path.split(":")
+    reg_cls: Any = importlib.import_module(module)
+    for attr in qualname.split("."):
+        reg_cls = getattr(reg_cls, attr)
+    return reg_cls
+
+
+class _RegistryPool(dict):
+    """
+    A dictionary that maps registry names to `Registry` instances. Registries loaded from
+    the registry cache are only materialized when they are accessed, membership tests
+    and iterating over names never materialize them.
+
+    It also maintains an inverted index from registered names to registries. Names of
+    materialized registries are indexed when they are set, names of pending registries
+    are looked up in the sorted name table of the cache and memoized.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reader: RegistryCacheReader | None = None
+        self._positions: dict[str, int] = {}
+        self._index: dict[str, list[str]] = {}
+        self._cache_hits: dict[str, list[str]] = {}
+        self._recorded: dict[tuple[str, str], None] | None = None
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._positions.setdefault(name, len(self._positions))
+        super().__setitem__(name, value)
+        if isinstance(value, Registry):
+            for k in value:
+                self.index(value, k)
+
+    def attach(self, reader: RegistryCacheReader) -> None:
+        """
+        Replace registries with those in the registry cache, which are materialized lazily.
+        """
+        self.reader = reader
+        self._cache_hits.clear()
+        for idx, name in enumerate(reader.registry_names):
+            self[name] = _Pending(idx)
+
+    def _materialize(self, name: str, pending: _Pending) -> Registry:
+        assert self.reader is not None
+        reg_name, cls_path, extra_field, entries = self.reader.read_registry(pending.index)
+        reg_cls = _registry_class(cls_path)
+        reg = reg_cls.__new__(reg_cls)
+        Registry.__init__(reg, reg_name, extra_field=extra_field)
+        for k, target, info in entries:
+            dict.__setitem__(reg, k, target)
+            if info is not None:
+                reg.extra_info[k] = info
+        trace("registry.materialize", name=name)
+        self[name] = reg
+        return reg
+
+    def is_pending(self, name: str) -> bool:
+        return isinstance(super().get(name), _Pending)
+
+    def __getitem__(self, name: str) -> Registry:
+        value = super().__getitem__(name)
+        if isinstance(value, _Pending):
+            value = self._materialize(name, value)
+        return value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self[name] if name in self else default  # noqa: SIM401
+
+    def _materialize_all(self) -> None:
+        for name, value in list(super().items()):
+            if isinstance(value, _Pending):
+                self._materialize(name, value)
+
+    def values(self):  # type: ignore
+        self._materialize_all()
+        return super().values()
+
+    def items(self):  # type: ignore
+        self._materialize_all()
+        return super().items()
+
+    def index(self, reg: Registry, name: str, record: bool = False) -> None:
+        """
+        Index `name` of `reg`, do nothing if `reg` is not in the pool. Registered entries
+        are passed with `record=True`, which are recorded within `record()`.
+        """
+        if super().get(reg.name) is not reg:
+            return
+        if record and self._recorded is not None:
+            self._recorded[(reg.name, name)] = None
+        reg_names = self._index.setdefault(name, [])
+        if reg.name not in reg_names:
+            reg_names.append(reg.name)
+
+    @contextmanager
+    def record(self) -> Iterator[dict[tuple[str, str], None]]:
+        """
+        Record `(registry name, name)` of entries registered to registries in the pool
+        within the context, in the order they are set.
+        """
+        recorded: dict[tuple[str, str], None] = {}
+        previous, self._recorded = self._recorded, recorded
+        try:
+            yield recorded
+        finally:
+            self._recorded = previous
+            if previous is not None:
+                previous.update(recorded)
+
+    def lookup(self, name: str) -> list[str]:
+        """
+        Returns names of registries which contain `name` in the order of the pool, without
+        materializing pending registries. Entries removed from registries are dropped here.
+        """
+        found = []
+        reg_names = self._index.get(name)
+        if reg_names:
+            for reg_name in reg_names:
+                value = super().get(reg_name)
+                if isinstance(value, Registry) and name in value:
+                    found.append(reg_name)
+            if len(found) != len(reg_names):
+                reg_names[:] = found
+        if self.reader is not None:
+            if name not in self._cache_hits:
+                self._cache_hits[name] = [
+                    self.reader.registry_names[i] for i in self.reader.find(name)
+                ]
+            found.extend(n for n in self._cache_hits[name] if self.is_pending(n))
+        if len(found) > 1:
+            found.sort(key=self._positions.__getitem__)
+        return found
+
+    def ambiguous_names(self) -> dict[str, list[str]]:
+        names = set(self._index)
+        if self.reader is not None:
+            names.update(self.reader.names())
+        out = {}
+        for name in sorted(names):
+            reg_names = self.lookup(name)
+            if len(reg_names) > 1:
+                out[name] = reg_names
+        return out
+
+
 class RegistryMeta(type):
-    _registry_pool: dict[str, Registry] = {}
+    _registry_pool: _RegistryPool = _RegistryPool()
     """Metaclass that governs the creation of instances of its subclasses, which are
     `Registry` objects.
 
     Attributes:
-        _registry_pool (dict): A dictionary that maps registry names to `Registry`
+        _registry_pool (_RegistryPool): A dictionary that maps registry names to `Registry`
             instances.
 
     Methods:
@@ -128,24 +288,44 @@ class Registry(dict, metaclass=RegistryMeta):  # type: ignore
         self.extra_info = {}
 
     @classmethod
-    def dump(cls, update: bool = False) -> None:
-        import pickle  # pylint: disable=import-outside-toplevel
+    def dump(cls, update: bool = False, registries: dict[str, Registry] | None = None) -> None:
+        """
+        Dump registries to `workspace.registry_cache_file`.
 
+        Args:
+            update (bool): Whether to keep registries in the existing cache which are not
+                in the registry pool. Defaults to False.
+            registries (dict[str, Registry] | None): Registries to dump instead of the
+                registry pool. Defaults to None.
+        """
         file_path = workspace.registry_cache_file
 
+        cache_to_dump: dict[str, Registry] = {}
         if update and os.path.exists(file_path):
-            with open(file_path, "rb") as f:
-                cache_to_dump = pickle.load(f)
+            try:
+                cache_to_dump.update(cls.read_cache())
+            except RegistryCacheError as e:
+                logger.warning(f"{e} Overwrite it.")
+        cache_to_dump.update(cls._registry_pool.items() if registries is None else registries)
 
-            cache_to_dump.update(cls._registry_pool)
-        else:
-            cache_to_dump = cls._registry_pool
-
-        with FileLock(file_path + ".lock", timeout=5), open(file_path, "wb") as f:
-            pickle.dump(cache_to_dump, f)
+        with FileLock(file_path + ".lock", timeout=5):
+            dump_registry_cache(file_path, cache_to_dump)
 
         logger.success(f"Dump registry cache to {workspace.registry_cache_file}!")
 
+    @classmethod
+    def read_cache(cls) -> dict[str, Registry]:
+        """
+        Returns all registries in `workspace.registry_cache_file` without touching the
+        registry pool. The whole file is read, so its digest is verified as well.
+
+        Raises:
+            RegistryCacheError: If the cache is not readable.
+        """
+        cached = _RegistryPool()
+        cached.attach(RegistryCacheReader(workspace.registry_cache_file, verify=True))
+        return dict(cached.items())
+
     @classmethod
     def load(cls) -> None:
         if not os.path.exists(_workspace_config_file):
@@ -159,11 +339,13 @@ class Registry(dict, metaclass=RegistryMeta):  # type: ignore
                 " Please run `excore auto-register in your command line first`"
             )
             sys.exit(1)
-        import pickle  # pylint: disable=import-outside-toplevel
-
-        with FileLock(file_path + ".lock"), open(file_path, "rb") as f:
-            data = pickle.load(f)
-        cls._registry_pool.update(data)
+        # The cache is replaced atomically, so no lock is needed to read it.
+        try:
+            reader = RegistryCacheReader(file_path)
+        except RegistryCacheError as e:
+            logger.critical(f"{e} Please run `excore auto-register` in your command line again.")
+            sys.exit(1)
+        cls._registry_pool.attach(reader)
 
     @classmethod
     def lock_register(cls) -> None:
@@ -182,17 +364,28 @@ class Registry(dict, metaclass=RegistryMeta):  # type: ignore
         return Registry._registry_pool.get(name, default)
 
     @classmethod
-    @functools.lru_cache(32)
     def find(cls, name: str) -> tuple[Any, str] | tuple[None, None]:
         """
         Searches all registries for an element with the given name. If found,
         returns a tuple containing the element and the name of the registry where it
-        was found; otherwise, returns `(None, None)`.
+        was found; otherwise, returns `(None, None)`. If the name is registered in
+        several registries, the first one in the registry pool is returned, see
+        `ambiguous_names`.
         """
-        for registried_name, registry in Registry._registry_pool.items():
-            if name in registry:
-                return (registry[name], registried_name)
-        return (None, None)
+        reg_names = Registry._registry_pool.lookup(name)
+        if not reg_names:
+            return (None, None)
+        if len(reg_names) > 1:
+            trace("registry.find.ambiguous", name=name, registries=reg_names)
+        return (Registry._registry_pool[reg_names[0]][name], reg_names[0])
+
+    @classmethod
+    def ambiguous_names(cls) -> dict[str, list[str]]:
+        """
+        Returns a dictionary that maps each name registered in more than one registry
+        to the names of those registries, in the order `find` searches them.
+        """
+        return Registry._registry_pool.ambiguous_names()
 
     @classmethod
     def make_global(cls) -> Registry:
@@ -212,6 +405,7 @@ class Registry(dict, metaclass=RegistryMeta):  # type: ignore
     def __setitem__(self, k: str, v: Any) -> None:
         _is_pure_ascii(k)
         super().__setitem__(k, v)
+        Registry._registry_pool.index(self, k, record=True)
 
     def __repr__(self) -> str:
         return _create_table(
@@ -292,6 +486,11 @@ class Registry(dict, metaclass=RegistryMeta):  # type: ignore
             target = module
 
         logger.ex(f"Register {name} with {target}.")
+        if not _is_str:
+            forget_signature(module)
+        elif name in self:
+            # The previous target is unknown without importing it.
+            forget_signature()
         self[name] = target
 
         # update to globals
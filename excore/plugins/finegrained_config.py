@@ -9,6 +9,7 @@ from excore.config.models import (
     ModuleNode,
     register_argument_hook,
 )
+from excore.engine._signature import get_signature
 from excore.engine.registry import Registry
 
 if TYPE_CHECKING:
@@ -124,6 +125,32 @@ def _construct_kwargs(
     return kwargs
 
 
+def _build_layers(cls: type, number: int, kwargs: dict[str, ArgType]) -> list[Any]:
+    """Build `number` layers of `cls`, at once if `cls` has `__excore_batch_build__`.
+
+    Args:
+        cls (type): The class of layers.
+        number (int): The number of layers.
+        kwargs (dict[str, ArgType]): Keyword arguments shared by all layers.
+
+    Returns:
+        list[Any]: Built layers.
+
+    Raises:
+        RuntimeError: If `__excore_batch_build__` does not return `number` layers.
+    """
+    batch_build = getattr(cls, "__excore_batch_build__", None)
+    if batch_build is None:
+        return [cls(**kwargs) for _ in range(number)]
+    layers = list(batch_build(number, **kwargs))
+    if len(layers) != number:
+        raise RuntimeError(
+            f"`{cls.__name__}.__excore_batch_build__` is expected to return {number} layers, "
+            f"but got {len(layers)}."
+        )
+    return layers
+
+
 class FinegrainedConfig(ConfigArgumentHook):
     """Fine-grained configuration hook for handling parameter passing and hierarchical config.
 
@@ -142,9 +169,16 @@ class FinegrainedConfig(ConfigArgumentHook):
             Defaults to False. If True, layers will be passed as *layers, otherwise as a list.
         enabled (bool, optional): Whether to enable this hook. Defaults to True.
 
+    Layers are built group by group, where a group is `number` layers of the same class
+    with the same arguments. If the class has a classmethod
+    `__excore_batch_build__(n, **kwargs)`, it is called once to build the `n` layers of
+    a group and should return a sequence of them.
+
     Attributes:
         rcv_key (str): Key name for receiving parameters.
         snd_key (str): Key name for sending parameters.
+        groups (list[tuple[type, int, dict]]): The class, number and keyword arguments of
+            each group of layers, which are computed once and shared by every build.
 
     Examples:
         >>> # Example can be found in `example/finegrained.py`.
@@ -165,38 +199,34 @@ class FinegrainedConfig(ConfigArgumentHook):
         """Initialize the fine-grained configuration hook."""
         super().__init__(node, enabled)
         self.class_mapping = class_mapping
-        self.param_names = [[p.name for p in ModuleNode._inspect_params(c)] for c in class_mapping]
+        self.param_names = [get_signature(c).names for c in class_mapping]
         rcv_snd = [_get_rcv_snd(c) for c in class_mapping]
         self.receive = [_to_list(i[0]) for i in rcv_snd]
         self.send = [_to_list(i[1]) for i in rcv_snd]
         self.info = info
         self.args = args
         self.unpacking = unpack
+        self.groups = self._make_groups()
 
-    def hook(self, **kwargs: Any) -> Any:
-        """Execute the configuration hook logic.
+    def _make_groups(self) -> list[tuple[type, int, dict[str, ArgType]]]:
+        """Compute the keyword arguments of each group of layers.
 
-        This method builds the module hierarchy according to the configuration info
-        and handles parameter passing between modules. It checks the compatibility
+        It handles parameter passing between modules. It checks the compatibility
         of passby arguments with receive parameters and ensures that the lengths
-        of receive and send parameters match between consecutive modules. It then
-        constructs the keyword arguments for module initialization, creates the
-        module instances, and returns the built module container.
-
-        Args:
-            **kwargs: Additional keyword arguments.
+        of receive and send parameters match between consecutive modules. `info`
+        and `args` are not modified.
 
         Returns:
-            Any: Built module container.
+            list[tuple[type, int, dict]]: The class, number and keyword arguments of
+                each group.
 
         Raises:
             RuntimeError: When parameter passing is incompatible.
         """
-        container = self.node()
-        layers = []
-        passby = [self.args.pop(0)]
+        groups = []
+        passby = [self.args[0]]
         prev_module_idx = self.info[0][-1]
-        for (number, module_idx), args in zip(self.info, self.args):
+        for (number, module_idx), args in zip(self.info, self.args[1:]):
             if len(passby_args := passby[-1]) != len(self.receive[module_idx]):
                 raise RuntimeError(
                     f"Passby args {passby_args} are not compatible with {self.receive[module_idx]}"
@@ -212,10 +242,30 @@ class FinegrainedConfig(ConfigArgumentHook):
                 self.param_names[module_idx],
                 self.receive[module_idx],
             )
-            for _ in range(number):
-                layers.append(self.class_mapping[module_idx](**kwargs))
+            groups.append((self.class_mapping[module_idx], number, kwargs))
             passby.append([kwargs[k] for k in self.send[module_idx]])
             prev_module_idx = module_idx
+        return groups
+
+    def hook(self, **kwargs: Any) -> Any:
+        """Execute the configuration hook logic.
+
+        This method builds the layers of every group and returns the built module
+        container. It can be called repeatedly, each call builds new layers.
+
+        Args:
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Any: Built module container.
+
+        Raises:
+            RuntimeError: When `__excore_batch_build__` returns a wrong number of layers.
+        """
+        container = self.node()
+        layers = []
+        for cls, number, layer_kwargs in self.groups:
+            layers.extend(_build_layers(cls, number, layer_kwargs))
         if self.unpacking:
             return container(*layers)
         return container(layers)
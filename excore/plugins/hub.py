@@ -3,27 +3,33 @@ Take and adapt from
     https://github.com/MegEngine/MegEngine/blob/master/imperative/python/megengine/hub/
 """
 
+import ast
+import fnmatch
 import functools
 import hashlib
 import importlib
+import json
 import os
 import re
 import shutil
 import subprocess
 import sys
+import tarfile
+import threading
 import types
-from contextlib import contextmanager
-from tempfile import NamedTemporaryFile
-from typing import Any, List, Optional, Tuple
+from contextlib import contextmanager, suppress
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 from urllib.parse import urlparse
-from zipfile import ZipFile
+from zipfile import ZipFile, ZipInfo
 
 import requests
+from filelock import FileLock
 from tqdm import tqdm
 from typing_extensions import Iterator
 
 from .._constants import __version__, workspace
 from .._exceptions import (
+    ChecksumError,
     GitCheckoutError,
     GitPullError,
     HTTPDownloadError,
@@ -40,6 +46,9 @@ __all__ = [
     "pretrained",
     "import_module",
     "download_from_url",
+    "clear_module_cache",
+    "WeightStore",
+    "weight_store",
 ]
 
 DEFAULT_BRANCH = "master"
@@ -49,7 +58,10 @@ HUBDEPENDENCY = "dependencies"
 DEFAULT_GIT_HOST = "github.com"
 HTTP_READ_TIMEOUT = 120
 HTTP_CONNECTION_TIMEOUT = 5
-CHUNK_SIZE = 1024
+HTTP_TIMEOUT = (HTTP_CONNECTION_TIMEOUT, HTTP_READ_TIMEOUT)
+CHUNK_SIZE = 1 << 20
+PARTIAL_SUFFIX = ".partial"
+WEIGHT_STORE_DIR = "weights"
 
 
 @contextmanager
@@ -78,6 +90,7 @@ class RepoFetcherBase:
         use_cache: bool = False,
         commit: Optional[str] = None,
         silent: bool = True,
+        cache_dir: str = ".",
     ) -> str:
         raise NotImplementedError()
 
@@ -118,6 +131,14 @@ class RepoFetcherBase:
 
 
 class GitSSHFetcher(RepoFetcherBase):
+    """
+    Fetch repos through a bare mirror per repo under `mirrors` of the hub cache. Only the
+    needed branch or commit is fetched into the mirror with `--depth=1`, and its tree is
+    exported by `git archive`, so pinning a new commit does not download the history
+    again. Fetches of the same repo are serialized by a file lock of its mirror, while
+    different repos can be fetched concurrently.
+    """
+
     @classmethod
     def fetch(
         cls,
@@ -126,6 +147,7 @@ class GitSSHFetcher(RepoFetcherBase):
         use_cache: bool = False,
         commit: Optional[str] = None,
         silent: bool = True,
+        cache_dir: str = ".",
     ) -> str:
         if not cls._check_git_host(git_host):
             raise InvalidGitHost(f"git_host: '{git_host}' is malformed.")
@@ -135,72 +157,148 @@ class GitSSHFetcher(RepoFetcherBase):
         repo_dir_raw = f"{repo_owner}_{repo_name}_{normalized_branch_info}"
         if commit:
             repo_dir_raw += f"_{commit}"
-        repo_dir = "_".join(__version__.split(".")) + "_" + cls._gen_repo_dir(repo_dir_raw)
-        git_url = f"git@{git_host}:{repo_owner}/{repo_name}.git"
-
+        repo_dir = os.path.join(
+            cache_dir, "_".join(__version__.split(".")) + "_" + cls._gen_repo_dir(repo_dir_raw)
+        )
+        git_url = cls._git_url(git_host, repo_owner, repo_name)
+        mirror_dir = os.path.join(
+            cache_dir, "mirrors", cls._gen_repo_dir(f"{git_host}/{repo_owner}/{repo_name}")
+        )
         if use_cache and os.path.exists(repo_dir):  # use cache
             logger.debug("Cache Found in {}", repo_dir)
             return repo_dir
 
-        shutil.rmtree(repo_dir, ignore_errors=True)  # ignore and clear cache
+        os.makedirs(os.path.dirname(mirror_dir), exist_ok=True)
+        with FileLock(mirror_dir + ".lock"):
+            if use_cache and os.path.exists(repo_dir):
+                logger.debug("Cache Found in {}", repo_dir)
+                return repo_dir
+            logger.debug(
+                "Git fetch from Repo:{} Branch: {} Commit: {} to {}",
+                git_url,
+                branch_info,
+                commit,
+                repo_dir,
+            )
+            if not os.path.exists(mirror_dir):
+                cls._git(None, silent, "init", "--bare", "--quiet", mirror_dir)
+                cls._git(mirror_dir, silent, "remote", "add", "origin", git_url)
+            sha = cls._fetch_revision(mirror_dir, branch_info, commit, silent)
+            try:
+                cls._export(mirror_dir, sha, repo_dir)
+            except GitPullError:
+                if not cls._is_shallow(mirror_dir):
+                    raise
+                # Objects missing from the shallow history are fetched by unshallowing.
+                cls._git(mirror_dir, silent, "fetch", "--unshallow", "origin")
+                cls._export(mirror_dir, sha, repo_dir)
+        return repo_dir
 
-        logger.debug(
-            "Git Clone from Repo:{} Branch: {} to {}",
-            git_url,
-            normalized_branch_info,
-            repo_dir,
-        )
+    @classmethod
+    def _git_url(cls, git_host: str, repo_owner: str, repo_name: str) -> str:
+        return f"git@{git_host}:{repo_owner}/{repo_name}.git"
 
-        kwargs = {"stderr": subprocess.PIPE, "stdout": subprocess.PIPE} if silent else {}
-        if commit is None:
-            # shallow clone repo by branch/tag
-            p = subprocess.Popen(  # type: ignore
-                [
-                    "git",
-                    "clone",
-                    "-b",
-                    normalized_branch_info,
-                    git_url,
-                    repo_dir,
-                    "--depth=1",
-                ],
-                **kwargs,
-            )
-            cls._check_clone_pipe(p)
-        else:
-            # clone repo and checkout to commit_id
-            p = subprocess.Popen(  # pylint: disable=consider-using-with
-                ["git", "clone", git_url, repo_dir],
-                **kwargs,  # type: ignore
+    @classmethod
+    def _git(cls, git_dir: Optional[str], silent: bool, *args: str) -> str:
+        """Run a git command in `git_dir`, returns its stdout or raises `GitPullError`."""
+        cmd = ["git", *args] if git_dir is None else ["git", "--git-dir", git_dir, *args]
+        try:
+            p = subprocess.run(  # pylint: disable=subprocess-run-check
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE if silent else None,
             )
-            cls._check_clone_pipe(p)
+        except OSError as exc:
+            raise GitPullError(f"Fail to run `{' '.join(cmd)}`.") from exc
+        if p.returncode:
+            err = p.stderr.decode() if p.stderr else ""
+            raise GitPullError("Repo pull error, please check repo info.\n" + err)
+        return p.stdout.decode().strip()
 
-            with cd(repo_dir):
-                logger.debug("git checkout to {}", commit)
-                p = subprocess.Popen(  # pylint: disable=consider-using-with
-                    ["git", "checkout", commit],
-                    **kwargs,  # type: ignore
-                )
-                _, err = p.communicate()
-                if p.returncode:
-                    shutil.rmtree(repo_dir, ignore_errors=True)
-                    raise GitCheckoutError(
-                        "Git checkout error, please check the commit id.\n" + err.decode()
-                    )
-        with cd(repo_dir):
-            shutil.rmtree(".git")
+    @classmethod
+    def _is_shallow(cls, mirror_dir: str) -> bool:
+        return os.path.exists(os.path.join(mirror_dir, "shallow"))
 
-        return repo_dir
+    @classmethod
+    def _fetch_revision(
+        cls, mirror_dir: str, branch_info: str, commit: Optional[str], silent: bool
+    ) -> str:
+        """
+        Fetch the branch or commit into the mirror, returns the sha of the commit. Fetched
+        commits are kept by refs under `refs/excore`, otherwise `git gc` may prune them.
+        """
+        if commit is None:
+            ref = f"refs/excore/heads/{branch_info}"
+            refspec = f"+{branch_info}:{ref}"
+            try:
+                cls._git(mirror_dir, silent, "fetch", "--depth=1", "origin", refspec)
+            except GitPullError:
+                # Servers may refuse shallow fetches, then fetch the full history instead.
+                unshallow = ["--unshallow"] if cls._is_shallow(mirror_dir) else []
+                cls._git(mirror_dir, silent, "fetch", *unshallow, "origin", refspec)
+            return cls._git(mirror_dir, silent, "rev-parse", ref)
+        with suppress(GitPullError):
+            return cls._git(mirror_dir, silent, "rev-parse", "--verify", f"{commit}^{{commit}}")
+        try:
+            # Servers may refuse to fetch commits by sha, then fetch all branches instead.
+            try:
+                refspec = f"{commit}:refs/excore/commits/{commit}"
+                cls._git(mirror_dir, silent, "fetch", "--depth=1", "origin", refspec)
+            except GitPullError:
+                unshallow = ["--unshallow"] if cls._is_shallow(mirror_dir) else []
+                cls._git(
+                    mirror_dir, silent, "fetch", *unshallow, "origin", "+refs/heads/*:refs/heads/*"
+                )
+            return cls._git(mirror_dir, silent, "rev-parse", "--verify", f"{commit}^{{commit}}")
+        except GitPullError as exc:
+            raise GitCheckoutError(
+                f"Git checkout error, please check the commit id `{commit}`."
+            ) from exc
 
     @classmethod
-    def _check_clone_pipe(cls, p):
-        _, err = p.communicate()
+    def _export(cls, mirror_dir: str, sha: str, repo_dir: str) -> None:
+        """Export the tree of `sha` to `repo_dir` through a temporary directory."""
+        tmp_dir = f"{repo_dir}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            p = subprocess.Popen(
+                ["git", "--git-dir", mirror_dir, "archive", "--format=tar", sha],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as exc:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise GitPullError(f"Fail to export {sha} of {mirror_dir}.") from exc
+        with p:
+            try:
+                with tarfile.open(fileobj=p.stdout, mode="r|") as tar:
+                    _extract_tar(tar, tmp_dir)
+            except tarfile.TarError as exc:
+                p.kill()
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise GitPullError(f"Fail to export {sha} of {mirror_dir}.") from exc
+            _, err = p.communicate()
         if p.returncode:
-            raise GitPullError("Repo pull error, please check repo info.\n" + err.decode())
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise GitPullError(f"Fail to export {sha} of {mirror_dir}.\n" + err.decode())
+        _replace_dir(tmp_dir, repo_dir)
 
 
 class GitHTTPSFetcher(RepoFetcherBase):
-    HTTP_TIMEOUT = (HTTP_CONNECTION_TIMEOUT, HTTP_READ_TIMEOUT)
+    """
+    Fetch repos by downloading their zip archives, which are extracted member by member
+    into a temporary directory and renamed to the repo directory at last.
+
+    Attributes:
+        include (Sequence[str], optional): Glob patterns of files to extract, relative to
+            the root of repos. Python files which are imported by the matched ones are
+            extracted too, e.g. `["hubconf.py"]` only extracts `hubconf.py` and its import
+            closure. Defaults to None, extract all files.
+    """
+
+    HTTP_TIMEOUT = HTTP_TIMEOUT
+    include: Optional[Sequence[str]] = None
 
     @classmethod
     def fetch(
@@ -210,6 +308,7 @@ class GitHTTPSFetcher(RepoFetcherBase):
         use_cache: bool = False,
         commit: Optional[str] = None,
         silent: bool = True,
+        cache_dir: str = ".",
     ) -> str:
         if not cls._check_git_host(git_host):
             raise InvalidGitHost(f"git_host: '{git_host}' is malformed.")
@@ -219,7 +318,11 @@ class GitHTTPSFetcher(RepoFetcherBase):
         repo_dir_raw = f"{repo_owner}_{repo_name}_{normalized_branch_info}" + (
             f"_{commit}" if commit else ""
         )
-        repo_dir = "_".join(__version__.split(".")) + "_" + cls._gen_repo_dir(repo_dir_raw)
+        if cls.include is not None:
+            repo_dir_raw += "_" + ",".join(cls.include)
+        repo_dir = os.path.join(
+            cache_dir, "_".join(__version__.split(".")) + "_" + cls._gen_repo_dir(repo_dir_raw)
+        )
         archive_url = (
             f"https://{git_host}/{repo_owner}/{repo_name}/archive/{commit or branch_info}.zip"
         )
@@ -228,34 +331,129 @@ class GitHTTPSFetcher(RepoFetcherBase):
             logger.debug("Cache Found in {}", repo_dir)
             return repo_dir
 
-        shutil.rmtree(repo_dir, ignore_errors=True)  # ignore and clear cache
-
-        logger.debug(f"Downloading from {archive_url} to {repo_dir}")
-        cls._download_zip_and_extract(archive_url, repo_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        with FileLock(repo_dir + ".lock"):
+            if use_cache and os.path.exists(repo_dir):
+                logger.debug("Cache Found in {}", repo_dir)
+                return repo_dir
+            logger.debug(f"Downloading from {archive_url} to {repo_dir}")
+            cls._download_zip_and_extract(archive_url, repo_dir, cls.include)
 
         return repo_dir
 
     @classmethod
-    def _download_zip_and_extract(cls, url, target_dir):
-        resp = requests.get(url, timeout=cls.HTTP_TIMEOUT, stream=True)
-        if resp.status_code != 200:
-            raise HTTPDownloadError(f"An error occurred when downloading from {url}")
-
-        total_size = int(resp.headers.get("Content-Length", 0))
-        _bar = tqdm(total=total_size, unit="iB", unit_scale=True)
+    def _download_zip_and_extract(cls, url, target_dir, include=None):
+        zip_path = target_dir + ".zip"
+        download_from_url(url, zip_path)
+        try:
+            cls._extract_zip(zip_path, target_dir, include)
+        finally:
+            os.remove(zip_path)
 
-        with NamedTemporaryFile("w+b") as f:
-            for chunk in resp.iter_content(CHUNK_SIZE):
-                if not chunk:
-                    break
-                _bar.update(len(chunk))
-                f.write(chunk)
-            _bar.close()
-            f.seek(0)
-            with ZipFile(f) as temp_zip_f:
-                zip_dir_name = temp_zip_f.namelist()[0].split("/")[0]
-                temp_zip_f.extractall(".")
-                shutil.move(zip_dir_name, target_dir)
+    @classmethod
+    def _extract_zip(
+        cls, zip_path: str, target_dir: str, include: Optional[Sequence[str]] = None
+    ) -> None:
+        """
+        Extract files under the top directory of the archive to `target_dir`, which are
+        written to a temporary directory directly and renamed at last.
+        """
+        tmp_dir = f"{target_dir}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        with ZipFile(zip_path) as zip_f:
+            members: Dict[str, ZipInfo] = {}
+            for info in zip_f.infolist():
+                name = info.filename.split("/", 1)[-1]
+                if info.is_dir() or not name or name.startswith("/") or ".." in name.split("/"):
+                    continue
+                members[name] = info
+            names = members.keys() if include is None else _select_files(zip_f, members, include)
+            for name in names:
+                path = os.path.join(tmp_dir, *name.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with zip_f.open(members[name]) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        _replace_dir(tmp_dir, target_dir)
+
+
+def _replace_dir(tmp_dir: str, target_dir: str) -> None:
+    """Replace `target_dir` by `tmp_dir`, which is discarded if another process wins."""
+    shutil.rmtree(target_dir, ignore_errors=True)
+    try:
+        os.replace(tmp_dir, target_dir)
+    except OSError:
+        if not os.path.isdir(target_dir):
+            raise
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _extract_tar(tar: tarfile.TarFile, path: str) -> None:
+    """
+    Extract a streaming tar archive to `path`, refusing members which are absolute,
+    contain `..`, are special files or links pointing outside of `path`.
+    """
+    if hasattr(tarfile, "data_filter"):
+        tar.extractall(path, filter="data")
+        return
+    root = os.path.realpath(path)
+    for member in tar:
+        target = os.path.realpath(os.path.join(root, member.name))
+        if member.issym():
+            link = os.path.realpath(os.path.join(os.path.dirname(target), member.linkname))
+        elif member.islnk():
+            link = os.path.realpath(os.path.join(root, member.linkname))
+        else:
+            link = target
+        if (
+            os.path.isabs(member.name)
+            or ".." in member.name.split("/")
+            or not (member.isfile() or member.isdir() or member.issym() or member.islnk())
+            or os.path.commonpath([root, target, link]) != root
+        ):
+            raise tarfile.TarError(f"Refuse to extract `{member.name}` out of `{path}`.")
+        tar.extract(member, path)
+
+
+def _select_files(zip_f: ZipFile, members: Dict[str, ZipInfo], include: Sequence[str]) -> Set[str]:
+    """Select files matching `include` and python files imported by them recursively."""
+    pending = [name for name in members if any(fnmatch.fnmatch(name, p) for p in include)]
+    selected: Set[str] = set()
+    while pending:
+        name = pending.pop()
+        if name in selected or name not in members:
+            continue
+        selected.add(name)
+        if not name.endswith(".py"):
+            continue
+        package = name.split("/")[:-1]
+        for i in range(1, len(package) + 1):
+            pending.append("/".join(package[:i]) + "/__init__.py")
+        try:
+            tree = ast.parse(zip_f.read(members[name]))
+        except (SyntaxError, ValueError):
+            continue
+        for modules in _imported_modules(tree, package):
+            for module in modules:
+                for i in range(1, len(module) + 1):
+                    prefix = "/".join(module[:i])
+                    pending += [prefix + ".py", prefix + "/__init__.py"]
+    return selected
+
+
+def _imported_modules(tree: ast.AST, package: List[str]) -> Iterator[List[List[str]]]:
+    """
+    Yield candidate module paths of each import in `tree`, `package` is the path of the
+    package of the module, which resolves relative imports.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield [alias.name.split(".") for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = package[: len(package) - node.level + 1] if node.level else []
+            module = base + (node.module.split(".") if node.module else [])
+            # `from package import module` imports modules too.
+            yield [module, *(module + [alias.name] for alias in node.names)]
 
 
 PROTOCOLS = {
@@ -264,21 +462,251 @@ PROTOCOLS = {
 }
 
 
-def download_from_url(url: str, dst: str):
-    resp = requests.get(url, timeout=120, stream=True)
-    if resp.status_code != 200:
-        raise HTTPDownloadError(f"An error occurred when downloading from {url}")
+def _hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> "hashlib._Hash":
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            sha256.update(chunk)
+    return sha256
+
 
-    total_size = int(resp.headers.get("Content-Length", 0))
-    _bar = tqdm(total=total_size, unit="iB", unit_scale=True)
+def download_from_url(
+    url: str,
+    dst: str,
+    sha256: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+    resume: bool = True,
+    progress: bool = True,
+) -> str:
+    """
+    Download `url` to `dst`. The content is streamed into `dst + ".partial"`, which is
+    resumed by a HTTP Range request if it exists, and atomically renamed to `dst` once
+    completed and verified.
+
+    Args:
+        url (str): The url to download from.
+        dst (str): The path to save the file.
+        sha256 (str, optional): The expected sha256 hex digest, or a prefix of it.
+            Defaults to None, do not verify.
+        chunk_size (int, optional): The size of buffers to read and write.
+            Defaults to `CHUNK_SIZE`, i.e. 1 MiB.
+        resume (bool, optional): Whether to resume from an existing partial file.
+            Defaults to True.
+        progress (bool, optional): Whether to show a progress bar. Defaults to True.
+
+    Returns:
+        str: The path of the downloaded file, i.e. `dst`.
+
+    Raises:
+        HTTPDownloadError: If the server responds with an error.
+        ChecksumError: If the downloaded file does not match `sha256`, the partial
+            file is removed so that the next download starts from zero.
+    """
+    _download(url, dst, sha256, chunk_size, resume, progress)
+    return dst
+
+
+def _download(
+    url: str,
+    dst: str,
+    sha256: Optional[str],
+    chunk_size: int,
+    resume: bool,
+    progress: bool,
+) -> Tuple[str, str]:
+    """Implementation of `download_from_url`, returns the sha256 digest and the ETag."""
+    partial = dst + PARTIAL_SUFFIX
+    offset = os.path.getsize(partial) if resume and os.path.exists(partial) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with requests.get(url, headers=headers, timeout=HTTP_TIMEOUT, stream=True) as resp:
+        content_range = resp.headers.get("Content-Range", "")
+        etag = resp.headers.get("ETag", "")
+        if resp.status_code == 416 and content_range == f"bytes */{offset}":
+            logger.debug("Partial download of {} is already completed.", url)
+            hasher = _hash_file(partial, chunk_size)
+        elif resp.status_code == 206 and content_range.startswith(f"bytes {offset}-"):
+            logger.debug("Resume downloading {} from {} bytes.", url, offset)
+            hasher = _hash_file(partial, chunk_size)
+            _write_response(resp, partial, offset, hasher, chunk_size, progress)
+        elif resp.status_code in (206, 416):
+            # The remote file has been changed, start from zero.
+            return _download(url, dst, sha256, chunk_size, False, progress)
+        elif resp.status_code == 200:
+            hasher = hashlib.sha256()
+            _write_response(resp, partial, 0, hasher, chunk_size, progress)
+        else:
+            raise HTTPDownloadError(
+                f"An error occurred when downloading from {url}, status: {resp.status_code}"
+            )
 
-    with open(dst, "w+b") as f:
-        for chunk in resp.iter_content(CHUNK_SIZE):
-            if not chunk:
-                break
-            _bar.update(len(chunk))
+    digest = hasher.hexdigest()
+    if sha256 and not digest.startswith(sha256.lower()):
+        os.remove(partial)
+        raise ChecksumError(f"Expected sha256 `{sha256}` of {url}, but got `{digest}`.")
+    os.replace(partial, dst)
+    return digest, etag
+
+
+def _write_response(
+    resp: requests.Response,
+    path: str,
+    offset: int,
+    hasher: "hashlib._Hash",
+    chunk_size: int,
+    progress: bool,
+) -> None:
+    """Write the content of `resp` to `path` from `offset`, and update `hasher` with it."""
+    total_size = int(resp.headers.get("Content-Length", 0)) + offset
+    dirname = os.path.dirname(path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    with tqdm(
+        total=total_size or None,
+        initial=offset,
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        disable=not progress,
+    ) as bar, open(path, "ab" if offset else "wb") as f:
+        for chunk in resp.iter_content(chunk_size):
             f.write(chunk)
-        _bar.close()
+            hasher.update(chunk)
+            bar.update(len(chunk))
+
+
+class WeightStore:
+    """
+    A content-addressed store of downloaded files, e.g. pretrained weights, which is shared
+    by all workspaces under `workspace.cache_base_dir` by default.
+
+    Files are stored as `objects/<digest[:2]>/<digest><suffix>` by their sha256 digests,
+    and each url has a record `urls/<sha256 of url>.json` of its digest, size, suffix and
+    ETag. So a hit only reads the record and stats the file, without any request. Files
+    are touched on every hit and the least recently used ones are evicted once the total
+    size exceeds `max_size`. Processes coordinate through a file lock per url.
+
+    Args:
+        root (str, optional): The directory of the store. Defaults to `weights` under
+            `workspace.cache_base_dir`.
+        max_size (int, optional): The maximum total size of files in bytes.
+            Defaults to None, unlimited.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_size: Optional[int] = None) -> None:
+        self._root = root
+        self.max_size = max_size
+
+    @property
+    def root(self) -> str:
+        return self._root or os.path.join(workspace.cache_base_dir, WEIGHT_STORE_DIR)
+
+    def _record_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.root, "urls", key + ".json")
+
+    def _object_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest + suffix)
+
+    def _lookup(self, url: str) -> Optional[Tuple[str, dict]]:
+        try:
+            with open(self._record_path(url), encoding="UTF-8") as f:
+                record = json.load(f)
+            path = self._object_path(record["digest"], record["suffix"])
+            if os.path.getsize(path) != record["size"]:
+                return None
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return path, record
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Returns the path of the stored file of `url`, or None if it is not stored."""
+        hit = self._lookup(url)
+        return hit[0] if hit else None
+
+    def _is_valid(self, url: str, record: dict, sha256: Optional[str], refresh: bool) -> bool:
+        if sha256 and not record["digest"].startswith(sha256.lower()):
+            return False
+        if not refresh or not record["etag"]:
+            return True
+        resp = requests.head(url, timeout=HTTP_TIMEOUT, allow_redirects=True)
+        return resp.headers.get("ETag", record["etag"]) == record["etag"]
+
+    def fetch(
+        self,
+        url: str,
+        sha256: Optional[str] = None,
+        refresh: bool = False,
+        progress: bool = True,
+    ) -> str:
+        """
+        Returns the path of the stored file of `url`, which is downloaded if not stored.
+
+        Args:
+            url (str): The url of the file.
+            sha256 (str, optional): The expected sha256 hex digest, or a prefix of it.
+                A stored file which does not match it is downloaded again.
+                Defaults to None.
+            refresh (bool, optional): Whether to check the ETag of the stored file with
+                a HEAD request, and download it again if changed. Defaults to False.
+            progress (bool, optional): Whether to show a progress bar. Defaults to True.
+
+        Returns:
+            str: The path of the stored file.
+        """
+        hit = self._lookup(url)
+        if hit and self._is_valid(url, hit[1], sha256, refresh):
+            return hit[0]
+        record_path = self._record_path(url)
+        os.makedirs(os.path.dirname(record_path), exist_ok=True)
+        with FileLock(record_path + ".lock"):
+            # Another process may have downloaded it while waiting for the lock.
+            hit = self._lookup(url)
+            if hit and not refresh and self._is_valid(url, hit[1], sha256, False):
+                return hit[0]
+            path = self._download(url, sha256, progress)
+        self.evict(keep=path)
+        return path
+
+    def _download(self, url: str, sha256: Optional[str], progress: bool) -> str:
+        record_path = self._record_path(url)
+        suffix = os.path.splitext(os.path.basename(urlparse(url).path))[1]
+        # Keyed by the url, so that an interrupted download is resumed next time.
+        tmp_path = os.path.join(self.root, "tmp", os.path.basename(record_path)[:-5] + suffix)
+        logger.info("Downloading {} to the weight store {}.", url, self.root)
+        digest, etag = _download(url, tmp_path, sha256, CHUNK_SIZE, True, progress)
+        path = self._object_path(digest, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        record = dict(url=url, digest=digest, size=os.path.getsize(path), suffix=suffix, etag=etag)
+        with open(record_path + ".tmp", "w", encoding="UTF-8") as f:
+            json.dump(record, f)
+        os.replace(record_path + ".tmp", record_path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Remove the least recently used files until the total size fits `max_size`."""
+        if self.max_size is None:
+            return
+        with FileLock(os.path.join(self.root, "evict.lock")):
+            files = []
+            for dirpath, _, filenames in os.walk(os.path.join(self.root, "objects")):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    stat = os.stat(path)
+                    files.append((stat.st_mtime_ns, stat.st_size, path))
+            total_size = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total_size <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                logger.debug("Evict {} from the weight store.", path)
+                os.remove(path)
+                total_size -= size
+
+
+weight_store = WeightStore()
 
 
 def _get_repo(
@@ -292,11 +720,11 @@ def _get_repo(
         raise InvalidProtocol(
             "Invalid protocol, the value should be one of {}.".format(", ".join(PROTOCOLS.keys()))
         )
-    cache_dir = os.path.expanduser(os.path.join(workspace.cache_dir, "hub"))
-    with cd(cache_dir):
-        fetcher = PROTOCOLS[protocol]
-        repo_dir = fetcher.fetch(git_host, repo_info, use_cache, commit)
-        return os.path.join(cache_dir, repo_dir)
+    # Fetch with absolute paths instead of changing the working directory, which is
+    # shared by threads.
+    cache_dir = os.path.abspath(os.path.expanduser(os.path.join(workspace.cache_dir, "hub")))
+    fetcher = PROTOCOLS[protocol]
+    return fetcher.fetch(git_host, repo_info, use_cache, commit, cache_dir=cache_dir)
 
 
 def _check_dependencies(module: types.ModuleType) -> None:
@@ -318,6 +746,25 @@ def load_module(name: str, path: str) -> types.ModuleType:
     return module
 
 
+# Loaded hubconf modules keyed by (git_host, repo_info, commit, hubconf_entry, protocol).
+_hub_modules: Dict[Tuple[str, str, Optional[str], str, str], types.ModuleType] = {}
+# Locks of modules being loaded with the number of threads using them, which are dropped
+# once no thread uses them.
+_hub_locks: Dict[Tuple[str, str, Optional[str], str, str], List[Any]] = {}
+_hub_modules_lock = threading.Lock()
+_sys_path_lock = threading.Lock()
+
+
+def clear_module_cache(repo_info: Optional[str] = None) -> None:
+    """
+    Clear loaded hubconf modules of `repo_info`, or of all repos if it is not given,
+    so that they are executed again by the next `load`, `list` or `help`.
+    """
+    with _hub_modules_lock:
+        for key in [k for k in _hub_modules if repo_info is None or k[1] == repo_info]:
+            del _hub_modules[key]
+
+
 def _init_hub(
     repo_info: str,
     git_host: str,
@@ -326,17 +773,44 @@ def _init_hub(
     commit: Optional[str] = None,
     protocol: str = DEFAULT_PROTOCOL,
 ):
-    cache_dir = os.path.expanduser(os.path.join(workspace.cache_dir, "hub"))
-    os.makedirs(cache_dir, exist_ok=True)
-    absolute_repo_dir = _get_repo(
-        git_host, repo_info, use_cache=use_cache, commit=commit, protocol=protocol
-    )
-    sys.path.insert(0, absolute_repo_dir)
-    hubmodule = load_module(
-        ".".join(hubconf_entry.split(os.sep)), os.path.join(absolute_repo_dir, hubconf_entry)
-    )
-    sys.path.remove(absolute_repo_dir)
-
+    """
+    Fetch the repo and load its hubconf module. Loaded modules are cached in the process
+    if `use_cache` is True, see `clear_module_cache`.
+    """
+    key = (git_host, repo_info, commit, hubconf_entry, protocol)
+    with _hub_modules_lock:
+        if use_cache and key in _hub_modules:
+            return _hub_modules[key]
+        entry = _hub_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            # Loaded by another thread while waiting for the lock.
+            if use_cache and key in _hub_modules:
+                return _hub_modules[key]
+            cache_dir = os.path.expanduser(os.path.join(workspace.cache_dir, "hub"))
+            os.makedirs(cache_dir, exist_ok=True)
+            absolute_repo_dir = _get_repo(
+                git_host, repo_info, use_cache=use_cache, commit=commit, protocol=protocol
+            )
+            # Imports of hubconf modules are resolved against the temporarily modified
+            # `sys.path`, which is shared by threads.
+            with _sys_path_lock:
+                sys.path.insert(0, absolute_repo_dir)
+                try:
+                    hubmodule = load_module(
+                        ".".join(hubconf_entry.split(os.sep)),
+                        os.path.join(absolute_repo_dir, hubconf_entry),
+                    )
+                finally:
+                    sys.path.remove(absolute_repo_dir)
+            with _hub_modules_lock:
+                _hub_modules[key] = hubmodule
+    finally:
+        with _hub_modules_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _hub_locks[key]
     return hubmodule
 
 
@@ -398,25 +872,19 @@ def help(
 
 
 class pretrained:  # noqa pylint: disable=redefined-outer-name
-    def __init__(self, url, load_func):
+    def __init__(self, url, load_func, sha256=None, store=None):
         self.url = url
         self.load_func = load_func
+        self.sha256 = sha256
+        self.store = store
 
     def __call__(self, func):
         @functools.wraps(func)
         def pretrained_model_func(pretrained=False, **kwargs):
             model = func(**kwargs)
             if pretrained:
-                parts = urlparse(self.url)
-                filename = os.path.basename(parts.path)
-
-                sha256 = hashlib.sha256()
-                sha256.update(self.url.encode())
-                digest = sha256.hexdigest()[:6]
-                filename = digest + "_" + filename
-
-                cached_file = os.path.join(workspace.cache_dir, filename)
-                download_from_url(self.url, cached_file)
+                store = self.store or weight_store
+                cached_file = store.fetch(self.url, self.sha256)
                 self.load_func(cached_file, model)
             return model
 
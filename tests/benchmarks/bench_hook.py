@@ -0,0 +1,80 @@
+"""
+Measure 1M calls of a `HookManager` stage with 32 hooks of different `__CallInter__`,
+comparing the schedule of `HookManager` with checking every hook on every call, and the
+cost of `HookManager.enable_profiling`.
+
+Run it in the `tests` folder after `python init.py`:
+
+    python benchmarks/bench_hook.py
+"""
+
+import time
+
+from excore._misc import _create_table
+from excore.engine.hook import HookManager
+
+N = 1_000_000
+INTERVALS = {
+    "dense": [1, 1, 10, 10, 100, 100, 1000, 1000] * 4,
+    "sparse": [1, 1] + [100, 1000, 10000] * 10,
+}
+
+
+class TrainHookManager(HookManager):
+    stages = ("iter",)
+
+
+class CheckEveryHookManager(TrainHookManager):
+    def __call__(self, stage, *inps):
+        # The dispatch before the schedule was introduced.
+        dead_hook_idx = []
+        calls = self.calls[stage]
+        for idx, hook in enumerate(self.hooks[stage]):
+            if calls % hook.__CallInter__ == 0:
+                res = hook(*inps)
+                if res and self.check_life_span(hook):
+                    dead_hook_idx.append(idx - len(dead_hook_idx))
+        for idx in dead_hook_idx:
+            self.hooks[stage].pop(idx)
+        self.calls[stage] = calls + 1
+
+
+class CountHook:
+    __HookType__ = "iter"
+    __LifeSpan__ = float("inf")
+
+    def __init__(self, inter):
+        self.__CallInter__ = inter
+        self.count = 0
+
+    def __call__(self, *inps):
+        self.count += 1
+
+
+def main():
+    rows = []
+    for case, intervals in INTERVALS.items():
+        counts = []
+        for name, manager_cls, profiling in [
+            ("check every hook", CheckEveryHookManager, False),
+            ("schedule", TrainHookManager, False),
+            ("schedule with profiling", TrainHookManager, True),
+        ]:
+            hooks = [CountHook(inter) for inter in intervals]
+            manager = manager_cls(hooks)
+            if profiling:
+                manager.enable_profiling()
+            start = time.perf_counter()
+            for _ in range(N):
+                manager("iter")
+            cost = time.perf_counter() - start
+            counts.append([h.count for h in hooks])
+            rows.append((case, name, f"{cost:.3f}", f"{cost * 1e9 / N:.0f}"))
+        assert counts[0] == counts[1] == counts[2]
+    for case, intervals in INTERVALS.items():
+        print(f"{case}: {intervals.count(1)} of {len(intervals)} hooks are called every time")
+    print(_create_table(["hooks", "method", f"time of {N} calls(s)", "ns/call"], rows))
+
+
+if __name__ == "__main__":
+    main()
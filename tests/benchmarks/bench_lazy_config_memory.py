@@ -0,0 +1,59 @@
+"""
+Measure time and peak memory of `LazyConfig.__init__` on a config with large arrays,
+compared with deep-copying the config twice as it used to.
+
+Run it in the `tests` folder after `python init.py`:
+
+    python benchmarks/bench_lazy_config_memory.py
+"""
+
+import time
+import tracemalloc
+from copy import deepcopy
+
+from excore import logger
+from excore._misc import _create_table
+from excore.config.lazy_config import LazyConfig
+from excore.config.parse import ConfigDict
+
+N = 100_000
+
+
+def _make_config():
+    ConfigDict.set_primary_fields(["Model"], {})
+    cfg = ConfigDict()
+    model = ConfigDict()
+    model["Classifier"] = {
+        "classes": [f"class_{i}" for i in range(N)],
+        "weights": [float(i) for i in range(N)],
+    }
+    cfg["Model"] = model
+    cfg["FinegrainedArgs"] = {"args": [[i, i + 1] for i in range(N)]}
+    return cfg
+
+
+def _deepcopy_twice(cfg):
+    return deepcopy(cfg), deepcopy(cfg)
+
+
+def _measure(func, cfg):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(cfg)
+    cost = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cost, peak / 2**20
+
+
+def main():
+    logger.remove()
+    rows = []
+    for name, func in [("deepcopy twice", _deepcopy_twice), ("LazyConfig", LazyConfig)]:
+        cost, peak = _measure(func, _make_config())
+        rows.append((name, f"{cost * 1000:.2f}", f"{peak:.2f}"))
+    print(_create_table(["method", "time(ms)", "peak memory(MiB)"], rows))
+
+
+if __name__ == "__main__":
+    main()
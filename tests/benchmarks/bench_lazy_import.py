@@ -0,0 +1,80 @@
+"""
+Count the modules imported by `config.load` for every config in `configs/launch`.
+
+`lazy` is the number of modules imported while loading and parsing a config. `eager` is
+the number after importing every target referenced by the parsed config, which is what
+loading costed when nodes imported their targets as soon as they were created.
+
+Run it in the `tests` folder after `python init.py`:
+
+    python benchmarks/bench_lazy_import.py
+"""
+
+import glob
+import json
+import os
+import subprocess
+import sys
+
+
+def _resolve_all(obj, seen):
+    from excore.config.models import ConfigArgumentHook, ModuleNode
+
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    if isinstance(obj, ModuleNode):
+        obj._resolve_target()
+    if isinstance(obj, ConfigArgumentHook):
+        _resolve_all(obj.node, seen)
+    if isinstance(obj, dict):
+        for v in obj.values():
+            _resolve_all(v, seen)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            _resolve_all(v, seen)
+
+
+def _single(path):
+    import excore
+    from excore import config
+
+    excore.logger.remove()
+    before = len(sys.modules)
+    try:
+        cfg = config.load(path)
+    except BaseException as e:
+        print(json.dumps({"error": type(e).__name__}))
+        return
+    lazy = len(sys.modules) - before
+    _resolve_all(cfg._config, set())
+    eager = len(sys.modules) - before
+    print(json.dumps({"lazy": lazy, "eager": eager}))
+
+
+def main():
+    from excore._misc import _create_table
+
+    rows = []
+    total_lazy = total_eager = 0
+    env = dict(os.environ, EXCORE_MANUAL_SET="0")
+    for path in sorted(glob.glob("./configs/launch/*.toml")):
+        out = subprocess.run(
+            [sys.executable, __file__, path], capture_output=True, text=True, env=env
+        ).stdout.strip()
+        res = json.loads(out.splitlines()[-1])
+        if "error" in res:
+            rows.append((os.path.basename(path), "-", "-", res["error"]))
+            continue
+        total_lazy += res["lazy"]
+        total_eager += res["eager"]
+        rows.append((os.path.basename(path), res["lazy"], res["eager"], ""))
+    rows.append(("total", total_lazy, total_eager, ""))
+    print(_create_table(["config", "lazy", "eager", "error"], rows))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        _single(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,64 @@
+"""
+Measure the overhead of calling 10k `ModuleNode`s compared with calling their targets
+directly, inside and outside of a `BuildContext`. Validation and build messages are
+disabled to only measure the call path of nodes.
+
+Run it in the `tests` folder after `python init.py`:
+
+    python benchmarks/bench_node_call.py
+"""
+
+import time
+
+from excore import logger, workspace
+from excore._misc import _create_table
+from excore.config.models import BuildContext, ModuleNode
+
+N = 10_000
+REPEAT = 10
+
+
+class Dummy:
+    def __init__(self, a, b=None):
+        self.a = a
+        self.b = b
+
+
+def _direct(nodes):
+    for node in nodes:
+        node.target(**node)
+
+
+def _call(nodes):
+    for node in nodes:
+        node()
+
+
+def _call_in_context(nodes):
+    with BuildContext():
+        for node in nodes:
+            node()
+
+
+def main():
+    logger.remove()
+    workspace.excore_validate = False
+    workspace.excore_log_build_message = False
+    nodes = [ModuleNode(Dummy).add(a=i, b=str(i)) for i in range(N)]
+    rows = []
+    for name, func in [
+        ("target()", _direct),
+        ("node()", _call),
+        ("node() in BuildContext", _call_in_context),
+    ]:
+        costs = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            func(nodes)
+            costs.append(time.perf_counter() - start)
+        rows.append((name, f"{min(costs) * 1000:.2f}", f"{min(costs) * 1e9 / N:.0f}"))
+    print(_create_table(["method", f"time of {N} calls(ms)", "ns/call"], rows))
+
+
+if __name__ == "__main__":
+    main()
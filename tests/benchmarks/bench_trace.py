@@ -0,0 +1,53 @@
+"""
+Measure the cost of debug tracing when excore debug is disabled, comparing `logger.ex`
+with an eagerly formatted message against `trace` with structured fields, and the time
+of parsing a config.
+
+Run it in the `tests` folder after `python init.py`:
+
+    python benchmarks/bench_trace.py
+"""
+
+import time
+
+from excore import config, logger
+from excore._misc import _create_table
+from excore.engine.logging import trace
+
+N = 100_000
+CONFIG = "./configs/launch/test_reused_intern.toml"
+
+
+def _logger_ex(node, name):
+    for _ in range(N):
+        logger.ex(f"\t\t\tOriginal_type is `{node}`, target_type is `{name}`.")
+
+
+def _trace(node, name):
+    for _ in range(N):
+        trace("parse.convert_node", ori_type=node, target_type=name)
+
+
+def _parse():
+    cfg = config.load(CONFIG, parse_config=False)
+    start = time.perf_counter()
+    cfg.parse()
+    return time.perf_counter() - start
+
+
+def main():
+    logger.remove()
+    cfg = config.load(CONFIG)
+    node = cfg._config["Model"]
+    rows = []
+    for name, func in [("logger.ex", _logger_ex), ("trace", _trace)]:
+        start = time.perf_counter()
+        func(node, name)
+        cost = time.perf_counter() - start
+        rows.append((name, f"{cost * 1e9 / N:.0f}"))
+    print(_create_table(["method", "ns/call"], rows))
+    print(f"Parsing `{CONFIG}` costs {min(_parse() for _ in range(10)) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
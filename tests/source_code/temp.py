@@ -0,0 +1,521 @@
+from excore import Registry
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
+MODEL = Registry('Model')
+DATA = Registry('Data')
+BACKBONE = Registry('Backbone')
+HEAD = Registry('Head')
+HOOK = Registry('Hook')
+LOSS = Registry('Loss')
+LRSCHE = Registry('LRSche')
+OPTIMIZER = Registry('Optimizer')
+TRANSFORM = Registry('Transform')
+MODULE = Registry('module')
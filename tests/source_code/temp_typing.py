@@ -0,0 +1,19 @@
+from typing import Union, Any
+from excore.config.models import ModuleNode, ModuleWrapper
+
+class TypedWrapper:
+    Loss: Union[ModuleNode, ModuleWrapper]
+    LRSche: Union[ModuleNode, ModuleWrapper]
+    Backbone: Union[ModuleNode, ModuleWrapper]
+    DataModule: Union[ModuleNode, ModuleWrapper]
+    Optimizer: Union[ModuleNode, ModuleWrapper]
+    TestData: Union[ModuleNode, ModuleWrapper]
+    Model: Union[ModuleNode, ModuleWrapper]
+    TrainData: Union[ModuleNode, ModuleWrapper]
+
+class Info:
+    learning_rate: Any
+    test1: Any
+    test2: Any
+    test3: Any
+    test4: Any
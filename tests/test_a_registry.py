@@ -21,6 +21,30 @@ def test_find():
     assert tar.split(".")[-1] == "ResNet"
 
 
+def _dummy():
+    pass
+
+
+def test_find_after_register():
+    Registry.unlock_register()
+    assert Registry.find("_dummy") == (None, None)
+    S.HEAD.register_module(_dummy)
+    assert Registry.find("_dummy") == (f"{__name__}._dummy", "Head")
+    del S.HEAD["_dummy"]
+    assert Registry.find("_dummy") == (None, None)
+    Registry.lock_register()
+
+
+def test_record_registered():
+    Registry.unlock_register()
+    with Registry._registry_pool.record() as recorded:
+        S.HEAD.register_module(_dummy)
+        Registry._registry_pool["Model"] = S.MODEL
+    del S.HEAD["_dummy"]
+    Registry.lock_register()
+    assert list(recorded) == [("Head", "_dummy")]
+
+
 def test_register_module():
     Registry.unlock_register()
     reg = Registry("__test")
@@ -1,13 +1,15 @@
 import builtins
 import os
 import random
+import threading
+import time
 from copy import deepcopy
 
 import pytest
 import torch
 from torchvision.models import ResNet
 
-from excore import config, workspace
+from excore import Registry, config, workspace
 from excore._exceptions import (
     CoreConfigParseError,
     CoreConfigSupportError,
@@ -15,9 +17,11 @@ from excore._exceptions import (
     ModuleBuildError,
     ModuleValidateError,
 )
+from excore._misc import CacheOut
 from excore.config import models
 from excore.config.models import ModuleNode, ReusedNode
 from excore.engine import logger
+from excore.engine.hook import ConfigHookManager
 
 
 def shuffle_fields():
@@ -145,7 +149,7 @@ class TestConfig:
 
     def test_no_call_with_reused_node(self):
         modules, _ = self._load("./configs/launch/test_no_call_reused.toml", False)
-        assert not models.IS_PARSING
+        assert models.BuildContext.current() is None
         from source_code.models.nets import TestClass
 
         assert isinstance(modules.Backbone.x, ReusedNode)
@@ -284,3 +288,333 @@ class TestConfig:
         assert backbone[4].num_features == backbone[3].out_channels
         assert backbone[4].num_features == backbone[5].in_channels
         assert backbone[6].out_channels == backbone[7].num_features
+
+    def test_finegrained_batch_build(self, monkeypatch):
+        from excore.plugins.finegrained_config import enable_finegrained_config
+
+        enable_finegrained_config(force=True)
+        numbers = []
+
+        def batch_build(cls, n, **kwargs):
+            numbers.append(n)
+            return [cls(**kwargs) for _ in range(n)]
+
+        monkeypatch.setattr(
+            torch.nn.Conv2d, "__excore_batch_build__", classmethod(batch_build), raising=False
+        )
+        cfg = config.load("./configs/launch/test_finegrained.toml")
+        hook = cfg.Backbone.MockModel["block"]
+        blocks = [hook(), hook()]
+        assert numbers == [1, 3, 2] * 2
+        assert len(blocks[0]) == len(blocks[1]) == 8
+        assert blocks[0][0] is not blocks[1][0]
+
+    def test_original_config(self):
+        from excore.plugins.finegrained_config import enable_finegrained_config
+
+        enable_finegrained_config(force=True)
+        path = "./configs/launch/test_finegrained.toml"
+        cfg = config.load(path)
+        modules, _ = config.build_all(cfg)
+        assert len(modules.Backbone.block) == 8
+        assert cfg.config == config.load_config(path)
+
+    def test_config_snapshot(self):
+        from excore.config.lazy_config import LazyConfig
+
+        raw = config.load_config("./configs/launch/test_reused_intern.toml")
+        cfg = LazyConfig(raw)
+        expected = deepcopy(dict(cfg.config))
+        next(v for v in raw.values() if isinstance(v, dict))["__mutated__"] = 1
+        raw["__mutated__"] = 1
+        assert dict(cfg.config) == expected
+
+
+def test_diamond_base(tmp_path, monkeypatch):
+    from excore.config.config import _load_config
+
+    (tmp_path / "root.toml").write_text("[Model.ResNet]\nlayers = 50\n")
+    (tmp_path / "a.toml").write_text('__base__ = ["root.toml"]\n[Model.ResNet]\nnum_classes = 10\n')
+    (tmp_path / "b.toml").write_text('__base__ = ["root.toml"]\n[Model.ResNet]\nlayers = 101\n')
+    (tmp_path / "top.toml").write_text('__base__ = ["a.toml", "b.toml"]\n')
+    from excore.config import config as config_module
+
+    loaded = []
+    ori_read = config_module.read_config_file
+
+    def _read(f):
+        loaded.append(os.path.basename(f))
+        return ori_read(f)
+
+    monkeypatch.setattr(config_module, "read_config_file", _read)
+    memo = {}
+    cfg = _load_config(str(tmp_path / "top.toml"), "__base__", [], memo)
+    assert sorted(loaded) == ["a.toml", "b.toml", "root.toml", "top.toml"]
+    assert cfg == {"Model": {"ResNet": {"layers": 101, "num_classes": 10}}}
+    assert memo[str(tmp_path / "root.toml")] == {"Model": {"ResNet": {"layers": 50}}}
+
+
+class AppendLayer:
+    def __init__(self, layers, sizes):
+        layers.append(len(layers))
+        sizes["last"] = layers[-1]
+        self.layers, self.sizes = layers, sizes
+
+
+@pytest.fixture
+def register_model(monkeypatch):
+    """Register targets to the `Model` registry, which are kept by `config.load`."""
+    from excore.config import config as config_module
+    from excore.engine.registry import load_registries
+
+    load_registries()
+    monkeypatch.setattr(config_module, "load_registries", lambda: None)
+    monkeypatch.setattr(Registry, "_globals", None)
+    reg = Registry.get_registry("Model")
+    names = []
+
+    def register(*targets):
+        Registry.unlock_register()
+        for target in targets:
+            reg.register_module(target)
+            names.append(target.__name__)
+
+    yield register
+    for name in names:
+        del reg[name]
+    Registry.lock_register()
+
+
+def test_mutated_params(tmp_path, register_model):
+    register_model(AppendLayer)
+    path = tmp_path / "mutated.toml"
+    path.write_text("[Model.AppendLayer]\nlayers = [0]\nsizes = {first = 0}\n")
+    cfg = config.load(str(path))
+    for max_workers in [0, 0, 2, 2]:
+        modules, _ = config.build_all(cfg, max_workers=max_workers)
+        assert modules.Model.layers == [0, 1]
+        assert modules.Model.sizes == dict(first=0, last=1)
+    assert cfg.config["Model"]["AppendLayer"] == dict(layers=[0], sizes=dict(first=0))
+
+
+def test_module_index_conflict():
+    cfg = config.load("./configs/launch/test_param_conflict_error.toml", parse_config=False)
+    with pytest.raises(CoreConfigParseError, match="conflicts with field"):
+        cfg.parse()
+
+
+def test_module_index_during_parse():
+    cfg = config.load("./configs/launch/test_nest.toml")
+    c = cfg._config
+    assert c.module_index is not None
+    # Nodes set after the index is built are only found once they are indexed.
+    node = ModuleNode(torch.nn.Identity)
+    c["Backbone"]["Identity"] = node
+    assert not c._contain_module("Identity")
+    c._index_module("Backbone", "Identity", node)
+    assert c._contain_module("Identity") and c.current_field == "Backbone"
+    # Entries of replaced nodes are skipped.
+    c["Backbone"]["Identity"] = ModuleNode(torch.nn.ReLU)
+    assert not c._contain_module("Identity")
+    c["Backbone"]["Identity"] = node
+    c["Model"]["Identity"] = node
+    c._index_module("Model", "Identity", node)
+    with pytest.raises(CoreConfigParseError, match="conflicts with field"):
+        c._contain_module("Identity")
+    # Entries of popped fields are skipped.
+    c.pop("Model")
+    assert c._contain_module("Identity") and c.current_field == "Backbone"
+
+
+def test_circular_base(tmp_path):
+    (tmp_path / "a.toml").write_text('__base__ = ["b.toml"]\n')
+    (tmp_path / "b.toml").write_text('__base__ = ["a.toml"]\n')
+    with pytest.raises(CoreConfigParseError, match="Circular"):
+        config.load_config(str(tmp_path / "a.toml"))
+
+
+def test_build_plan(tmp_path):
+    plan_path = str(tmp_path / "plan.pkl")
+    config.load("./configs/launch/test_reused_intern.toml").save_plan(plan_path)
+    cfg = config.load_plan(plan_path)
+    modules, info = config.build_all(cfg)
+    TestConfig().check_info(info)
+    assert id(modules.Model.FCN.backbone) == id(modules.Model.DeepLabV3.backbone)
+    assert id(modules.Backbone) == id(modules.Model.FCN.backbone)
+    assert id(modules.Model.FCN.classifier) != id(modules.Model.DeepLabV3.classifier)
+
+    config.load("./configs/launch/test_no_call_reused.toml").save_plan(plan_path)
+    modules, _ = config.build_all(config.load_plan(plan_path))
+    assert isinstance(modules.Backbone.x, ReusedNode)
+    assert id(modules.Backbone.x) == id(modules.Model)
+
+
+def test_build_plan_hook(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "excore_manual_set", False)
+    plan_path = str(tmp_path / "plan.pkl")
+    config.load("./configs/launch/test_optim_hook.toml").save_plan(plan_path)
+    modules, _ = config.build_all(config.load_plan(plan_path))
+    params = modules.Optimizer.param_groups[0]["params"]
+    assert any(p is next(modules.Model.parameters()) for p in params)
+
+
+class _StageRecorder:
+    __LifeSpan__ = 100
+    __CallInter__ = 1
+
+    def __init__(self, stage, calls):
+        self.__HookType__ = stage
+        self.calls = calls
+
+    def __call__(self, cfg, module_dict, isolated_dict):
+        self.calls.append((self.__HookType__, list(module_dict.keys())))
+
+
+def test_concurrent_build():
+    path = "./configs/launch/test_reused_intern.toml"
+    orders = []
+    for max_workers in [0, 4]:
+        cfg = config.load(path)
+        calls = []
+        stages = ["pre_build", "every_build", "after_build"]
+        cfg.hooks = ConfigHookManager([_StageRecorder(s, calls) for s in stages])
+        modules, info = config.build_all(cfg, max_workers=max_workers)
+        TestConfig().check_info(info)
+        assert id(modules.Model.FCN.backbone) == id(modules.Model.DeepLabV3.backbone)
+        assert id(modules.Backbone) == id(modules.Model.FCN.backbone)
+        assert id(modules.Model.FCN.classifier) != id(modules.Model.DeepLabV3.classifier)
+        orders.append(calls)
+    assert orders[0] == orders[1]
+
+
+_barrier = threading.Barrier(2, timeout=5)
+
+
+class WaitA:
+    def __init__(self):
+        _barrier.wait()
+
+
+class WaitB(WaitA):
+    pass
+
+
+def test_concurrent_build_overlap(tmp_path, register_model):
+    register_model(WaitA, WaitB)
+    path = tmp_path / "overlap.toml"
+    path.write_text("[Model.WaitA]\n[Model.WaitB]\n")
+    # Both nodes wait for each other, so they are only built if they overlap.
+    modules, _ = config.build_all(config.load(str(path)), max_workers=2)
+    assert isinstance(modules.Model.WaitA, WaitA) and isinstance(modules.Model.WaitB, WaitB)
+
+
+class _SetNumClasses:
+    __HookType__ = "pre_build"
+    __LifeSpan__ = 1
+    __CallInter__ = 1
+
+    def __call__(self, cfg, module_dict, isolated_dict):
+        cfg.Backbone["resnet18"]["num_classes"] = 7
+
+
+def test_pre_build_hook_with_plan():
+    import asyncio
+
+    path = "./configs/launch/test_reused_intern.toml"
+    for max_workers in [0, 4]:
+        cfg = config.load(path)
+        cfg.hooks = ConfigHookManager([_SetNumClasses()])
+        modules, _ = config.build_all(cfg, max_workers=max_workers)
+        assert modules.Backbone.fc.out_features == 7
+    cfg = config.load(path)
+    cfg.hooks = ConfigHookManager([_SetNumClasses()])
+    modules, _ = asyncio.run(cfg.abuild_all())
+    assert modules.Backbone.fc.out_features == 7
+
+
+def test_reused_node_single_construction(monkeypatch):
+    monkeypatch.setattr(workspace, "excore_validate", False)
+    built = []
+
+    class Slow:
+        def __init__(self):
+            built.append(self)
+            time.sleep(0.05)
+
+    node = ReusedNode(Slow)
+    outs = []
+    threads = [threading.Thread(target=lambda: outs.append(node())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 1
+    assert all(o is built[0] for o in outs)
+
+    class Broken:
+        def __init__(self):
+            raise RuntimeError
+
+    with pytest.raises(ModuleBuildError):
+        ReusedNode(Broken)()
+    assert not CacheOut._locks
+
+
+def test_async_build():
+    import asyncio
+
+    modules, info = asyncio.run(config.abuild_all(config.load("./configs/launch/test_lrsche.toml")))
+    assert id(modules.LRSche.optimizer) == id(modules.Optimizer)
+
+    cfg = config.load("./configs/launch/test_reused_intern.toml")
+    modules, info = asyncio.run(cfg.abuild_all())
+    TestConfig().check_info(info)
+    assert id(modules.Model.FCN.backbone) == id(modules.Model.DeepLabV3.backbone)
+    assert id(modules.Backbone) == id(modules.Model.FCN.backbone)
+    assert id(modules.Model.FCN.classifier) != id(modules.Model.DeepLabV3.classifier)
+
+
+def test_async_build_targets():
+    import asyncio
+
+    from excore.config._build_plan import BuildPlan, _Ref, _Step
+
+    async def load_index(delay):
+        await asyncio.sleep(delay)
+        return delay
+
+    def load_weights(delay):
+        time.sleep(delay)
+        return delay
+
+    steps = [
+        _Step("call", load_index, {"delay": 0.2}, False, False),
+        _Step("call", load_weights, {"delay": 0.2}, False, False),
+        _Step("call", dict, {"index": _Ref(0), "weights": _Ref(1)}, False, False),
+    ]
+    plan = BuildPlan(steps, {"Model": (3, _Ref(2))}, ["Model"], {}, {})
+    start = time.perf_counter()
+    out = asyncio.run(plan.async_executor()("Model"))
+    assert out == {"index": 0.2, "weights": 0.2}
+    assert time.perf_counter() - start < 0.35
+
+
+def test_build_profiler(tmp_path):
+    import json
+
+    # Tracing memory of torch is too slow for tests.
+    with config.BuildProfiler(trace_memory=False) as profiler:
+        cfg = config.load("./configs/launch/test_reused_intern.toml")
+        modules, _ = config.build_all(cfg)
+    assert config.profiler.current_profiler() is None
+    rows = {(category, name): row for category, name, *row in profiler.summary()}
+    calls, wall, self_time, peak, hits = rows["ReusedNode", "resnet18"]
+    assert calls == 1 and hits >= 2
+    assert wall >= self_time >= 0 and peak >= 0
+    assert ("parse", "ConfigDict._parse_inter_modules") in rows
+    assert "cache hits" in profiler.table()
+
+    profiler.export_chrome_trace(str(tmp_path / "trace.json"))
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert {e["ph"] for e in events} == {"X", "i"}
@@ -0,0 +1,65 @@
+import os
+
+import toml
+
+from excore import workspace
+from excore.config import _config_cache
+from excore.config.config import _load_config
+from excore.config.parse import ConfigDict
+
+
+def _load(entry):
+    files = []
+    cfg = _load_config(entry, "__base__", files)
+    _config_cache.dump_cached_config(entry, "__base__", None, files, cfg)
+    return cfg
+
+
+def test_config_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "cache_dir", str(tmp_path))
+    base = tmp_path / "base.toml"
+    base.write_text("[Model.ResNet]\nlayers = 50\n")
+    entry = str(tmp_path / "entry.toml")
+    with open(entry, "w") as f:
+        f.write('__base__ = ["base.toml"]\n[Model.ResNet]\nnum_classes = 10\n')
+    cfg = _load(entry)
+    assert _config_cache.load_cached_config(entry, "__base__", {"a": 1}) is None
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("toml.loads should be skipped")
+
+    with monkeypatch.context() as m:
+        m.setattr(toml, "loads", _fail)
+        cached = _config_cache.load_cached_config(entry, "__base__")
+    assert isinstance(cached, ConfigDict)
+    assert isinstance(cached["Model"]["ResNet"], ConfigDict)
+    assert cached == cfg == {"Model": {"ResNet": {"layers": 50, "num_classes": 10}}}
+
+    base.write_text("[Model.ResNet]\nlayers = 101\n")
+    assert _config_cache.load_cached_config(entry, "__base__") is None
+    assert _load(entry)["Model"]["ResNet"]["layers"] == 101
+    assert _config_cache.load_cached_config(entry, "__base__") == {
+        "Model": {"ResNet": {"layers": 101, "num_classes": 10}}
+    }
+    assert len([f for f in os.listdir(tmp_path / "config_cache") if f.endswith(".pkl")]) == 1
+
+
+def test_config_cache_modified_after_parse(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "cache_dir", str(tmp_path))
+    entry = tmp_path / "entry.toml"
+    entry.write_text("[Model.ResNet]\nlayers = 50\n")
+    files = []
+    cfg = _load_config(str(entry), "__base__", files)
+    entry.write_text("[Model.ResNet]\nlayers = 18\n")
+    _config_cache.dump_cached_config(str(entry), "__base__", None, files, cfg)
+    assert _config_cache.load_cached_config(str(entry), "__base__") is None
+
+
+def test_config_cache_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace, "cache_dir", str(tmp_path))
+    monkeypatch.setattr(workspace, "excore_config_cache", False)
+    entry = str(tmp_path / "entry.toml")
+    with open(entry, "w") as f:
+        f.write("[Model.ResNet]\nlayers = 50\n")
+    _load(entry)
+    assert not os.path.exists(os.path.join(tmp_path, "config_cache"))
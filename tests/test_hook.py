@@ -0,0 +1,115 @@
+import random
+import time
+from contextlib import suppress
+
+import pytest
+
+from excore import logger
+from excore._exceptions import HookBuildError
+from excore.engine.hook import HookManager
+
+
+class _Manager(HookManager):
+    stages = ("iter", "epoch")
+
+
+class _Hook:
+    def __init__(self, name, inter, life_span, record, stage="iter"):
+        self.name = name
+        self.__HookType__ = stage
+        self.__CallInter__ = inter
+        self.__LifeSpan__ = life_span
+        self.record = record
+
+    def __call__(self, step):
+        self.record.append((self.name, step))
+        return step % 2 == 0
+
+
+def _reference(hooks, steps):
+    """The straightforward dispatch which the schedule must be equivalent to."""
+    record, life_spans, alive = [], [h.__LifeSpan__ for h in hooks], list(range(len(hooks)))
+    for step in range(steps):
+        for idx in [*alive]:
+            hook = hooks[idx]
+            if step % hook.__CallInter__ == 0:
+                record.append((hook.name, step))
+                if step % 2 == 0:
+                    life_spans[idx] -= 1
+                    if life_spans[idx] <= 0:
+                        alive.remove(idx)
+    return record
+
+
+def test_hook_schedule():
+    rng = random.Random(0)
+    record = []
+    hooks = [_Hook(i, rng.choice([1, 2, 3, 5, 7]), rng.randint(1, 30), record) for i in range(20)]
+    expected = _reference(hooks, 200)
+    manager = _Manager(hooks)
+    for step in range(200):
+        manager.call_hooks("iter", step)
+    assert record == expected
+    assert manager.calls["iter"] == 200
+    assert len(manager.hooks["iter"]) == sum(h.__LifeSpan__ > 0 for h in hooks)
+
+
+def test_hook_schedule_update():
+    record = []
+    manager = _Manager([_Hook("a", 2, 100, record)])
+    manager("iter", 0)
+    manager.hooks["iter"].append(_Hook("b", 3, 100, record))
+    for step in range(1, 7):
+        manager("iter", step)
+    assert record == [("a", 0), ("a", 2), ("b", 3), ("a", 4), ("a", 6), ("b", 6)]
+    manager.hooks["iter"][0].__CallInter__ = 1
+    manager.reschedule("iter")
+    manager("iter", 7)
+    assert record[-1] == ("a", 7)
+    assert not manager.exist("epoch")
+    with pytest.raises(HookBuildError):
+        _Manager([_Hook("c", 0, 1, record)])
+
+
+class _SlowHook:
+    __HookType__ = "epoch"
+    __LifeSpan__ = 100
+    __CallInter__ = 1
+
+    def __call__(self, delay):
+        time.sleep(delay)
+        if delay < 0.001:
+            raise ValueError(delay)
+
+
+def test_hook_profiling():
+    record = []
+    manager = _Manager([_Hook("fast", 1, 100, record), _SlowHook()])
+    manager("iter", 1)
+    assert manager.stats() == []
+    manager.enable_profiling(budget=0.01)
+    messages = []
+    handler = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        for step in range(1, 4):
+            manager("iter", step)
+        for delay in (0.02, 0.03, 0.0):
+            with suppress(ValueError):
+                manager("epoch", delay)
+    finally:
+        logger.remove(handler)
+    slow, fast = manager.stats()
+    assert (slow.stage, slow.name, slow.calls, slow.exceptions, slow.slow) == (
+        "epoch",
+        "_SlowHook",
+        3,
+        1,
+        2,
+    )
+    assert slow.max >= 30 and slow.p50 >= 20 and slow.total >= 50
+    assert (fast.stage, fast.calls, fast.exceptions, fast.slow) == ("iter", 3, 0, 0)
+    assert len(messages) == 1 and "_SlowHook" in messages[0]
+    assert "_SlowHook" in manager.stats_table()
+    manager.disable_profiling()
+    manager("iter", 5)
+    assert manager.stats() == []
@@ -1,5 +1,15 @@
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from zipfile import ZipFile
+
 import pytest
 
+from excore._exceptions import ChecksumError, GitCheckoutError, GitPullError
 from excore.plugins import hub
 
 
@@ -14,3 +24,293 @@ def test_hub_load():
         hub.import_module(
             "zhanghang1989/ResNeSt", git_host="github.com", hubconf_entry="hubconf.py"
         )
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    content = bytes(range(256)) * 4096
+    requests = []
+
+    def do_GET(self):
+        _RangeHandler.requests.append(self.headers.get("Range"))
+        if self.path.split("?")[0] != "/weights.pth":
+            body = self.path.encode() * 1000
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        start = 0
+        if self.headers.get("Range"):
+            start = int(self.headers["Range"][len("bytes=") : -1])
+            if start >= len(self.content):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(self.content)}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(self.content) - 1}/*")
+        else:
+            self.send_response(200)
+        body = self.content[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def file_server():
+    server = HTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _RangeHandler.requests = []
+    yield f"http://127.0.0.1:{server.server_port}/weights.pth"
+    server.shutdown()
+    server.server_close()
+
+
+def test_resume_download(file_server, tmp_path):
+    content = _RangeHandler.content
+    sha256 = hashlib.sha256(content).hexdigest()
+    dst = str(tmp_path / "weights.pth")
+    with open(dst + hub.PARTIAL_SUFFIX, "wb") as f:
+        f.write(content[:1000])
+    assert hub.download_from_url(file_server, dst, sha256, progress=False) == dst
+    assert _RangeHandler.requests == ["bytes=1000-"]
+    with open(dst, "rb") as f:
+        assert f.read() == content
+    assert not os.path.exists(dst + hub.PARTIAL_SUFFIX)
+
+    with open(dst + hub.PARTIAL_SUFFIX, "wb") as f:
+        f.write(content)
+    hub.download_from_url(file_server, dst, sha256[:8], progress=False)
+    assert _RangeHandler.requests[-1] == f"bytes={len(content)}-"
+
+    with pytest.raises(ChecksumError):
+        hub.download_from_url(file_server, dst, "0" * 64, progress=False)
+    assert not os.path.exists(dst + hub.PARTIAL_SUFFIX)
+
+
+def test_weight_store(file_server, tmp_path):
+    store = hub.WeightStore(str(tmp_path / "store"))
+    path = store.fetch(file_server, progress=False)
+    assert store.fetch(file_server, progress=False) == path
+    assert store.lookup(file_server) == path
+    assert _RangeHandler.requests == [None]
+    with open(path, "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == os.path.basename(path)[:-4]
+
+    # The same content of different urls is stored once.
+    copy_store = hub.WeightStore(str(tmp_path / "store"))
+    assert copy_store.fetch(file_server + "?mirror", progress=False) == path
+
+    store.max_size = os.path.getsize(path)
+    other = store.fetch(file_server.replace("weights", "other"), progress=False)
+    assert os.path.exists(other)
+    assert store.lookup(file_server) is None
+
+
+def _git(*args, cwd=None):
+    cmd = ["git", "-c", "user.name=excore", "-c", "user.email=excore@test", *args]
+    return subprocess.run(cmd, cwd=cwd, check=True, capture_output=True).stdout.decode().strip()
+
+
+def _make_bare_repo(path, name):
+    work = os.path.join(path, name + "_work")
+    _git("init", "-q", "-b", "master", work)
+    commits = []
+    for i in range(2):
+        with open(os.path.join(work, "hubconf.py"), "w") as f:
+            f.write(f"VERSION = {i}\n")
+        _git("add", "hubconf.py", cwd=work)
+        _git("commit", "-q", "-m", f"v{i}", cwd=work)
+        commits.append(_git("rev-parse", "HEAD", cwd=work))
+    _git("clone", "-q", "--bare", work, os.path.join(path, name + ".git"))
+    return commits
+
+
+def test_git_mirror_fetch(tmp_path, monkeypatch):
+    remotes = str(tmp_path / "remotes")
+    commits = {name: _make_bare_repo(remotes, name) for name in ("a", "b")}
+    monkeypatch.setattr(
+        hub.GitSSHFetcher,
+        "_git_url",
+        classmethod(lambda cls, host, owner, name: f"file://{remotes}/{name}.git"),
+    )
+    cache_dir = str(tmp_path / "hub")
+
+    def fetch(name, commit=None):
+        repo_dir = hub.GitSSHFetcher.fetch(
+            "example.com", f"owner/{name}", commit=commit, cache_dir=cache_dir
+        )
+        with open(os.path.join(repo_dir, "hubconf.py")) as f:
+            return f.read()
+
+    with ThreadPoolExecutor(2) as pool:
+        assert [*pool.map(fetch, ["a", "b"])] == ["VERSION = 1\n"] * 2
+    assert fetch("a", commits["a"][0]) == "VERSION = 0\n"
+    assert len(os.listdir(os.path.join(cache_dir, "mirrors"))) == 4  # 2 mirrors and locks
+    with pytest.raises(GitCheckoutError):
+        fetch("a", "0" * 40)
+
+
+def test_git_mirror_fallback(tmp_path, monkeypatch):
+    remotes = str(tmp_path / "remotes")
+    _make_bare_repo(remotes, "a")
+    monkeypatch.setattr(
+        hub.GitSSHFetcher,
+        "_git_url",
+        classmethod(lambda cls, host, owner, name: f"file://{remotes}/{name}.git"),
+    )
+    calls, refuse = [], {"shallow": True, "export": False}
+    ori_git, ori_export = hub.GitSSHFetcher._git, hub.GitSSHFetcher._export
+
+    def _git(git_dir, silent, *args):
+        calls.append(args)
+        if refuse["shallow"] and "--depth=1" in args:
+            raise GitPullError("shallow fetch is not supported")
+        return ori_git(git_dir, silent, *args)
+
+    def _export(mirror_dir, sha, repo_dir):
+        if refuse["export"] and not any("--unshallow" in c for c in calls):
+            raise GitPullError("missing objects")
+        return ori_export(mirror_dir, sha, repo_dir)
+
+    def fetch(cache_dir):
+        repo_dir = hub.GitSSHFetcher.fetch("example.com", "owner/a", cache_dir=cache_dir)
+        with open(os.path.join(repo_dir, "hubconf.py")) as f:
+            return f.read()
+
+    monkeypatch.setattr(hub.GitSSHFetcher, "_git", staticmethod(_git))
+    monkeypatch.setattr(hub.GitSSHFetcher, "_export", staticmethod(_export))
+    # A refused shallow fetch falls back to a full fetch.
+    assert fetch(str(tmp_path / "full")) == "VERSION = 1\n"
+    assert not any("--unshallow" in c for c in calls)
+    # Exporting from a shallow mirror is retried after unshallowing it.
+    refuse.update(shallow=False, export=True)
+    assert fetch(str(tmp_path / "shallow")) == "VERSION = 1\n"
+    assert ("fetch", "--unshallow", "origin") in calls
+    # Exporting from a full mirror is not retried.
+    refuse.update(shallow=True)
+    calls.clear()
+    with pytest.raises(GitPullError, match="missing objects"):
+        fetch(str(tmp_path / "full_again"))
+
+
+def test_hub_module_cache(tmp_path, monkeypatch):
+    (tmp_path / "hubconf.py").write_text("def resnet(depth=18):\n    return depth\n")
+    monkeypatch.setattr(hub, "_get_repo", lambda *args, **kwargs: str(tmp_path))
+    loaded = []
+    ori_load_module = hub.load_module
+
+    def load_module(name, path):
+        loaded.append(path)
+        return ori_load_module(name, path)
+
+    monkeypatch.setattr(hub, "load_module", load_module)
+    hub.clear_module_cache()
+    assert hub.load("owner/repo", "resnet", depth=50) == 50
+    assert hub.list("owner/repo") == ["resnet"]
+    assert hub.help("owner/repo", "resnet") is None
+    assert len(loaded) == 1
+    assert hub.load("owner/repo", "resnet", use_cache=False) == 18
+    assert hub.load("owner/repo", "resnet", commit="abc") == 18
+    assert len(loaded) == 3
+    hub.clear_module_cache("owner/repo")
+    assert not hub._hub_locks
+    hub.load("owner/repo", "resnet")
+    assert len(loaded) == 4
+    assert str(tmp_path) not in sys.path
+    hub.clear_module_cache()
+
+
+def test_hub_module_cache_cleared_while_loading(tmp_path, monkeypatch):
+    (tmp_path / "hubconf.py").write_text("def resnet(depth=18):\n    return depth\n")
+    monkeypatch.setattr(hub, "_get_repo", lambda *args, **kwargs: str(tmp_path))
+    loading, release, loaded = threading.Event(), threading.Event(), []
+    ori_load_module = hub.load_module
+
+    def load_module(name, path):
+        loaded.append(path)
+        loading.set()
+        release.wait(5)
+        return ori_load_module(name, path)
+
+    monkeypatch.setattr(hub, "load_module", load_module)
+    hub.clear_module_cache()
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(hub.load, "owner/repo", "resnet")
+        assert loading.wait(5)
+        hub.clear_module_cache("owner/repo")
+        second = pool.submit(hub.load, "owner/repo", "resnet")
+        release.set()
+        assert first.result() == second.result() == 18
+    assert len(loaded) == 1
+    assert not hub._hub_locks
+    hub.clear_module_cache()
+
+
+def test_extract_zip(tmp_path):
+    files = {
+        "hubconf.py": "import models.resnet\nfrom utils import helper\n",
+        "models/__init__.py": "",
+        "models/resnet.py": "from .layers import conv\n",
+        "models/layers.py": "import torch\n",
+        "utils/__init__.py": "",
+        "utils/helper.py": "",
+        "unused.py": "",
+        "docs/big.bin": "0" * 1000,
+    }
+    zip_path = str(tmp_path / "repo.zip")
+    with ZipFile(zip_path, "w") as f:
+        for name, content in files.items():
+            f.writestr(f"repo-master/{name}", content)
+        f.writestr("repo-master/../evil.py", "")
+
+    def extracted(target):
+        return {
+            os.path.relpath(os.path.join(root, name), target).replace(os.sep, "/")
+            for root, _, names in os.walk(target)
+            for name in names
+        }
+
+    target = str(tmp_path / "repo")
+    hub.GitHTTPSFetcher._extract_zip(zip_path, target)
+    assert extracted(target) == set(files)
+    hub.GitHTTPSFetcher._extract_zip(zip_path, target, ["hubconf.py"])
+    assert extracted(target) == set(files) - {"unused.py", "docs/big.bin"}
+    assert sorted(os.listdir(tmp_path)) == ["repo", "repo.zip"]
+
+
+@pytest.mark.parametrize("data_filter", [True, False])
+def test_extract_tar(tmp_path, monkeypatch, data_filter):
+    import io
+    import tarfile
+
+    if not data_filter:
+        monkeypatch.delattr(tarfile, "data_filter", raising=False)
+
+    def archive(*members):
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            for name, linkname in members:
+                info = tarfile.TarInfo(name)
+                if linkname is None:
+                    info.size = 2
+                    tar.addfile(info, io.BytesIO(b"ok"))
+                else:
+                    info.type, info.linkname = tarfile.SYMTYPE, linkname
+                    tar.addfile(info)
+        buf.seek(0)
+        return tarfile.open(fileobj=buf, mode="r|")
+
+    target = tmp_path / "repo"
+    with archive(("hubconf.py", None), ("models/link.py", "../hubconf.py")) as tar:
+        hub._extract_tar(tar, str(target))
+    assert (target / "models" / "link.py").read_text() == "ok"
+    for member in [("../evil.py", None), ("evil.py", "../../evil.py")]:
+        with pytest.raises(tarfile.TarError), archive(member) as tar:
+            hub._extract_tar(tar, str(tmp_path / "evil"))
+    assert not (tmp_path / "evil.py").exists()
@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+from excore import Registry
+from excore.engine._registry_cache import (
+    RegistryCacheError,
+    RegistryCacheReader,
+    dump_registry_cache,
+)
+from excore.engine.registry import _RegistryPool
+
+
+def _dump(path):
+    model = Registry("__cache_model", extra_field=["is_backbone"])
+    model.update(ResNet="a.b.ResNet", Head="a.b.Head")
+    model.extra_info.update(ResNet=[True], Head=[None])
+    other = Registry("__cache_other")
+    other.update(ResNet="c.ResNet")
+    dump_registry_cache(path, {"Model": model, "Other": other})
+
+
+def test_registry_cache(tmp_path):
+    path = str(tmp_path / "registry_cache.bin")
+    _dump(path)
+    pool = _RegistryPool()
+    pool.attach(RegistryCacheReader(path))
+    assert list(pool) == ["Model", "Other"]
+    assert pool.lookup("ResNet") == ["Model", "Other"]
+    assert pool.lookup("Head") == ["Model"]
+    assert pool.lookup("VGG") == []
+    assert pool.is_pending("Model") and pool.is_pending("Other")
+
+    model = pool["Model"]
+    assert isinstance(model, Registry)
+    assert dict(model) == dict(ResNet="a.b.ResNet", Head="a.b.Head")
+    assert model.extra_field == ["is_backbone"]
+    assert model.extra_info == dict(ResNet=[True], Head=[None])
+    assert not pool.is_pending("Model") and pool.is_pending("Other")
+    assert pool.get("Other")["ResNet"] == "c.ResNet"
+
+
+def test_ambiguous_names(tmp_path):
+    path = str(tmp_path / "registry_cache.bin")
+    _dump(path)
+    pool = _RegistryPool()
+    pool.attach(RegistryCacheReader(path))
+    assert pool.ambiguous_names() == {"ResNet": ["Model", "Other"]}
+    del pool["Model"]["ResNet"]
+    assert pool.lookup("ResNet") == ["Other"]
+    assert pool.ambiguous_names() == {}
+
+
+def test_outdated_registry_cache(tmp_path):
+    path = tmp_path / "registry_cache.pkl"
+    path.write_bytes(pickle.dumps({"Model": {}}))
+    with pytest.raises(RegistryCacheError):
+        RegistryCacheReader(str(path))
+
+
+def test_corrupted_registry_cache(tmp_path):
+    path = tmp_path / "registry_cache.bin"
+    _dump(str(path))
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    RegistryCacheReader(str(path))
+    with pytest.raises(RegistryCacheError, match="corrupted"):
+        RegistryCacheReader(str(path), verify=True)
@@ -0,0 +1,78 @@
+from torch.nn import Conv2d
+
+from excore.engine import Registry, _signature
+
+CONV_PATH = "torch.nn.modules.conv.Conv2d"
+
+
+def test_signature_index():
+    entry = _signature.lookup(CONV_PATH)
+    assert entry is not None
+    assert entry["required"] == ["in_channels", "out_channels", "kernel_size"]
+    info = _signature.get_signature(Conv2d)
+    assert info.names[:4] == ["in_channels", "out_channels", "kernel_size", "stride"]
+    assert info.required == ("in_channels", "out_channels", "kernel_size")
+    assert info.params[3].has_default and info.params[3].default == 1
+
+
+def test_stale_signature_index(monkeypatch):
+    _signature.forget_signature(Conv2d)
+    file = _signature.lookup(CONV_PATH)["files"][0][0]
+    monkeypatch.setitem(_signature._file_mtimes, file, -1)
+    assert _signature.lookup(CONV_PATH) is None
+    inspected = []
+    ori_inspect_params = _signature._inspect_params
+
+    def _inspect_params(target):
+        inspected.append(target)
+        return ori_inspect_params(target)
+
+    monkeypatch.setattr(_signature, "_inspect_params", _inspect_params)
+    try:
+        required = _signature.get_signature(Conv2d).required
+    finally:
+        _signature.forget_signature(Conv2d)
+    assert required == ("in_channels", "out_channels", "kernel_size")
+    assert inspected == [Conv2d]
+
+
+def test_forget_mtimes(monkeypatch):
+    import os
+    from types import SimpleNamespace
+
+    _signature.forget_mtimes()
+    assert _signature.lookup(CONV_PATH) is not None
+    with monkeypatch.context() as m:
+        m.setattr(os, "stat", lambda *args, **kwargs: SimpleNamespace(st_mtime_ns=-1))
+        assert _signature.lookup(CONV_PATH) is not None
+        _signature.forget_signature(Conv2d)
+        assert _signature.lookup(CONV_PATH) is None
+    _signature.forget_mtimes()
+    assert _signature.lookup(CONV_PATH) is not None
+
+
+class _Block:
+    def __init__(self, dim, depth=1):
+        pass
+
+
+def test_signature_memo(monkeypatch):
+    info = _signature.get_signature(_Block)
+    assert info.required == ("dim",)
+    assert _signature.get_signature(_Block) is info
+
+    def __init__(self, dim, heads):
+        pass
+
+    ori_init = _Block.__init__
+    _Block.__init__ = __init__
+    try:
+        assert _signature.get_signature(_Block) is info
+        monkeypatch.setattr(Registry, "_globals", None)
+        Registry.unlock_register()
+        Registry("__test").register_module(_Block, force=True)
+        assert _signature.get_signature(_Block).required == ("dim", "heads")
+    finally:
+        Registry.lock_register()
+        _Block.__init__ = ori_init
+        _signature.forget_signature(_Block)
@@ -2,6 +2,8 @@ import os
 
 from init import execute, init
 
+from excore import Registry
+
 
 def test_init_force():
     init()
@@ -14,6 +16,47 @@ def test_generate_registries():
     from source_code import temp  # noqa: F401
 
 
+def test_incremental_register():
+    path = "./source_code/transforms/incremental.py"
+    with open(path, "w", encoding="UTF-8") as f:
+        f.write("from source_code import TRANSFORM\n\n")
+        f.write("@TRANSFORM.register()\nclass Incremental: ...\n")
+    try:
+        execute("excore auto-register --incremental")
+        assert "Incremental" in Registry.read_cache()["Transform"]
+    finally:
+        os.remove(path)
+    execute("excore auto-register --incremental")
+    assert "Incremental" not in Registry.read_cache()["Transform"]
+
+
+def test_parallel_register():
+    serial = {name: dict(reg) for name, reg in Registry.read_cache().items()}
+    execute("excore auto-register --jobs 2")
+    assert {name: dict(reg) for name, reg in Registry.read_cache().items()} == serial
+
+
+class _SubRegistry(Registry):
+    pass
+
+
+def test_merge_records_registry_class():
+    import pytest
+
+    from excore.cli._registry import _merge_records
+
+    records = {"a.py": dict(entries=[["MergeSub", "A", "a.A", None]])}
+    fields = {"MergeSub": (f"{__name__}:_SubRegistry", None)}
+    try:
+        assert _merge_records([("a.py", "a")], records, fields) == records
+        assert type(Registry._registry_pool["MergeSub"]) is _SubRegistry
+        assert Registry._registry_pool["MergeSub"]["A"] == "a.A"
+        with pytest.raises(RuntimeError):
+            _merge_records([], {}, {"MergeSub": (None, None)})
+    finally:
+        Registry._registry_pool.pop("MergeSub")
+
+
 def test_config_extension():
     execute("excore config-extension")
 